@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark link extraction on link-heavy pages.
+Compares BaseCrawler._extract_links, which reads hrefs with a streaming lxml
+parser and resolves them with LinkResolver, against the old BeautifulSoup
+find_all() plus urljoin/is_valid_url/normalize_url/get_domain per link.
+"""
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+from urllib.parse import urljoin
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.config import load_config
+from src.utils.http import FetchedResponse
+from src.utils.url import normalize_url, is_valid_url, get_domain
+from src.parsers.document import ParsedDocument
+from src.crawlers.base_crawler import BaseCrawler
+
+
+def make_page(links):
+    """Build a page with navigation, article and external links."""
+    nav = "".join(f'<li><a href="/section/{i}/">Section {i}</a></li>' for i in range(40))
+    items = []
+    for i in range(links):
+        if i % 4 == 0:
+            href = f"https://www.partner-{i % 50}.com/articles/{i}?utm_id={i}&ref=example"
+        elif i % 4 == 1:
+            href = f"related/article-{i}.html#comments"
+        elif i % 4 == 2:
+            href = f"/tag/topic-{i % 200}/page/{i % 7}/"
+        else:
+            href = f"/section/{i % 40}/article-{i}.html?page={i % 3}&sort=date"
+        items.append(f'<li><a href="{href}" class="item">Link {i}</a> <span>{i}</span></li>')
+    return f"""<!DOCTYPE html><html><head><title>Link-heavy page</title></head><body>
+<nav><ul>{nav}</ul></nav><main><ul>{"".join(items)}</ul></main>
+<footer><ul>{nav}</ul><a href="/about">About</a><a href="#top">Top</a></footer></body></html>""".encode("utf-8")
+
+
+def extract_links_legacy(crawler, document):
+    """Extract links the way BaseCrawler did before the lxml fast path."""
+    links = []
+    for a_tag in document.soup.find_all("a", href=True):
+        absolute_url = urljoin(document.url, a_tag["href"])
+        if is_valid_url(absolute_url):
+            normalized_url = normalize_url(absolute_url)
+            if crawler.url_filter.is_allowed_domain(get_domain(normalized_url)):
+                links.append(normalized_url)
+    return links
+
+
+def run(extract, response, pages, prebuilt_soup):
+    """Extract the links of the page repeatedly and return (links, CPU ms per page)."""
+    cpu_time = 0.0
+    links = []
+    for _ in range(pages):
+        document = ParsedDocument(response, response.url)
+        if prebuilt_soup:
+            # Another hook already parsed the page into soup
+            document.soup
+        
+        start = time.process_time()
+        links = extract(document)
+        cpu_time += time.process_time() - start
+    
+    return links, cpu_time * 1000 / pages
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark link extraction")
+    parser.add_argument("--pages", type=int, default=30, help="Number of times each page is processed")
+    parser.add_argument("--links", default="500,2000", help="Comma-separated numbers of links per page")
+    parser.add_argument("--config", default="config.yml", help="Configuration file")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    crawler = BaseCrawler(load_config(args.config))
+    
+    print(f"{'links':>6} {'soup':<9} {'mode':<8} {'found':>6} {'CPU ms/page':>12} {'speedup':>8}")
+    
+    for link_count in [int(n) for n in args.links.split(",")]:
+        content = make_page(link_count)
+        response = FetchedResponse("https://example.com/section/1/article.html", 200,
+                                   {"Content-Type": "text/html; charset=utf-8"}, content)
+        
+        for prebuilt_soup in (True, False):
+            soup = "shared" if prebuilt_soup else "none"
+            legacy_links, legacy_ms = run(lambda d: extract_links_legacy(crawler, d), response,
+                                          args.pages, prebuilt_soup)
+            links, ms = run(crawler._extract_links, response, args.pages, prebuilt_soup)
+            
+            # Duplicates are dropped earlier now, the distinct links must be identical
+            assert list(dict.fromkeys(legacy_links)) == list(dict.fromkeys(links))
+            
+            print(f"{link_count:>6} {soup:<9} {'legacy':<8} {len(legacy_links):>6} {legacy_ms:>12.2f}")
+            print(f"{link_count:>6} {soup:<9} {'lxml':<8} {len(links):>6} {ms:>12.2f} "
+                  f"{legacy_ms / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parsing per page in the desktop and mobile crawlers.
+Compares parse count and CPU time with the shared ParsedDocument against
+parsing the response again in every hook, as the crawlers used to do.
+"""
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from bs4 import BeautifulSoup
+
+from src.utils.config import load_config
+from src.utils.http import FetchedResponse
+from src.parsers.document import ParsedDocument
+from src.crawlers import base_crawler
+from src.crawlers.desktop_crawler import DesktopCrawler
+from src.crawlers.mobile_crawler import MobileCrawler
+
+
+class UncachedDocument(ParsedDocument):
+    """Document that parses the response on every access, like the old hooks."""
+    
+    @property
+    def soup(self):
+        ParsedDocument.parse_count += 1
+        return BeautifulSoup(self.response.content, "lxml")
+
+
+def make_page(paragraphs):
+    """Build a typical article page with navigation, metadata and links."""
+    links = "".join(f'<li><a href="/section/{i}/article-{i * 7}.html">Article {i}</a></li>' for i in range(150))
+    body = "".join(f"<p>Paragraph {i} with <b>bold</b>, <i>italic</i> and <a href=\"/ref/{i}\">a link</a>.</p>"
+                   for i in range(paragraphs))
+    return f"""<!DOCTYPE html><html><head><title>Benchmark article</title>
+<meta name="description" content="A page used to benchmark parsing">
+<meta name="keywords" content="bench, parse">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<link rel="amphtml" href="https://example.com/amp/article.html">
+<script type="application/ld+json">{{"@type": "Article"}}</script>
+</head><body><nav><ul>{links}</ul></nav><main><article><h1>Benchmark article</h1>{body}</article></main>
+<footer><a href="/about">About</a></footer></body></html>""".encode("utf-8")
+
+
+def run(crawler, response, pages, document_class):
+    """Process the page repeatedly and return (parses per page, CPU ms per page)."""
+    base_crawler.ParsedDocument = document_class
+    ParsedDocument.parse_count = 0
+    
+    start = time.process_time()
+    for _ in range(pages):
+        crawler._handle_response(response, response.url, 0, 1)
+    cpu_time = time.process_time() - start
+    
+    base_crawler.ParsedDocument = ParsedDocument
+    return ParsedDocument.parse_count / pages, cpu_time * 1000 / pages
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark parsing per crawled page")
+    parser.add_argument("--pages", type=int, default=50, help="Number of times each page is processed")
+    parser.add_argument("--paragraphs", type=int, default=300, help="Paragraphs in the generated page")
+    parser.add_argument("--config", default="config.yml", help="Configuration file")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    config = load_config(args.config)
+    
+    content = make_page(args.paragraphs)
+    response = FetchedResponse("https://example.com/article.html", 200,
+                               {"Content-Type": "text/html; charset=utf-8"}, content)
+    
+    print(f"Page size: {len(content) / 1024:.0f} KB, {args.pages} pages per run")
+    print(f"{'crawler':<10} {'mode':<12} {'parses/page':>12} {'CPU ms/page':>12}")
+    
+    for name, crawler_class in (("desktop", DesktopCrawler), ("mobile", MobileCrawler)):
+        crawler = crawler_class(config)
+        for mode, document_class in (("per-hook", UncachedDocument), ("shared", ParsedDocument)):
+            parses, cpu_ms = run(crawler, response, args.pages, document_class)
+            print(f"{name:<10} {mode:<12} {parses:>12.1f} {cpu_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
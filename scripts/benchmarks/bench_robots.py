@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark robots.txt checks on sites with many rules.
+Compares RobotsTxtParser.can_fetch, which matches URLs with a RobotsMatcher compiled
+once per host, against the old loop over every allow and disallow rule, which built
+a regex for each wildcard rule on every check.
+"""
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.robots import RobotsTxtParser
+
+USER_AGENT = "SheikhBot/1.0"
+ROBOTS_URL = "https://example.com/robots.txt"
+
+
+def make_robots_txt(rules, seed):
+    """Build a robots.txt with the given number of literal and wildcard rules."""
+    rng = random.Random(seed)
+    lines = ["User-agent: *"]
+    for i in range(rules):
+        kind = i % 5
+        if kind == 0:
+            lines.append(f"Disallow: /private-{i}/")
+        elif kind == 1:
+            lines.append(f"Allow: /private-{i - 1}/public-{rng.randrange(10)}/")
+        elif kind == 2:
+            lines.append(f"Disallow: /archive/{i}/*.pdf")
+        elif kind == 3:
+            lines.append(f"Disallow: /section-{i}/page-{rng.randrange(100)}.html")
+        else:
+            lines.append(f"Disallow: /*/print-{i}/")
+    lines.append("Crawl-delay: 1")
+    return "\n".join(lines)
+
+
+def make_paths(count, rules, seed):
+    """Build URL paths that hit some of the rules and miss most of them."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        rule = rng.randrange(max(rules, 1))
+        kind = i % 4
+        if kind == 0:
+            paths.append(f"/private-{rule}/public-{rng.randrange(10)}/page-{i}")
+        elif kind == 1:
+            paths.append(f"/archive/{rule}/report-{i}.pdf")
+        elif kind == 2:
+            paths.append(f"/blog/{rule}/print-{rule}/article-{i}")
+        else:
+            paths.append(f"/articles/{i}/index.html")
+    return paths
+
+
+def path_matches_legacy(url_path, rule_path):
+    """Match a rule the way RobotsTxtParser._path_matches did."""
+    if "*" in rule_path:
+        pattern = rule_path.replace(".", "\\.")
+        pattern = pattern.replace("*", ".*")
+        pattern = "^" + pattern + ".*$"
+        return bool(re.match(pattern, url_path))
+    return url_path.startswith(rule_path)
+
+
+def can_fetch_legacy(rules, url):
+    """Check a URL the way RobotsTxtParser.can_fetch did before RobotsMatcher."""
+    path = urlsplit(url).path or "/"
+    is_disallowed = False
+    most_specific_disallow = ""
+    for disallow_path in rules["disallow"]:
+        if path_matches_legacy(path, disallow_path) and len(disallow_path) > len(most_specific_disallow):
+            most_specific_disallow = disallow_path
+            is_disallowed = True
+    most_specific_allow = ""
+    for allow_path in rules["allow"]:
+        if path_matches_legacy(path, allow_path) and len(allow_path) > len(most_specific_allow):
+            most_specific_allow = allow_path
+    if is_disallowed and len(most_specific_allow) > len(most_specific_disallow):
+        return True
+    return not is_disallowed
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark robots.txt rule matching")
+    parser.add_argument("--urls", type=int, default=20000, help="Number of URLs to check")
+    parser.add_argument("--rules", default="10,100,1000", help="Comma-separated numbers of rules")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the rules and URLs")
+    args = parser.parse_args()
+    
+    print(f"{'mode':<10} {'rules':>6} {'allowed':>8} {'seconds':>8} {'urls/s':>12}")
+    
+    for rule_count in [int(r) for r in args.rules.split(",")]:
+        robots_parser = RobotsTxtParser()
+        rules = robots_parser._parse_robots_txt(make_robots_txt(rule_count, args.seed), USER_AGENT)
+        robots_parser.robots_cache[ROBOTS_URL] = {"data": rules, "timestamp": time.time()}
+        
+        urls = [f"https://example.com{path}" for path in make_paths(args.urls, rule_count, args.seed)]
+        
+        results = {}
+        for mode in ("legacy", "compiled"):
+            start = time.perf_counter()
+            if mode == "legacy":
+                allowed = [can_fetch_legacy(rules, url) for url in urls]
+            else:
+                allowed = [robots_parser.can_fetch(url, USER_AGENT) for url in urls]
+            elapsed = time.perf_counter() - start
+            results[mode] = allowed
+            print(f"{mode:<10} {rule_count:>6} {sum(allowed):>8} {elapsed:>8.2f} {args.urls / elapsed:>12,.0f}")
+        
+        if results["legacy"] != results["compiled"]:
+            raise SystemExit("RobotsMatcher and the legacy rule loop disagree")
+
+
+if __name__ == "__main__":
+    main()
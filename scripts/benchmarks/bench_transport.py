@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTTP/2 fetch transport against HTTP/1.1.
+Runs a local TLS server speaking HTTP/2 and HTTP/1.1 (negotiated with ALPN) that
+adds a simulated round-trip time to every response and two more to the first
+response of a connection (TCP and TLS handshakes). The same pages are then
+fetched with a fixed number of requests in flight over HTTP/1.1 keep-alive
+connections and through Http2Transport, which multiplexes them over one
+connection. Requires httpx with h2 and the openssl command line tool.
+"""
+import sys
+import ssl
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import requests
+import h2.config
+import h2.connection
+import h2.events
+import httpx
+
+from src.utils.transport import Http2Transport
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class BenchServer(asyncio.Protocol):
+    """Serves fixed-size pages over HTTP/2 or HTTP/1.1, whichever ALPN selected."""
+    
+    connections = 0
+    
+    def __init__(self, body, rtt):
+        self.body = body
+        self.rtt = rtt
+        self.served = 0
+        self.h2 = None
+        self.buffer = b""
+        self.window_updated = asyncio.Event()
+    
+    def connection_made(self, transport):
+        """Count the connection and start HTTP/2 if it was negotiated."""
+        BenchServer.connections += 1
+        self.transport = transport
+        
+        if transport.get_extra_info("ssl_object").selected_alpn_protocol() == "h2":
+            self.h2 = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+            self.h2.initiate_connection()
+            self.transport.write(self.h2.data_to_send())
+    
+    def data_received(self, data):
+        """Start a response for every complete request."""
+        if self.h2 is None:
+            self.buffer += data
+            while b"\r\n\r\n" in self.buffer:
+                _, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+                asyncio.ensure_future(self.respond_http1())
+            return
+        
+        for event in self.h2.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                asyncio.ensure_future(self.respond_h2(event.stream_id))
+            elif isinstance(event, h2.events.WindowUpdated):
+                self.window_updated.set()
+        self.transport.write(self.h2.data_to_send())
+    
+    async def delay(self):
+        """Wait one round trip, plus the handshakes for a connection's first response."""
+        self.served += 1
+        await asyncio.sleep(self.rtt * (3 if self.served == 1 else 1))
+    
+    async def respond_http1(self):
+        """Answer an HTTP/1.1 request on the keep-alive connection."""
+        await self.delay()
+        self.transport.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: "
+                             + str(len(self.body)).encode() + b"\r\n\r\n" + self.body)
+    
+    async def respond_h2(self, stream_id):
+        """Answer an HTTP/2 request on its stream."""
+        await self.delay()
+        self.h2.send_headers(stream_id, [(":status", "200"), ("content-type", "text/html"),
+                                         ("content-length", str(len(self.body)))])
+        
+        # Send the body as fast as the flow control windows allow
+        body = self.body
+        while body:
+            size = min(self.h2.local_flow_control_window(stream_id), self.h2.max_outbound_frame_size, len(body))
+            if size <= 0:
+                self.window_updated.clear()
+                await self.window_updated.wait()
+                continue
+            self.h2.send_data(stream_id, body[:size])
+            body = body[size:]
+            self.transport.write(self.h2.data_to_send())
+        
+        self.h2.end_stream(stream_id)
+        self.transport.write(self.h2.data_to_send())
+
+
+def start_server(body, rtt):
+    """Start the server on a background thread and return its port."""
+    directory = tempfile.mkdtemp()
+    cert, key = f"{directory}/cert.pem", f"{directory}/key.pem"
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+                    "-days", "1", "-subj", "/CN=localhost"], check=True, capture_output=True)
+    
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    context.set_alpn_protocols(["h2", "http/1.1"])
+    
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        loop.create_server(lambda: BenchServer(body, rtt), "127.0.0.1", 0, ssl=context)
+    )
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    
+    return server.sockets[0].getsockname()[1]
+
+
+async def fetch_all(fetch, urls, in_flight):
+    """Fetch the URLs with at most in_flight requests at a time."""
+    semaphore = asyncio.Semaphore(in_flight)
+    
+    async def fetch_one(url):
+        async with semaphore:
+            return await fetch(url)
+    
+    return await asyncio.gather(*[fetch_one(url) for url in urls])
+
+
+async def run_aiohttp(urls, in_flight, connections):
+    """Fetch over HTTP/1.1 with aiohttp, the async engine's default client."""
+    connector = aiohttp.TCPConnector(limit=connections, ssl=False)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def fetch(url):
+            async with session.get(url) as resp:
+                return len(await resp.read())
+        
+        return await fetch_all(fetch, urls, in_flight)
+
+
+async def run_httpx_http1(urls, in_flight, connections):
+    """Fetch over HTTP/1.1 with httpx."""
+    limits = httpx.Limits(max_connections=connections)
+    async with httpx.AsyncClient(http2=False, verify=False, limits=limits) as client:
+        async def fetch(url):
+            return len((await client.get(url)).content)
+        
+        return await fetch_all(fetch, urls, in_flight)
+
+
+async def run_http2(urls, in_flight, connections):
+    """Fetch through Http2Transport, multiplexed over one connection."""
+    transport = Http2Transport(requests.Session(), max_connections=connections, verify=False)
+    await transport.open_async()
+    try:
+        async def fetch(url):
+            return len((await transport.fetch_async(url, {}, 30)).content)
+        
+        sizes = await fetch_all(fetch, urls, in_flight)
+    finally:
+        await transport.close_async()
+    
+    assert set(transport.protocols) == {"HTTP/2"}, transport.protocols
+    return sizes
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP/2 fetch transport")
+    parser.add_argument("--pages", type=int, default=500, help="Number of pages fetched per run")
+    parser.add_argument("--in-flight", type=int, default=32, help="Requests in flight at once")
+    parser.add_argument("--connections", type=int, default=6,
+                        help="HTTP/1.1 connections per host (browsers use 6)")
+    parser.add_argument("--rtt-ms", type=float, default=20, help="Simulated round-trip time in milliseconds")
+    parser.add_argument("--size-kb", type=int, default=30, help="Page size in kilobytes")
+    args = parser.parse_args()
+    
+    logging.disable(logging.WARNING)
+    body = b"<html><body>" + b"x" * (args.size_kb * 1024) + b"</body></html>"
+    port = start_server(body, args.rtt_ms / 1000)
+    urls = [f"https://localhost:{port}/page/{i}" for i in range(args.pages)]
+    
+    runs = [("HTTP/1.1 httpx", run_httpx_http1), ("HTTP/2 transport", run_http2)]
+    if aiohttp is not None:
+        runs.insert(0, ("HTTP/1.1 aiohttp", run_aiohttp))
+    
+    print(f"{args.pages} pages of {args.size_kb} KB, {args.in_flight} in flight, "
+          f"{args.rtt_ms:.0f} ms round trips, {args.connections} HTTP/1.1 connections")
+    print(f"{'client':<18} {'pages/s':>9} {'seconds':>8} {'connections':>12}")
+    
+    for name, run in runs:
+        BenchServer.connections = 0
+        start = time.perf_counter()
+        sizes = asyncio.run(run(urls, args.in_flight, args.connections))
+        elapsed = time.perf_counter() - start
+        
+        assert sizes == [len(body)] * args.pages
+        print(f"{name:<18} {args.pages / elapsed:>9.1f} {elapsed:>8.2f} {BenchServer.connections:>12}")
+
+
+if __name__ == "__main__":
+    main()
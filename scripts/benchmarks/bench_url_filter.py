@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled URL filter against per-pattern re.match calls.
+Reports excluded_urls and allowed_domains checks per second for each mode.
+"""
+import re
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.url import get_domain
+from src.utils.url_filter import UrlFilter
+
+# The excluded_urls patterns shipped in config.yml
+DEFAULT_PATTERNS = [
+    r".*\.(pdf|zip|rar|tar|gz|doc|docx|xls|xlsx|ppt|pptx)$",
+    r"/wp-admin/.*",
+    r"/wp-login\.php",
+    r"/wp-content/uploads/.*",
+    r"/tag/.*",
+    r"/category/.*",
+    r".*[?&]utm_.*",
+]
+
+
+def make_url(i):
+    """Build a realistic normalized URL for index i."""
+    return f"https://www.sub{i % 7}.example-site-{i % 5000}.com/blog/{i % 97}/articles/{i}/index.html?page={i % 13}"
+
+
+def make_patterns(count):
+    """Return the default patterns padded with generated ones up to count."""
+    patterns = list(DEFAULT_PATTERNS)
+    for i in range(len(patterns), count):
+        patterns.append(rf".*/private-section-{i}/.*")
+    return patterns[:count]
+
+
+def make_domains(count):
+    """Return count allowed domains, each the parent of some generated URLs."""
+    return [f"example-site-{i * 2}.com" for i in range(count)]
+
+
+def run_legacy(urls, patterns, domains):
+    """Filter URLs the way the crawlers did before UrlFilter and return the kept count."""
+    kept = 0
+    for url in urls:
+        if any(re.match(pattern, url) for pattern in patterns):
+            continue
+        domain = get_domain(url)
+        if not domains or domain in domains:
+            kept += 1
+    return kept
+
+
+def run_compiled(urls, patterns, domains):
+    """Filter URLs with a UrlFilter and return the kept count."""
+    url_filter = UrlFilter(patterns, domains)
+    kept = 0
+    for url in urls:
+        if url_filter.is_excluded(url):
+            continue
+        if url_filter.is_allowed_domain(get_domain(url)):
+            kept += 1
+    return kept
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the compiled URL filter")
+    parser.add_argument("--urls", type=int, default=100000,
+                        help="Number of URLs to filter")
+    parser.add_argument("--patterns", default="7,50",
+                        help="Comma-separated numbers of excluded_urls patterns")
+    parser.add_argument("--domains", default="0,1000",
+                        help="Comma-separated numbers of allowed domains")
+    args = parser.parse_args()
+
+    urls = [make_url(i) for i in range(args.urls)]
+
+    print(f"{'mode':<10} {'patterns':>8} {'domains':>8} {'kept':>8} {'seconds':>8} {'urls/s':>12}")
+
+    for pattern_count in [int(p) for p in args.patterns.split(",")]:
+        patterns = make_patterns(pattern_count)
+        for domain_count in [int(d) for d in args.domains.split(",")]:
+            domains = make_domains(domain_count)
+            for mode, run in (("legacy", run_legacy), ("compiled", run_compiled)):
+                start = time.perf_counter()
+                kept = run(urls, patterns, domains)
+                elapsed = time.perf_counter() - start
+                print(f"{mode:<10} {pattern_count:>8} {domain_count:>8} {kept:>8} "
+                      f"{elapsed:>8.2f} {args.urls / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
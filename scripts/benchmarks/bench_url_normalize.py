@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark URL normalization over a corpus of discovered links.
+Compares the memoized parse_url(), which returns the normalized URL with its host,
+domain and path, against the old normalize_url() plus get_domain() and an urlsplit()
+for the host key of each link. The corpus repeats navigation links across pages
+the way a site crawl does.
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from urllib.parse import urlparse, urlunparse, urlsplit, parse_qs, urlencode
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.url import parse_url, get_domain
+
+
+def normalize_url_legacy(url):
+    """Normalize a URL the way normalize_url() did before parse_url()."""
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    if netloc.endswith(":80") and scheme == "http":
+        netloc = netloc[:-3]
+    elif netloc.endswith(":443") and scheme == "https":
+        netloc = netloc[:-4]
+    query = ""
+    if parsed.query:
+        query = urlencode({k: v[0] if len(v) == 1 else v for k, v in sorted(parse_qs(parsed.query).items())},
+                          doseq=True)
+    path = parsed.path
+    if path != "/" and path.endswith("/"):
+        path = path[:-1]
+    return urlunparse((scheme, netloc, path, parsed.params, query, ""))
+
+
+def make_corpus(pages, sites, seed):
+    """Build the absolute links found on a crawl of pages spread over sites."""
+    rng = random.Random(seed)
+    links = []
+    for page in range(pages):
+        site = f"www.site-{page % sites}.com"
+        # Navigation and footer links, the same on every page of a site
+        links.extend(f"https://{site}/section/{i}/" for i in range(30))
+        links.append(f"https://{site}/")
+        # Article links, partly shared with other pages
+        for i in range(40):
+            article = rng.randrange(pages * 5)
+            links.append(f"https://{site}/articles/{article}.html")
+        for i in range(10):
+            links.append(f"https://{site}/search?sort=date&q=topic-{rng.randrange(200)}&page={i}#results")
+        # External links
+        for i in range(10):
+            links.append(f"https://partner-{rng.randrange(500)}.org/ref/{rng.randrange(1000)}?utm_source=site")
+    return links
+
+
+def run_legacy(links):
+    """Normalize each link and look up its domain and host key, and return the distinct URLs."""
+    urls = set()
+    for link in links:
+        url = normalize_url_legacy(link)
+        get_domain(url)
+        parts = urlsplit(url)
+        f"{parts.scheme}://{parts.netloc}"
+        urls.add(url)
+    return urls
+
+
+def run_parsed(links):
+    """Parse each link once with parse_url(), and return the distinct URLs."""
+    urls = set()
+    for link in links:
+        parsed = parse_url(link)
+        parsed.domain
+        parsed.host
+        urls.add(parsed.url)
+    return urls
+
+
+def run_frontier(urls, repeats):
+    """Look up the host key of normalized URLs the way the frontier, scheduler and budget do."""
+    for _ in range(repeats):
+        for url in urls:
+            parse_url(url).host
+
+
+def run_frontier_legacy(urls, repeats):
+    """Look up the host key of normalized URLs with urlsplit()."""
+    for _ in range(repeats):
+        for url in urls:
+            parts = urlsplit(url)
+            f"{parts.scheme}://{parts.netloc}"
+
+
+def timed(run, *args):
+    """Run a benchmark with an empty parse_url() cache and return (result, seconds)."""
+    parse_url.cache_clear()
+    start = time.perf_counter()
+    result = run(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark URL normalization")
+    parser.add_argument("--pages", type=int, default=2000, help="Number of crawled pages in the corpus")
+    parser.add_argument("--sites", type=int, default=20, help="Number of sites the pages belong to")
+    parser.add_argument("--lookups", type=int, default=5,
+                        help="Host key lookups per URL in the frontier benchmark")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the corpus")
+    args = parser.parse_args()
+    
+    links = make_corpus(args.pages, args.sites, args.seed)
+    
+    legacy_urls, legacy_time = timed(run_legacy, links)
+    parsed_urls, parsed_time = timed(run_parsed, links)
+    if parsed_urls != legacy_urls:
+        raise SystemExit("parse_url() and the legacy normalization disagree")
+    
+    info = parse_url.cache_info()
+    print(f"{len(links):,} links, {len(legacy_urls):,} distinct URLs, "
+          f"cache hit rate {info.hits / (info.hits + info.misses):.0%}")
+    print(f"{'mode':<18} {'seconds':>8} {'links/s':>12}")
+    for mode, elapsed in (("legacy", legacy_time), ("parse_url", parsed_time)):
+        print(f"{mode:<18} {elapsed:>8.2f} {len(links) / elapsed:>12,.0f}")
+    
+    urls = sorted(legacy_urls)
+    lookups = len(urls) * args.lookups
+    _, legacy_time = timed(run_frontier_legacy, urls, args.lookups)
+    _, parsed_time = timed(run_frontier, urls, args.lookups)
+    for mode, elapsed in (("host key legacy", legacy_time), ("host key", parsed_time)):
+        print(f"{mode:<18} {elapsed:>8.2f} {lookups / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
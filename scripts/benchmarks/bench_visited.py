@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark the visited URL sets against a plain Python set.
+Reports memory use and add/lookup throughput for each mode.
+"""
+import sys
+import time
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.visited import FingerprintSet, BloomFilter
+
+
+def make_url(i):
+    """Build a realistic normalized URL for index i."""
+    return f"https://www.example-site-{i % 5000}.com/category/{i % 97}/articles/{i}/index.html?ref=home"
+
+
+def create(mode, size, error_rate):
+    """Create an empty visited set of the given mode."""
+    if mode == "set":
+        return set()
+    if mode == "fingerprint":
+        return FingerprintSet(size)
+    return BloomFilter(size, error_rate)
+
+
+def measure_memory(mode, size, error_rate):
+    """Build a set of size URLs and return the memory it holds in bytes."""
+    tracemalloc.start()
+    visited = create(mode, size, error_rate)
+    for i in range(size):
+        visited.add(make_url(i))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory
+
+
+def measure_speed(mode, size, error_rate):
+    """Return (adds per second, lookups per second, false positives) for size URLs."""
+    visited = create(mode, size, error_rate)
+    urls = [make_url(i) for i in range(size)]
+    unseen = [make_url(size + i) for i in range(size)]
+
+    start = time.perf_counter()
+    for url in urls:
+        visited.add(url)
+    add_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for url in urls:
+        url in visited
+    false_positives = sum(1 for url in unseen if url in visited)
+    lookup_time = time.perf_counter() - start
+
+    return size / add_time, 2 * size / lookup_time, false_positives
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark visited URL sets")
+    parser.add_argument("--sizes", default="1000000,10000000",
+                        help="Comma-separated numbers of URLs to insert")
+    parser.add_argument("--modes", default="set,fingerprint,bloom",
+                        help="Comma-separated modes to benchmark")
+    parser.add_argument("--error-rate", type=float, default=0.001,
+                        help="False-positive rate of the Bloom filter")
+    args = parser.parse_args()
+
+    print(f"{'mode':<12} {'urls':>10} {'memory MB':>10} {'bytes/url':>10} "
+          f"{'adds/s':>12} {'lookups/s':>12} {'false pos':>10}")
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        for mode in args.modes.split(","):
+            memory = measure_memory(mode, size, args.error_rate)
+            adds, lookups, false_positives = measure_speed(mode, size, args.error_rate)
+            print(f"{mode:<12} {size:>10} {memory / 2 ** 20:>10.1f} {memory / size:>10.1f} "
+                  f"{adds:>12,.0f} {lookups:>12,.0f} {false_positives:>10}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
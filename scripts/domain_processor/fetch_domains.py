@@ -1,8 +1,14 @@
 import os
-import requests
+import sys
 from datetime import datetime, timedelta
+from pathlib import Path
 import logging
 
+# Add the project root directory to the Python path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.utils.http import HttpClient
+
 logger = logging.getLogger(__name__)
 
 class DomainFetcher:
@@ -13,6 +19,9 @@ class DomainFetcher:
             "phishing": "data/phishing"
         }
         self.create_directories()
+        
+        # The daily lists come from a few hosts, so their connections are reused
+        self.client = HttpClient.shared()
     
     def create_directories(self):
         """Create necessary directories"""
@@ -28,7 +37,7 @@ class DomainFetcher:
             url = f"{base_url}/{date}/domain-names.txt"
             
             try:
-                response = requests.get(url)
+                response = self.client.get(url, timeout=60)
                 if response.status_code == 200:
                     output_file = f"{self.base_dirs['whoisds']}/{date}.txt"
                     with open(output_file, 'w') as f:
@@ -41,7 +50,7 @@ class DomainFetcher:
         """Fetch phishing domains list"""
         url = "https://github.com/cuongdt1994/Block-Phising-Crypto-Domains/raw/main/lists/daily"
         try:
-            response = requests.get(url)
+            response = self.client.get(url, timeout=60)
             if response.status_code == 200:
                 output_file = f"{self.base_dirs['phishing']}/daily.txt"
                 with open(output_file, 'w') as f:
@@ -18,12 +18,26 @@ def main():
     url = sys.argv[1] if len(sys.argv) > 1 else None
     config_file = sys.argv[2] if len(sys.argv) > 2 else 'config.yml'
 
+    # Matrix jobs share one crawl when they point at the same coordinator
+    coordinator_path = os.environ.get('CRAWL_COORDINATOR')
+    node_id = os.environ.get('CRAWL_NODE_ID')
+    run_id = os.environ.get('CRAWL_RUN_ID') or os.environ.get('GITHUB_RUN_ID')
+    
     print(f"Initializing Central Search with config: {config_file}")
     
     try:
         # Initialize the crawler
         bot = Central(config_file=config_file)
         
+        if coordinator_path:
+            coordinator_config = bot.config['crawl_settings'].setdefault('coordinator', {})
+            coordinator_config.update({'enabled': True, 'path': coordinator_path})
+            if node_id:
+                coordinator_config['node_id'] = node_id
+            if run_id:
+                coordinator_config['run_id'] = run_id
+            print(f"Sharing the crawl through coordinator {coordinator_path} as node {node_id or 'default'}")
+        
         # Run the crawler
         if url:
             print(f"Crawling URL: {url}")
@@ -57,6 +57,9 @@ setup(
         "mongodb": [
             "pymongo>=3.11.0",
         ],
+        "http2": [
+            "httpx[http2]>=0.24.0",
+        ],
     },
     entry_points={
         "console_scripts": [
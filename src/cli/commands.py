@@ -84,6 +84,11 @@ def create_parser() -> argparse.ArgumentParser:
         action="store_true", 
         help="Submit crawled URLs to search engines using IndexNow"
     )
+    crawl_parser.add_argument(
+        "--resume", 
+        action="store_true", 
+        help="Resume an interrupted crawl from its last checkpoint"
+    )
     
     # Export command
     export_parser = subparsers.add_parser(
@@ -242,7 +247,7 @@ def handle_crawl_command(args) -> int:
     try:
         # Run crawler
         logging.info(f"Starting crawl with {'provided URLs' if urls else 'start_urls from config'}")
-        crawled_data = bot.crawl(urls)
+        crawled_data = bot.crawl(urls, resume=args.resume)
         
         # Export data if output is specified
         if args.output:
@@ -0,0 +1,395 @@
+"""
+Async Crawl Engine - Concurrent crawl loop built on asyncio and aiohttp or an async transport
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Iterator
+import logging
+
+import requests
+
+from ..utils.dns_cache import CachedResolver
+from ..utils.http import FetchedResponse, LimitedBody
+
+# aiohttp is optional - crawlers fall back to the synchronous loop without it,
+# unless their transport fetches asynchronously itself (utils.transport)
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Errors of a failed fetch, whichever client made it
+FETCH_ERRORS = (requests.exceptions.RequestException, asyncio.TimeoutError)
+if AIOHTTP_AVAILABLE:
+    FETCH_ERRORS += (aiohttp.ClientError,)
+
+# Errors reported as timeouts in the host statistics
+TIMEOUT_ERRORS = (requests.exceptions.Timeout, asyncio.TimeoutError)
+
+
+class AsyncCrawlEngine:
+    """
+    Runs a crawler's crawl loop with several fetches in flight at once.
+    
+    The engine only replaces the network part of the crawl. URLs are taken from the
+    crawler's frontier, so per-host politeness is decided by the same scheduler as
+    in the synchronous loop, and every fetched response is handed back to the
+    crawler's own _handle_response, so the _process_page and _extract_links hooks
+    of specialized crawlers keep working. While one host waits out its crawl
+    delay, the free fetch slots are used for other hosts.
+    """
+    
+    def __init__(self, crawler, concurrency: int = 10):
+        """
+        Initialize the async crawl engine.
+        
+        Args:
+            crawler (BaseCrawler): Crawler whose hooks and settings are used
+            concurrency (int): Maximum number of fetches in flight
+        """
+        self.crawler = crawler
+        self.concurrency = max(1, int(concurrency))
+        self.logger = logging.getLogger("sheikhbot")
+        
+        # Number of fetches in flight and event signalled when the frontier changes
+        self._in_flight = 0
+        self._wakeup = None
+        
+        # Pages crawled but not handed out yet, and event set when a batch is full
+        self._results = []
+        self._batch_size = 0
+        self._batch_ready = None
+    
+    def iter_batches(self, url: str, max_depth: int, resume: bool = False,
+                     batch_size: int = 0) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Crawl a URL and its linked pages, yielding the crawled pages in batches.
+        
+        The event loop only runs while the next batch is being crawled, so fetching
+        pauses while the caller consumes a batch and memory stays bounded.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int): Maximum crawl depth
+            resume (bool): Continue from the last checkpoint of this crawl if there is one
+            batch_size (int): Number of pages per batch, or 0 for a single batch
+            
+        Yields:
+            List[Dict[str, Any]]: Batch of crawled pages with their data
+        """
+        crawler = self.crawler
+        self._batch_size = batch_size
+        self._results = []
+        
+        loop = asyncio.new_event_loop()
+        crawl = loop.create_task(self._run(url, max_depth, resume))
+        
+        try:
+            while True:
+                loop.run_until_complete(self._wait_for_batch(crawl))
+                
+                if crawl.done():
+                    break
+                
+                yield crawler._take_batch(self._results)
+            
+            crawl.result()
+        
+        except (KeyboardInterrupt, GeneratorExit):
+            # Save what has been crawled so far so the crawl can be resumed
+            crawler._save_checkpoint(self._results)
+            raise
+        
+        finally:
+            self._close_loop(loop, crawl)
+        
+        if self._results:
+            yield crawler._take_batch(self._results)
+    
+    async def _wait_for_batch(self, crawl: asyncio.Task) -> None:
+        """
+        Run the crawl until a full batch of pages is ready or the crawl has finished.
+        
+        Args:
+            crawl (asyncio.Task): Task running _run
+        """
+        self._batch_ready = asyncio.Event()
+        ready = asyncio.ensure_future(self._batch_ready.wait())
+        
+        await asyncio.wait([crawl, ready], return_when=asyncio.FIRST_COMPLETED)
+        
+        ready.cancel()
+    
+    def _close_loop(self, loop: asyncio.AbstractEventLoop, crawl: asyncio.Task) -> None:
+        """
+        Cancel the tasks of an unfinished crawl and close its event loop.
+        
+        Args:
+            loop (asyncio.AbstractEventLoop): Event loop of the crawl
+            crawl (asyncio.Task): Task running _run
+        """
+        tasks = {crawl}
+        
+        try:
+            pending = asyncio.all_tasks(loop)
+            
+            while pending:
+                tasks.update(pending)
+                for task in pending:
+                    task.cancel()
+                
+                try:
+                    loop.run_until_complete(asyncio.wait(pending))
+                except KeyboardInterrupt:
+                    # Tasks unwinding from an interrupt raise it again
+                    pass
+                
+                pending = asyncio.all_tasks(loop)
+            
+            # Exceptions of an interrupted crawl have been raised to the caller already
+            for task in tasks:
+                if not task.cancelled():
+                    task.exception()
+            
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+    
+    async def _run(self, url: str, max_depth: int, resume: bool = False) -> List[Dict[str, Any]]:
+        """
+        Coroutine driving the crawl until the frontier is drained.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int): Maximum crawl depth
+            resume (bool): Continue from the last checkpoint of this crawl if there is one
+            
+        Returns:
+            List[Dict[str, Any]]: List of crawled pages with their data
+        """
+        crawler = self.crawler
+        start_time = time.time()
+        results = self._results
+        
+        if not crawler._start_crawl(url, max_depth, results, resume):
+            return results
+        
+        self.logger.info(f"Using async engine with {self.concurrency} concurrent fetches")
+        
+        self._in_flight = 0
+        self._wakeup = asyncio.Event()
+        
+        if crawler.transport.supports_async:
+            # The transport multiplexes the fetches over its own connections
+            await crawler.transport.open_async()
+            try:
+                await self._run_workers(None, max_depth, results)
+            finally:
+                await crawler.transport.close_async()
+        
+        else:
+            timeout = aiohttp.ClientTimeout(total=crawler.timeout)
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                ssl=None if crawler.config["crawl_settings"]["verify_ssl"] else False,
+                resolver=CachedResolver(crawler.dns_cache) if crawler.dns_cache is not None else None
+            )
+            
+            async with aiohttp.ClientSession(
+                headers=dict(crawler.session.headers),
+                timeout=timeout,
+                connector=connector
+            ) as session:
+                await self._run_workers(session, max_depth, results)
+        
+        crawler._finish_crawl(start_time)
+        
+        return results
+    
+    async def _run_workers(self, session, max_depth: int, results: List[Dict[str, Any]]) -> None:
+        """
+        Run the fetch workers until the frontier is drained.
+        
+        Args:
+            session (aiohttp.ClientSession): Session used for fetching, or None to
+                fetch through the crawler's transport
+            max_depth (int): Maximum crawl depth
+            results (List[Dict[str, Any]]): List collecting crawled page data
+        """
+        scheduler = self.crawler.scheduler
+        
+        # Hosts seen for the first time fetch their robots.txt off the event loop
+        robots_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="robots-fetch")
+        scheduler.set_robots_executor(robots_executor)
+        
+        try:
+            await asyncio.gather(*[
+                self._worker(session, max_depth, results)
+                for _ in range(self.concurrency)
+            ])
+        finally:
+            scheduler.set_robots_executor(None)
+            robots_executor.shutdown(wait=False)
+    
+    async def _worker(self, session, max_depth: int, results: List[Dict[str, Any]]) -> None:
+        """
+        Take URLs from the frontier, fetch them and process the responses.
+        
+        Args:
+            session (aiohttp.ClientSession): Session used for fetching, or None to
+                fetch through the crawler's transport
+            max_depth (int): Maximum crawl depth
+            results (List[Dict[str, Any]]): List collecting crawled page data
+        """
+        crawler = self.crawler
+        frontier = crawler.frontier
+        
+        while True:
+            # Fetches still in flight finish, but no new one starts
+            if not crawler._within_budget():
+                self._wakeup.set()
+                return
+            
+            item = frontier.pop()
+            
+            if item is None:
+                # Finished once nothing is queued and no fetch can add more URLs
+                if not frontier and self._in_flight == 0:
+                    self._wakeup.set()
+                    return
+                
+                # Sleep until a host becomes ready or another fetch finishes
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), frontier.wait_time())
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            current_url, current_depth = item
+            
+            # URLs whose host, depth or path prefix has used up its budget are skipped
+            if crawler.budget is not None and not crawler.budget.admit(current_url, current_depth):
+                frontier.done(current_url, False)
+                continue
+            
+            crawler.in_progress[current_url] = current_depth
+            self._in_flight += 1
+            
+            # Unchanged pages of an incremental crawl and pages already fetched by
+            # another crawler of the session are reused
+            carried = crawler._carry_forward(current_url, current_depth, max_depth)
+            response = crawler._shared_response(current_url) if carried is None else None
+            fetched = carried is None and response is None
+            
+            try:
+                if fetched:
+                    response = await self._fetch(session, current_url)
+                
+                if carried is not None:
+                    page_data, next_urls = carried
+                else:
+                    page_data, next_urls = crawler._handle_response(
+                        response, current_url, current_depth, max_depth
+                    )
+                
+                if page_data is not None:
+                    results.append(page_data)
+                    
+                    if self._batch_size and len(results) >= self._batch_size:
+                        self._batch_ready.set()
+                
+                for next_url in next_urls:
+                    crawler._enqueue(next_url, current_depth + 1, max_depth)
+            
+            except FETCH_ERRORS as e:
+                if not crawler._retry_later(current_url, current_depth):
+                    self.logger.error(f"Error crawling {current_url}: {str(e)}")
+                    crawler.stats["errors"] += 1
+            
+            except Exception as e:
+                self.logger.error(f"Error crawling {current_url}: {str(e)}")
+                crawler.stats["errors"] += 1
+            
+            finally:
+                frontier.done(current_url, fetched)
+                self._in_flight -= 1
+                self._wakeup.set()
+            
+            # Only a fetch that was not interrupted counts as completed
+            del crawler.in_progress[current_url]
+            crawler._maybe_checkpoint(results)
+    
+    async def _fetch(self, session, url: str) -> FetchedResponse:
+        """
+        Fetch a URL with support for HTTP caching headers.
+        
+        Args:
+            session (aiohttp.ClientSession): Session used for fetching, or None to
+                fetch through the crawler's transport
+            url (str): URL to fetch
+            
+        Returns:
+            FetchedResponse: The fetched response
+        """
+        crawler = self.crawler
+        started = time.monotonic()
+        headers = crawler._request_headers(url)
+        allow_redirects = crawler.config["crawl_settings"]["follow_redirects"]
+        
+        try:
+            if session is None:
+                response = await crawler.transport.fetch_async(url, headers, crawler.timeout,
+                                                               allow_redirects=allow_redirects,
+                                                               limits=crawler.response_limits)
+            else:
+                async with session.get(url, headers=headers, allow_redirects=allow_redirects) as resp:
+                    crawler.transport.protocols[f"HTTP/{resp.version.major}.{resp.version.minor}"] += 1
+                    
+                    if crawler.response_limits is not None:
+                        response = await self._read_limited(resp)
+                    else:
+                        content = await resp.read()
+                        response = FetchedResponse(str(resp.url), resp.status, resp.headers, content)
+        
+        except FETCH_ERRORS as e:
+            crawler._record_fetch(url, None, time.monotonic() - started,
+                                  timed_out=isinstance(e, TIMEOUT_ERRORS))
+            self.logger.error(f"Request error for {url}: {str(e)}")
+            raise
+        
+        crawler._record_fetch(url, response, time.monotonic() - started)
+        crawler._remember_validators(url, response.headers)
+        
+        response = crawler._use_response_cache(url, response)
+        
+        if crawler.fetch_cache is not None:
+            crawler.fetch_cache.put(crawler.fetch_variant, url, response)
+        
+        return response
+    
+    async def _read_limited(self, resp) -> FetchedResponse:
+        """
+        Download a response body within the crawler's response limits.
+        
+        Leaving the response context without reading the whole body closes the
+        connection, so an aborted or truncated download stops there.
+        
+        Args:
+            resp (aiohttp.ClientResponse): Response whose headers have arrived
+            
+        Returns:
+            FetchedResponse: The response with the downloaded body, marked as
+                truncated or aborted if the limits were hit
+        """
+        body = LimitedBody(self.crawler.response_limits, resp.headers)
+        
+        if body.aborted is None:
+            async for chunk in resp.content.iter_chunked(65536):
+                if not body.add(chunk):
+                    break
+        
+        return body.response(str(resp.url), resp.status, resp.headers)
\ No newline at end of file
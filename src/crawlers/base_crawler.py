@@ -3,22 +3,42 @@ Base Crawler - Foundation class for all specialized crawlers
 """
 
 import time
-import random
+import hashlib
 import requests
-from typing import Dict, Any, List, Optional, Union, Set
-from urllib.parse import urlparse, urljoin
+from typing import Dict, Any, List, Optional, Union, Set, Tuple, Iterator
+from urllib.parse import urlparse, urlsplit
 import logging
-from bs4 import BeautifulSoup
-import re
+from collections import Counter
 from datetime import datetime
 
-from ..utils.url import normalize_url, is_valid_url, get_domain
+from ..utils.url import normalize_url, is_valid_url, LinkResolver
 from ..utils.robots import RobotsTxtParser
+from ..utils.sitemap import parse_sitemap, parse_lastmod
+from ..utils.url_filter import UrlFilter
+from ..utils.visited import create_visited_set, restore_visited_set
+from ..utils.http import ACCEPT_ENCODING, FetchedResponse, HttpClient, ResponseLimits, parse_retry_after
+from ..utils.simhash import SimHashIndex, simhash, tokenize
+from ..utils.transport import create_transport
+from ..utils.circuit_breaker import (
+    CLOSED, OPEN, GIVEN_UP, FAILURE_STATUSES, RETRY_STATUSES, HostCircuitBreakers, RetryBudget
+)
+from ..parsers.document import ParsedDocument
+from ..storage.checkpoint import CrawlCheckpoint
+from ..storage.response_cache import ResponseCache
+from ..storage.manifest import CrawlManifest
+from .scheduler import HostScheduler
+from .frontier import CrawlFrontier, DiskBackedFrontier, PriorityScorer, get_host_key
+from .budget import CrawlBudget
+from .async_engine import AsyncCrawlEngine, AIOHTTP_AVAILABLE
 
 
 class BaseCrawler:
     """Base crawler class with common functionality for all specialized crawlers."""
     
+    # Kind of request this crawler sends; crawlers with the same variant can share
+    # fetched responses through a SharedFetchCache
+    fetch_variant = "default"
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the base crawler.
@@ -33,31 +53,34 @@ class BaseCrawler:
         self.user_agent = self.config["crawl_settings"]["user_agent"]
         
         # Initialize crawl stats
-        self.stats = {
-            "pages_crawled": 0,
-            "urls_discovered": 0,
-            "bytes_downloaded": 0,
-            "crawl_time": 0,
-            "errors": 0
-        }
+        self._reset_stats()
         
         # Initialize robots.txt parser
         self.robots_parser = RobotsTxtParser()
         
+        # Excluded URL patterns and allowed domains, compiled once
+        self.url_filter = UrlFilter.from_config(self.config)
+        
         # Keep track of visited URLs to avoid duplicates
-        self.visited_urls = set()
+        self.visited_urls = create_visited_set(self.config)
         
         # Keep a cache of ETag and Last-Modified values for URLs
         self.etag_cache = {}
         self.last_modified_cache = {}
         
-        # Initialize session with proper headers and settings
-        self.session = requests.Session()
+        # Pages and validators kept on disk across runs (storage.cache)
+        self.response_cache = ResponseCache.from_config(self.config)
+        
+        # Initialize session with proper headers and settings; its connections are
+        # pooled with every other outbound request of the process
+        self.http_client = HttpClient.from_config(self.config)
+        self._connection_stats_start = None
+        self.session = self.http_client.session()
         self.session.headers.update({
             "User-Agent": self.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             "Sec-Fetch-Dest": "document",
@@ -67,47 +90,340 @@ class BaseCrawler:
             "Cache-Control": "max-age=0"
         })
         
+        # Pages are fetched through the configured transport (HTTP/1.1 or HTTP/2)
+        self.transport = create_transport(self.config, self.session)
+        self._protocols_start = Counter()
+        
         # Set timeout from config
         self.timeout = self.config["crawl_settings"]["timeout"]
         
+        # The crawler's connections resolve host names through the client's DNS
+        # cache, which resolves new hosts ahead of time
+        self.dns_cache = self.http_client.dns_cache
+        self._dns_stats_start = None
+        
+        # Page bodies are streamed within per-content-type limits (response_limits)
+        self.response_limits = ResponseLimits.from_config(self.config)
+        
         # Set delay from config with small random variation for politeness
         self.delay = self.config["crawl_settings"]["delay"]
         
-    def crawl(self, url: str, max_depth: int = None) -> List[Dict[str, Any]]:
+        # Per-host politeness: each host is spaced by the larger of the configured
+        # delay and its own robots.txt Crawl-delay
+        self.scheduler = HostScheduler(
+            self.delay,
+            self.robots_parser if self.config["crawl_settings"]["respect_robots_txt"] else None,
+            self.user_agent,
+            adaptive=self.config["crawl_settings"].get("adaptive")
+        )
+        
+        # Hosts that keep failing are parked by their circuit breaker, and failed
+        # fetches are retried within a budget shared by the whole crawl
+        self.circuit_breakers = None
+        self.retry_budget = None
+        self.retry_attempts = {}
+        
+        # Whether failed fetches are queued again in the local frontier (turned off
+        # when a coordinator hands out the URLs)
+        self.retry_failed = True
+        
+        # Page, byte and time limits of the running crawl (max_pages and budget)
+        self.budget = None
+        
+        # Frontier ordered by a pluggable priority function
+        self.scorer = PriorityScorer.from_config(self.config)
+        self.frontier = self._create_frontier()
+        
+        # Asynchronous engine settings (falls back to the sync loop when disabled)
+        async_config = self.config["crawl_settings"].get("async_engine", {})
+        self.async_enabled = async_config.get("enabled", False)
+        self.concurrency = async_config.get("concurrency", 10)
+        
+        # Periodic checkpoints so an interrupted crawl can be resumed
+        checkpoint_config = self.config["crawl_settings"].get("checkpoint", {})
+        self.checkpoint_enabled = checkpoint_config.get("enabled", False)
+        self.checkpoint_directory = checkpoint_config.get("directory", "data/checkpoints")
+        self.checkpoint_interval_pages = checkpoint_config.get("interval_pages", 50)
+        self.checkpoint_interval_seconds = checkpoint_config.get("interval_seconds", 60)
+        self.checkpoint = None
+        
+        # Incremental recrawls take over pages that have not changed since the last crawl
+        incremental_config = self.config["crawl_settings"].get("incremental", {})
+        self.incremental_enabled = incremental_config.get("enabled", False)
+        self.manifest_directory = incremental_config.get("directory", "data/manifests")
+        self.refresh_after = incremental_config.get("refresh_after_hours", 24) * 3600
+        self.manifest = None
+        self.sitemap_lastmod = {}
+        
+        # Near-duplicate pages are recognized by the SimHash fingerprint of their text
+        near_duplicate_config = self.config["crawl_settings"].get("near_duplicates", {})
+        self.near_duplicates_enabled = near_duplicate_config.get("enabled", False)
+        self.near_duplicate_distance = near_duplicate_config.get("max_distance", 3)
+        self.near_duplicate_min_words = near_duplicate_config.get("min_words", 50)
+        self.simhash_index = None
+        
+        # Whether a finished crawl removes the pages it did not reach from the manifest
+        # (turned off when several processes share the crawl)
+        self.prune_manifest = True
+        
+        # URLs popped from the frontier whose fetch has not finished yet
+        self.in_progress = {}
+        
+        # Optional function of (url, depth) that takes over URLs owned by another
+        # crawl process and returns False for them (set by multi-process crawls)
+        self.url_router = None
+        
+        # Responses shared with the other crawlers of a SheikhBot.crawl session
+        self.fetch_cache = None
+        
+        # Whether the running crawl hands out its pages in batches (iter_crawl)
+        self.streaming = False
+    
+    def crawl(self, url: str, max_depth: int = None, resume: bool = False) -> List[Dict[str, Any]]:
         """
         Crawl a URL and its linked pages up to max_depth.
         
+        Uses the asynchronous engine when it is enabled in the configuration and
+        aiohttp is available, otherwise falls back to the synchronous crawl loop.
+        
         Args:
             url (str): The URL to start crawling from
             max_depth (int, optional): Maximum crawl depth. If None, uses config value.
+            resume (bool): Continue from the last checkpoint of this crawl if there is one
             
         Returns:
             List[Dict[str, Any]]: List of crawled pages with their data
         """
+        results = []
+        
+        for batch in self.iter_crawl(url, max_depth, resume, batch_size=0):
+            results.extend(batch)
+        
+        return results
+    
+    def iter_crawl(self, url: str, max_depth: int = None, resume: bool = False,
+                   batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Crawl a URL and its linked pages, yielding the pages in batches as they are crawled.
+        
+        Only the pages of the current batch are held in memory. Checkpoints of a
+        streamed crawl do not keep any pages: pages that were not handed out yet are
+        queued again instead, so a resumed crawl yields exactly the pages that the
+        interrupted one did not.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int, optional): Maximum crawl depth. If None, uses config value.
+            resume (bool): Continue from the last checkpoint of this crawl if there is one
+            batch_size (int): Number of pages per batch. 0 yields every page in a single
+                batch once the crawl has finished.
+                
+        Yields:
+            List[Dict[str, Any]]: Batch of crawled pages with their data
+        """
         if max_depth is None:
             max_depth = self.config["crawl_settings"]["max_depth"]
         
+        self.streaming = batch_size > 0
+        
+        try:
+            if self.async_enabled:
+                if AIOHTTP_AVAILABLE or self.transport.supports_async:
+                    yield from AsyncCrawlEngine(self, self.concurrency).iter_batches(url, max_depth, resume, batch_size)
+                    return
+                
+                self.logger.warning("aiohttp is not installed, falling back to synchronous crawling")
+            
+            yield from self._iter_crawl_sync(url, max_depth, resume, batch_size)
+        
+        finally:
+            self.streaming = False
+    
+    def _iter_crawl_sync(self, url: str, max_depth: int, resume: bool = False,
+                         batch_size: int = 0) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Crawl a URL one page at a time using the blocking requests session.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int): Maximum crawl depth
+            resume (bool): Continue from the last checkpoint of this crawl if there is one
+            batch_size (int): Number of pages per batch, or 0 for a single batch
+            
+        Yields:
+            List[Dict[str, Any]]: Batch of crawled pages with their data
+        """
         start_time = time.time()
         
-        self.logger.info(f"Starting crawl of {url} with max depth {max_depth}")
+        # Pages crawled but not handed out yet
+        results = []
+        
+        if not self._start_crawl(url, max_depth, results, resume):
+            return
+        
+        try:
+            # Process URLs in the frontier, always taking the next host that is ready,
+            # until the frontier is drained or the crawl budget is used up
+            while self.frontier and self._within_budget():
+                if batch_size and len(results) >= batch_size:
+                    yield self._take_batch(results)
+                
+                item = self.frontier.pop()
+                
+                if item is None:
+                    # Every host with queued URLs is still waiting out its crawl delay
+                    time.sleep(self.frontier.wait_time() or 0)
+                    continue
+                
+                current_url, current_depth = item
+                self.in_progress[current_url] = current_depth
+                
+                self._crawl_page(current_url, current_depth, max_depth, results)
+                
+                # Only a fetch that was not interrupted counts as completed
+                del self.in_progress[current_url]
+                self._maybe_checkpoint(results)
+        
+        except (KeyboardInterrupt, GeneratorExit):
+            # Save what has been crawled so far so the crawl can be resumed
+            self._save_checkpoint(results)
+            raise
+        
+        self._finish_crawl(start_time)
+        
+        if results:
+            yield self._take_batch(results)
+    
+    def _within_budget(self) -> bool:
+        """
+        Check whether the crawl still has pages, bytes and time left in its budget.
+        
+        Returns:
+            bool: False once a crawl-wide limit has run out
+        """
+        return self.budget is None or self.budget.exhausted() is None
+    
+    def _take_batch(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Hand out the pages collected so far and empty the list.
+        
+        Args:
+            results (List[Dict[str, Any]]): Pages crawled but not handed out yet
+            
+        Returns:
+            List[Dict[str, Any]]: The pages to hand out
+        """
+        batch = results[:]
+        del results[:]
+        
+        return batch
+    
+    def _crawl_page(self, url: str, depth: int, max_depth: int, results: List[Dict[str, Any]]) -> None:
+        """
+        Fetch and process a URL taken from the frontier and queue its links.
+        
+        Args:
+            url (str): URL returned by frontier.pop()
+            depth (int): Crawl depth of the URL
+            max_depth (int): Maximum crawl depth
+            results (List[Dict[str, Any]]): List collecting crawled page data
+        """
+        # URLs whose host, depth or path prefix has used up its budget are skipped
+        if self.budget is not None and not self.budget.admit(url, depth):
+            self.frontier.done(url, False)
+            return
+        
+        # Unchanged pages of an incremental crawl and pages already fetched by another
+        # crawler of the session are not requested again, so they do not use up the
+        # host's crawl delay either
+        carried = self._carry_forward(url, depth, max_depth)
+        response = self._shared_response(url) if carried is None else None
+        fetched = carried is None and response is None
+        
+        try:
+            if fetched:
+                # Fetch the page with HTTP caching support
+                response, from_cache = self._fetch_with_cache(url)
+            
+            if carried is not None:
+                page_data, next_urls = carried
+            else:
+                page_data, next_urls = self._handle_response(response, url, depth, max_depth)
+            
+            if page_data is not None:
+                results.append(page_data)
+            
+            # Add new URLs to the frontier
+            for next_url in next_urls:
+                self._enqueue(next_url, depth + 1, max_depth)
+        
+        except requests.exceptions.RequestException as e:
+            if not self._retry_later(url, depth):
+                self.logger.error(f"Error crawling {url}: {str(e)}")
+                self.stats["errors"] += 1
+        
+        except Exception as e:
+            self.logger.error(f"Error crawling {url}: {str(e)}")
+            self.stats["errors"] += 1
         
-        # Reset stats for this crawl
+        finally:
+            self.frontier.done(url, fetched)
+    
+    def _reset_stats(self) -> None:
+        """Reset the crawl statistics for a new crawl."""
         self.stats = {
             "pages_crawled": 0,
             "urls_discovered": 0,
             "bytes_downloaded": 0,
+            "shared_fetches": 0,
+            "not_modified": 0,
+            "carried_forward": 0,
+            "unchanged": 0,
+            "changed": 0,
+            "near_duplicates": 0,
+            "truncated": 0,
+            "aborted": 0,
+            "retries": 0,
+            "retries_denied": 0,
+            "dropped": 0,
             "crawl_time": 0,
             "errors": 0
         }
+    
+    def _start_crawl(self, url: str, max_depth: int, results: List[Dict[str, Any]],
+                     resume: bool = False) -> bool:
+        """
+        Prepare crawler state for a new crawl and check robots.txt for the seed URL.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int): Maximum crawl depth
+            results (List[Dict[str, Any]]): List collecting crawled page data, filled
+                with the pages of the checkpoint when resuming
+            resume (bool): Continue from the last checkpoint of this crawl if there is one
+            
+        Returns:
+            bool: False if the seed URL is disallowed by robots.txt
+        """
+        self.logger.info(f"Starting crawl of {url} with max depth {max_depth}")
         
-        # Reset visited URLs
-        self.visited_urls = set()
+        self._reset_crawl()
         
-        # Results will contain all the crawled pages data
-        results = []
+        self.checkpoint = None
+        self._checkpointed_results = 0
+        self._checkpointed_pages = 0
+        self._checkpointed_at = time.time()
+        
+        self._open_manifest(url)
         
-        # Queue of URLs to crawl with their depth
-        queue = [(normalize_url(url), 0)]
+        if self.checkpoint_enabled:
+            self.checkpoint = CrawlCheckpoint(self.checkpoint_directory, self._checkpoint_name(url))
+            
+            if resume and self._restore_checkpoint(results):
+                return True
+            
+            # Start from scratch - drop any checkpoint of an earlier crawl
+            self.checkpoint.clear()
         
         # Check robots.txt first if enabled
         if self.config["crawl_settings"]["respect_robots_txt"]:
@@ -119,97 +435,504 @@ class BaseCrawler:
                 
                 if not self.robots_parser.can_fetch(url, self.user_agent):
                     self.logger.warning(f"URL {url} is disallowed by robots.txt")
-                    return results
-                
-                crawl_delay = self.robots_parser.get_crawl_delay(self.user_agent)
-                if crawl_delay is not None:
-                    # Use robots.txt crawl delay if it's specified and higher than our configured delay
-                    self.delay = max(self.delay, crawl_delay)
-                    self.logger.info(f"Using crawl delay from robots.txt: {self.delay} seconds")
+                    return False
             except Exception as e:
                 self.logger.warning(f"Error fetching robots.txt: {str(e)}")
         
-        # Process URLs in the queue
-        while queue:
-            current_url, current_depth = queue.pop(0)
-            
-            # Skip if already visited
-            if current_url in self.visited_urls:
-                continue
-            
-            # Skip if exceeds max depth
-            if current_depth > max_depth:
-                continue
-            
-            # Add to visited set
-            self.visited_urls.add(current_url)
-            
-            # Check if URL matches any excluded pattern
-            if any(re.match(pattern, current_url) for pattern in self.config["excluded_urls"]):
-                self.logger.info(f"Skipping URL {current_url} - matches excluded pattern")
-                continue
+        self._enqueue(normalize_url(url), 0, max_depth)
+        
+        # Seed the frontier with sitemap URLs so their priorities can be used, and
+        # read their lastmod dates for an incremental crawl
+        use_sitemaps = self.config["crawl_settings"].get("priority", {}).get("use_sitemaps", False)
+        if use_sitemaps or self.manifest is not None:
+            self._enqueue_sitemap_urls(url, max_depth, enqueue=use_sitemaps)
+        
+        return True
+    
+    def _open_manifest(self, url: str) -> None:
+        """
+        Open the manifest of the previous crawl from the same seed for an incremental crawl.
+        
+        Args:
+            url (str): The URL the crawl started from
+        """
+        self.manifest = None
+        self.sitemap_lastmod = {}
+        self._crawl_started = time.time()
+        
+        if self.incremental_enabled:
+            self.manifest = CrawlManifest(self.manifest_directory, self._checkpoint_name(url))
+    
+    def _reset_crawl(self) -> None:
+        """Reset stats, visited URLs and the frontier for a new crawl."""
+        self._reset_stats()
+        self.visited_urls = create_visited_set(self.config)
+        self.in_progress = {}
+        self._dns_stats_start = self.dns_cache.get_stats() if self.dns_cache is not None else None
+        self._protocols_start = self.transport.protocols.copy()
+        self._connection_stats_start = self.http_client.get_stats()
+        self.simhash_index = SimHashIndex(self.near_duplicate_distance) if self.near_duplicates_enabled else None
+        self.circuit_breakers = HostCircuitBreakers.from_config(self.config)
+        self.retry_budget = RetryBudget.from_config(self.config)
+        self.retry_attempts = {}
+        self.budget = CrawlBudget.from_config(self.config)
+        self._close_frontier()
+        self.frontier = self._create_frontier()
+        
+        # Specialized crawlers set their user agent after the scheduler is created
+        self.scheduler.user_agent = self.user_agent
+    
+    def _create_frontier(self) -> CrawlFrontier:
+        """
+        Create the crawl frontier configured in crawl_settings.frontier.
+        
+        Returns:
+            CrawlFrontier: In-memory frontier, or a disk-backed one for large crawls
+        """
+        frontier_config = self.config["crawl_settings"].get("frontier", {})
+        
+        if frontier_config.get("disk_backed", False):
+            return DiskBackedFrontier(
+                self.scheduler,
+                self.scorer,
+                directory=frontier_config.get("directory", "data/frontier"),
+                max_in_memory=frontier_config.get("max_in_memory", 100000),
+                page_size=frontier_config.get("page_size", 1000)
+            )
+        
+        return CrawlFrontier(self.scheduler, self.scorer)
+    
+    def _close_frontier(self) -> None:
+        """Release resources held by the current frontier, such as its spill file."""
+        if isinstance(self.frontier, DiskBackedFrontier):
+            self.frontier.close()
+    
+    def _enqueue(self, url: str, depth: int, max_depth: int,
+                 sitemap_priority: Optional[float] = None) -> bool:
+        """
+        Add a URL to the frontier if it should be crawled.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            max_depth (int): Maximum crawl depth
+            sitemap_priority (float, optional): Priority of the URL in a sitemap
             
-            # Respect crawl delay - add small random variation for politeness
-            time.sleep(self.delay + random.uniform(0, 0.5))
+        Returns:
+            bool: True if the URL was added
+        """
+        if self.url_router is not None and not self.url_router(url, depth):
+            return False
+        
+        if url in self.visited_urls:
+            # Already discovered - count the extra in-link for priority scoring
+            self.frontier.add_inlink(url)
+            return False
+        
+        if not self._should_crawl(url, depth, max_depth):
+            return False
+        
+        # Hosts given up by their circuit breaker are not crawled any further
+        given_up = self.circuit_breakers.given_up if self.circuit_breakers is not None else None
+        if given_up and get_host_key(url) in given_up:
+            self.stats["dropped"] += 1
+            return False
+        
+        # Stop queuing URLs once their scope of the crawl budget is used up
+        if self.budget is not None and not self.budget.allows(url, depth):
+            return False
+        
+        self.frontier.push(url, depth, sitemap_priority)
+        
+        if self.dns_cache is not None:
+            # Resolve the host while its URLs wait in the frontier
+            self.dns_cache.prefetch(urlsplit(url).hostname)
+        
+        return True
+    
+    def _enqueue_sitemap_urls(self, url: str, max_depth: int, max_sitemaps: int = 10,
+                              enqueue: bool = True) -> None:
+        """
+        Add the URLs listed in the site's robots.txt sitemaps to the frontier.
+        
+        Their lastmod dates are kept in sitemap_lastmod when the crawl is incremental.
+        
+        Args:
+            url (str): Seed URL of the crawl
+            max_depth (int): Maximum crawl depth
+            max_sitemaps (int): Maximum number of sitemap files to fetch
+            enqueue (bool): Whether to add the URLs to the frontier or only read their
+                lastmod dates
+        """
+        pending = self.robots_parser.get_sitemaps(url)
+        fetched = 0
+        
+        while pending and fetched < max_sitemaps:
+            sitemap_url = pending.pop(0)
+            fetched += 1
             
             try:
-                # Fetch the page with HTTP caching support
-                response, from_cache = self._fetch_with_cache(current_url)
+                response = self.session.get(sitemap_url, timeout=self.timeout)
+                if response.status_code != 200:
+                    continue
                 
-                if response.status_code == 200:
-                    # Process the page
-                    page_data = self._process_page(response, current_url, current_depth)
-                    results.append(page_data)
-                    
-                    # Extract links if not at max depth
-                    if current_depth < max_depth:
-                        next_urls = self._extract_links(response, current_url)
-                        
-                        # Add new URLs to the queue
-                        for next_url in next_urls:
-                            if next_url not in self.visited_urls:
-                                queue.append((next_url, current_depth + 1))
-                                self.stats["urls_discovered"] += 1
-                    
-                    self.stats["pages_crawled"] += 1
-                    self.stats["bytes_downloaded"] += len(response.content)
-                    
-                elif response.status_code == 304:  # Not Modified
-                    self.logger.info(f"Page not modified: {current_url}")
+                entries, child_sitemaps = parse_sitemap(response.content)
+                pending.extend(child_sitemaps)
+                
+                for entry in entries:
+                    if not is_valid_url(entry["loc"]):
+                        continue
                     
-                    # Look up previously cached content
-                    # In a real implementation, this would retrieve the content from storage
+                    entry_url = normalize_url(entry["loc"])
                     
-                else:
-                    self.logger.warning(f"Failed to fetch {current_url}: HTTP {response.status_code}")
-                    self.stats["errors"] += 1
+                    if self.manifest is not None:
+                        lastmod = parse_lastmod(entry["lastmod"])
+                        if lastmod is not None:
+                            self.sitemap_lastmod[entry_url] = lastmod
                     
+                    if enqueue:
+                        self._enqueue(entry_url, 1, max_depth, entry["priority"])
+                
+                self.logger.info(f"Read {len(entries)} URLs from sitemap {sitemap_url}")
+            
             except Exception as e:
-                self.logger.error(f"Error crawling {current_url}: {str(e)}")
-                self.stats["errors"] += 1
+                self.logger.warning(f"Error reading sitemap {sitemap_url}: {str(e)}")
+    
+    def _should_crawl(self, url: str, depth: int, max_depth: int) -> bool:
+        """
+        Check whether a discovered URL should be crawled and mark it as visited.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            max_depth (int): Maximum crawl depth
+            
+        Returns:
+            bool: True if the URL should be fetched
+        """
+        # Skip if already visited or exceeds max depth
+        if url in self.visited_urls or depth > max_depth:
+            return False
+        
+        # Add to visited set
+        self.visited_urls.add(url)
+        
+        # Count newly discovered URLs where they are first seen, which in a
+        # multi-process crawl is the process owning their host
+        if depth > 0:
+            self.stats["urls_discovered"] += 1
+        
+        # Check if URL matches any excluded pattern
+        if self.url_filter.is_excluded(url):
+            self.logger.info(f"Skipping URL {url} - matches excluded pattern")
+            return False
+        
+        return True
+    
+    def _handle_response(self, response: requests.Response, url: str, depth: int,
+                         max_depth: int) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+        """
+        Process a fetched response and collect the links to crawl next.
+        
+        Args:
+            response (requests.Response): HTTP response
+            url (str): URL of the page
+            depth (int): Current crawl depth
+            max_depth (int): Maximum crawl depth
+            
+        Returns:
+            Tuple[Optional[Dict[str, Any]], List[str]]: (page_data, next_urls) where
+                page_data is None if the page was not processed
+        """
+        next_urls = []
+        
+        if getattr(response, "aborted", None):
+            self.logger.info(f"Skipping {url}: {response.aborted}")
+            self.stats["aborted"] += 1
+            return None, next_urls
+        
+        if response.status_code == 200:
+            # Every hook shares one document so the page is parsed only once
+            document = ParsedDocument(response, url)
+            
+            # Process the page
+            page_data = self._process_page(document, depth)
+            
+            if getattr(response, "truncated", False):
+                # Only the beginning of the page was downloaded
+                page_data["truncated"] = True
+                self.stats["truncated"] += 1
+            
+            # Near-duplicates of an earlier page add no new links
+            duplicate = self._check_near_duplicate(url, document, page_data)
+            
+            # Extract links if not at max depth, or for the manifest, as a later crawl
+            # may take the page over at a smaller depth
+            links = []
+            if not duplicate and (depth < max_depth or self.manifest is not None):
+                # Already visited links are passed on too so their in-links are counted
+                links = list(dict.fromkeys(self._extract_links(document)))
+            
+            if depth < max_depth:
+                next_urls = links
+            
+            if self.manifest is not None:
+                self._update_manifest(url, response, page_data, links)
+            
+            self.stats["pages_crawled"] += 1
+            self.stats["bytes_downloaded"] += len(response.content)
+            
+            if self.budget is not None:
+                self.budget.add_bytes(url, len(response.content))
+            
+            return page_data, next_urls
+        
+        if response.status_code == 304 and self.manifest is not None:
+            # The copy of the previous crawl is still current
+            record = self.manifest.get(url)
+            
+            if record is not None:
+                self.manifest.revalidated(url, response.headers)
+                self.stats["not_modified"] += 1
+                return self._carried_page(record, depth, max_depth)
         
-        # Calculate total crawl time
+        if response.status_code == 304:  # Not Modified
+            # Pages in the response cache are processed from their cached body, so
+            # this only happens without one (cache disabled or entry evicted)
+            self.logger.info(f"Page not modified: {url}")
+        
+        elif not (response.status_code in RETRY_STATUSES and self._retry_later(url, depth)):
+            self.logger.warning(f"Failed to fetch {url}: HTTP {response.status_code}")
+            self.stats["errors"] += 1
+        
+        return None, next_urls
+    
+    def _check_near_duplicate(self, url: str, document: ParsedDocument, page_data: Dict[str, Any]) -> bool:
+        """
+        Fingerprint a page and check whether it nearly duplicates an earlier page.
+        
+        The fingerprint is stored in page_data["simhash"]. A near-duplicate gets the
+        URL of the first page of its cluster in page_data["duplicate_of"]; other pages
+        become representatives that later pages are compared with.
+        
+        Args:
+            url (str): URL of the page
+            document (ParsedDocument): Fetched page
+            page_data (Dict[str, Any]): Extracted page data
+            
+        Returns:
+            bool: True if the page is a near-duplicate
+        """
+        if self.simhash_index is None or not document.is_html:
+            return False
+        
+        # Short pages share too many shingles to tell them apart
+        tokens = tokenize(document.text)
+        if len(tokens) < self.near_duplicate_min_words:
+            return False
+        
+        fingerprint = simhash(tokens)
+        page_data["simhash"] = f"{fingerprint:016x}"
+        
+        representative = self.simhash_index.find(fingerprint)
+        
+        if representative is None:
+            self.simhash_index.add(fingerprint, url)
+            return False
+        
+        page_data["duplicate_of"] = representative
+        self.stats["near_duplicates"] += 1
+        self.logger.info(f"Page {url} is a near-duplicate of {representative}")
+        
+        return True
+    
+    def _finish_crawl(self, start_time: float) -> None:
+        """
+        Record the total crawl time and log a summary.
+        
+        Args:
+            start_time (float): Time the crawl started
+        """
         self.stats["crawl_time"] = time.time() - start_time
         
+        if self.scheduler.adaptive:
+            self.stats["hosts"] = self.scheduler.get_host_stats()
+        
+        if self.dns_cache is not None:
+            self.stats["dns"] = self.dns_cache.get_stats(since=self._dns_stats_start)
+        
+        if self.circuit_breakers is not None:
+            self.stats["circuits"] = self.circuit_breakers.get_stats()
+        
+        if self.budget is not None:
+            self.stats["budget"] = self.budget.get_stats()
+            if self.stats["budget"]["exhausted"]:
+                self.logger.info(f"Crawl budget used up: {', '.join(self.stats['budget']['exhausted'])}")
+        
+        self.stats["protocols"] = dict(self.transport.protocols - self._protocols_start)
+        self.stats["connections"] = self.http_client.get_stats(since=self._connection_stats_start)
+        self.transport.close()
+        
+        # A crawl stopped by its budget, or with URLs still queued, did not reach every page
+        complete = not self.frontier and not (self.budget is not None and self.stats["budget"]["exhausted"])
+        
+        self._close_frontier()
+        
+        if self.response_cache is not None:
+            self.response_cache.close()
+        
+        if self.manifest is not None:
+            # Pages a complete crawl did not reach again are no longer on the site
+            if self.prune_manifest and complete:
+                removed = self.manifest.prune(self._crawl_started)
+                if removed:
+                    self.logger.info(f"Removed {removed} pages no longer reached from the crawl manifest")
+            
+            self.manifest.close()
+        
+        # The crawl finished, so there is nothing left to resume
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        
         self.logger.info(f"Crawl completed: {self.stats['pages_crawled']} pages crawled, "
                          f"{self.stats['urls_discovered']} URLs discovered, "
                          f"{self.stats['errors']} errors, "
                          f"{self.stats['crawl_time']:.2f} seconds")
+    
+    def _checkpoint_name(self, url: str) -> str:
+        """
+        Get the checkpoint name of a crawl, unique per crawler type and seed URL.
         
-        return results
+        Args:
+            url (str): The URL the crawl started from
+            
+        Returns:
+            str: Checkpoint name
+        """
+        seed_hash = hashlib.md5(url.encode("utf-8")).hexdigest()[:12]
+        
+        return f"{type(self).__name__.lower()}_{seed_hash}"
     
-    def _fetch_with_cache(self, url: str) -> tuple:
+    def _maybe_checkpoint(self, results: List[Dict[str, Any]]) -> None:
         """
-        Fetch a URL with support for HTTP caching headers.
+        Save a checkpoint if enough pages or time have passed since the last one.
+        
+        Args:
+            results (List[Dict[str, Any]]): Pages crawled so far
+        """
+        if self.checkpoint is None:
+            return
+        
+        pages = self.stats["pages_crawled"] - self._checkpointed_pages
+        elapsed = time.time() - self._checkpointed_at
+        
+        if pages >= self.checkpoint_interval_pages or (pages and elapsed >= self.checkpoint_interval_seconds):
+            self._save_checkpoint(results)
+    
+    def _save_checkpoint(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Save the frontier, visited URLs, HTTP caching validators and new results.
+        
+        Args:
+            results (List[Dict[str, Any]]): Pages crawled so far
+        """
+        if self.checkpoint is None:
+            return
+        
+        # URLs being fetched right now have not completed and are queued again
+        frontier = self.frontier.snapshot()
+        frontier.extend([url, depth, 0, None] for url, depth in self.in_progress.items())
+        requeued = set(self.in_progress)
+        
+        new_results = results[self._checkpointed_results:]
+        
+        # Pages of a streamed crawl are saved by whoever consumes the batches, so
+        # the ones not handed out yet are crawled again after a resume
+        if self.streaming:
+            frontier.extend([page["url"], page["depth"], 0, None] for page in results)
+            requeued.update(page["url"] for page in results)
+            new_results = []
+        
+        # Requeued URLs are fetched again without validators so that the server
+        # sends them in full rather than a 304 for a page that was never saved
+        etag_cache = self.etag_cache
+        last_modified_cache = self.last_modified_cache
+        if requeued:
+            etag_cache = {url: value for url, value in etag_cache.items() if url not in requeued}
+            last_modified_cache = {url: value for url, value in last_modified_cache.items() if url not in requeued}
+        
+        state = {
+            "frontier": frontier,
+            "visited_urls": self.visited_urls.snapshot(),
+            "etag_cache": etag_cache,
+            "last_modified_cache": last_modified_cache,
+            "stats": self.stats
+        }
+        
+        self.checkpoint.save(state, new_results)
+        
+        self._checkpointed_results = len(results)
+        self._checkpointed_pages = self.stats["pages_crawled"]
+        self._checkpointed_at = time.time()
+    
+    def _restore_checkpoint(self, results: List[Dict[str, Any]]) -> bool:
+        """
+        Restore the crawl state from the last checkpoint.
+        
+        Args:
+            results (List[Dict[str, Any]]): List to fill with the pages of the checkpoint
+            
+        Returns:
+            bool: True if a checkpoint was restored
+        """
+        loaded = self.checkpoint.load()
+        if loaded is None:
+            return False
+        
+        state, saved_results = loaded
+        
+        self.visited_urls = restore_visited_set(state["visited_urls"])
+        self.etag_cache.update(state["etag_cache"])
+        self.last_modified_cache.update(state["last_modified_cache"])
+        self.stats.update(state["stats"])
+        self.frontier.restore(state["frontier"])
+        
+        results.extend(saved_results)
+        
+        # Pages of the checkpoint stay the representatives of their clusters
+        if self.simhash_index is not None:
+            for page_data in saved_results:
+                if "simhash" in page_data and "duplicate_of" not in page_data:
+                    self.simhash_index.add(int(page_data["simhash"], 16), page_data["url"])
+        
+        self._checkpointed_results = len(results)
+        self._checkpointed_pages = self.stats["pages_crawled"]
+        
+        self.logger.info(f"Resuming crawl from checkpoint: {len(results)} pages done, "
+                         f"{len(self.frontier)} URLs queued")
+        
+        return True
+    
+    def _request_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build the per-request headers for a URL, including HTTP caching validators.
         
         Args:
             url (str): URL to fetch
             
         Returns:
-            tuple: (response, from_cache) where from_cache is a boolean
+            Dict[str, str]: Headers to send in addition to the session headers
         """
+        if self.response_cache is not None:
+            # Only ask for a 304 when the cached page can be processed instead
+            return self.response_cache.validators(self.fetch_variant, url)
+        
         headers = {}
         
+        # Validators of the previous crawl, whose copy of the page is used on a 304
+        if self.manifest is not None:
+            headers.update(self.manifest.validators(url))
+        
         # Add If-None-Match header if we have a cached ETag
         if url in self.etag_cache:
             headers["If-None-Match"] = self.etag_cache[url]
@@ -218,60 +941,323 @@ class BaseCrawler:
         if url in self.last_modified_cache:
             headers["If-Modified-Since"] = self.last_modified_cache[url]
         
+        return headers
+    
+    def _remember_validators(self, url: str, headers: Dict[str, str]) -> None:
+        """
+        Save the ETag and Last-Modified validators of a response.
+        
+        Args:
+            url (str): URL that was fetched
+            headers (Dict[str, str]): Response headers
+        """
+        # Save ETag if present in response
+        if "ETag" in headers:
+            self.etag_cache[url] = headers["ETag"]
+        
+        # Save Last-Modified if present in response
+        if "Last-Modified" in headers:
+            self.last_modified_cache[url] = headers["Last-Modified"]
+    
+    def _use_response_cache(self, url: str, response):
+        """
+        Store a fetched page in the response cache, or answer a 304 with the cached page.
+        
+        Args:
+            url (str): URL that was fetched
+            response (requests.Response or FetchedResponse): HTTP response
+            
+        Returns:
+            requests.Response or FetchedResponse: The response to process, which is
+                the cached page if the server answered 304 Not Modified
+        """
+        if self.response_cache is None:
+            return response
+        
+        if response.status_code == 304:
+            cached = self.response_cache.revalidate(self.fetch_variant, url, response.headers)
+            
+            if cached is not None:
+                self.stats["not_modified"] += 1
+                return cached
+        elif not getattr(response, "truncated", False) and not getattr(response, "aborted", None):
+            self.response_cache.put(self.fetch_variant, url, response)
+        
+        return response
+    
+    def _shared_response(self, url: str) -> Optional[FetchedResponse]:
+        """
+        Get the response of a URL already fetched by a crawler with the same variant.
+        
+        Args:
+            url (str): URL to fetch
+            
+        Returns:
+            Optional[FetchedResponse]: The shared response, or None if the URL has to
+                be fetched
+        """
+        if self.fetch_cache is None:
+            return None
+        
+        response = self.fetch_cache.get(self.fetch_variant, url)
+        if response is None:
+            return None
+        
+        self._remember_validators(url, response.headers)
+        self.stats["shared_fetches"] += 1
+        
+        return response
+    
+    def _carry_forward(self, url: str, depth: int,
+                       max_depth: int) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+        """
+        Take over a page of the previous crawl without fetching it if it is unchanged.
+        
+        A page counts as unchanged if its sitemap lastmod is not newer than the time it
+        was last fetched, or, for pages without a lastmod, if it was fetched less than
+        refresh_after_hours ago.
+        
+        Args:
+            url (str): URL returned by frontier.pop()
+            depth (int): Crawl depth of the URL
+            max_depth (int): Maximum crawl depth
+            
+        Returns:
+            Optional[Tuple[Dict[str, Any], List[str]]]: (page_data, next_urls) of the
+                previous crawl, or None if the page has to be fetched
+        """
+        if self.manifest is None:
+            return None
+        
+        record = self.manifest.get(url)
+        if record is None:
+            return None
+        
+        lastmod = self.sitemap_lastmod.get(url)
+        if lastmod is not None:
+            unchanged = lastmod <= record["fetched_at"]
+        else:
+            unchanged = time.time() - record["fetched_at"] < self.refresh_after
+        
+        if not unchanged:
+            return None
+        
+        self.manifest.seen(url)
+        
+        return self._carried_page(record, depth, max_depth)
+    
+    def _carried_page(self, record: Dict[str, Any], depth: int,
+                      max_depth: int) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Get the page data and links of a page taken over from the previous crawl.
+        
+        Args:
+            record (Dict[str, Any]): Manifest record of the page
+            depth (int): Crawl depth of the page in this crawl
+            max_depth (int): Maximum crawl depth
+            
+        Returns:
+            Tuple[Dict[str, Any], List[str]]: (page_data, next_urls)
+        """
+        page_data = record["page"]
+        page_data["depth"] = depth
+        page_data["unchanged"] = True
+        
+        self.stats["carried_forward"] += 1
+        
+        return page_data, record["links"] if depth < max_depth else []
+    
+    def _update_manifest(self, url: str, response, page_data: Dict[str, Any],
+                         links: List[str]) -> None:
+        """
+        Record a fetched page in the manifest and mark it if its content did not change.
+        
+        Args:
+            url (str): URL of the page
+            response (requests.Response or FetchedResponse): HTTP response
+            page_data (Dict[str, Any]): Extracted page data
+            links (List[str]): Normalized URLs the page links to
+        """
+        content_hash = hashlib.md5(response.content).hexdigest()
+        previous_hash = self.manifest.content_hash(url)
+        
+        self.manifest.put(url, content_hash, response.headers, page_data, links)
+        
+        if previous_hash is None:
+            return
+        
+        if previous_hash == content_hash:
+            page_data["unchanged"] = True
+            self.stats["unchanged"] += 1
+        else:
+            self.stats["changed"] += 1
+    
+    def _fetch_with_cache(self, url: str) -> tuple:
+        """
+        Fetch a URL with support for HTTP caching headers.
+        
+        Args:
+            url (str): URL to fetch
+            
+        Returns:
+            tuple: (response, from_cache) where from_cache is a boolean
+        """
+        headers = self._request_headers(url)
+        started = time.monotonic()
+        
         # Make the request with the conditional headers
         try:
-            response = self.session.get(
+            response = self.transport.fetch(
                 url,
-                headers=headers,
-                timeout=self.timeout,
+                headers,
+                self.timeout,
                 allow_redirects=self.config["crawl_settings"]["follow_redirects"],
-                verify=self.config["crawl_settings"]["verify_ssl"]
+                verify=self.config["crawl_settings"]["verify_ssl"],
+                limits=self.response_limits
             )
             
-            # Save ETag if present in response
-            if "ETag" in response.headers:
-                self.etag_cache[url] = response.headers["ETag"]
-            
-            # Save Last-Modified if present in response
-            if "Last-Modified" in response.headers:
-                self.last_modified_cache[url] = response.headers["Last-Modified"]
+            self._record_fetch(url, response, time.monotonic() - started)
+            self._remember_validators(url, response.headers)
             
             # Check if we got a 304 Not Modified
             from_cache = response.status_code == 304
             
+            response = self._use_response_cache(url, response)
+            
+            if self.fetch_cache is not None:
+                self.fetch_cache.put(self.fetch_variant, url, response)
+            
             return response, from_cache
             
         except requests.exceptions.RequestException as e:
+            self._record_fetch(url, None, time.monotonic() - started,
+                               timed_out=isinstance(e, requests.exceptions.Timeout))
             self.logger.error(f"Request error for {url}: {str(e)}")
             raise
     
-    def _process_page(self, response: requests.Response, url: str, depth: int) -> Dict[str, Any]:
+    def _record_fetch(self, url: str, response, latency: float, timed_out: bool = False) -> None:
+        """
+        Report the outcome of a request to the host scheduler's adaptive limits,
+        the host's circuit breaker and the retry budget.
+        
+        Args:
+            url (str): Requested URL
+            response (requests.Response or FetchedResponse): Response, or None if the
+                request failed
+            latency (float): Time until the response arrived, in seconds
+            timed_out (bool): Whether the request timed out
+        """
+        host = get_host_key(url)
+        
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+        
+        if self.circuit_breakers is not None:
+            healthy = response is not None and response.status_code not in FAILURE_STATUSES
+            self._record_host_health(host, healthy)
+        
+        if response is None:
+            self.scheduler.record(host, None, latency, timed_out)
+            return
+        
+        retry_after = None
+        if response.status_code in (429, 503):
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        
+        self.scheduler.record(host, response.status_code, latency, retry_after=retry_after)
+    
+    def _record_host_health(self, host: str, healthy: bool) -> None:
+        """
+        Update the circuit breaker of a host, parking the host while its circuit is open.
+        
+        Args:
+            host (str): Host origin
+            healthy (bool): Whether the host answered without a server error
+        """
+        change = self.circuit_breakers.record(host, healthy)
+        
+        if change == OPEN:
+            # The host's URLs stay queued while the other hosts are crawled
+            until = self.circuit_breakers.open_until(host)
+            self.scheduler.park(host, until)
+            self.logger.warning(f"Circuit open for {host}: parking its URLs for "
+                                f"{until - time.monotonic():.1f} seconds")
+        
+        elif change == GIVEN_UP:
+            dropped = self.frontier.drop_host(host)
+            self.stats["dropped"] += dropped
+            self.logger.warning(f"Giving up on {host} after repeated failures: "
+                                f"dropped {dropped} queued URLs")
+        
+        elif change == CLOSED:
+            self.scheduler.park(host, 0.0)
+            self.logger.info(f"Circuit closed for {host}: crawling it again")
+    
+    def _retry_later(self, url: str, depth: int) -> bool:
+        """
+        Queue a URL whose fetch failed for another attempt, if the retry budget allows.
+        
+        Args:
+            url (str): URL of the failed fetch
+            depth (int): Crawl depth of the URL
+            
+        Returns:
+            bool: True if the URL was queued again
+        """
+        if self.retry_budget is None or not self.retry_failed:
+            return False
+        
+        if self.circuit_breakers is not None and get_host_key(url) in self.circuit_breakers.given_up:
+            return False
+        
+        attempts = self.retry_attempts.get(url, 1)
+        if attempts >= self.retry_budget.max_attempts:
+            return False
+        
+        if not self.retry_budget.try_retry():
+            self.stats["retries_denied"] += 1
+            return False
+        
+        # The host's delay, back-off or open circuit decides when the URL is fetched
+        self.retry_attempts[url] = attempts + 1
+        self.frontier.push(url, depth)
+        
+        if self.budget is not None:
+            self.budget.refund(url, depth)
+        self.stats["retries"] += 1
+        self.logger.info(f"Retrying {url} later (attempt {attempts + 1} of {self.retry_budget.max_attempts})")
+        
+        return True
+    
+    def _process_page(self, document: ParsedDocument, depth: int) -> Dict[str, Any]:
         """
         Process a page and extract its content.
         
         Args:
-            response (requests.Response): HTTP response
-            url (str): URL of the page
+            document (ParsedDocument): Fetched page
             depth (int): Current crawl depth
             
         Returns:
             Dict[str, Any]: Extracted page data
         """
+        response = document.response
+        url = document.url
+        
         # Base page data
         page_data = {
             "url": url,
             "depth": depth,
             "status_code": response.status_code,
-            "content_type": response.headers.get("Content-Type", ""),
+            "content_type": document.content_type,
             "crawl_time": datetime.now().isoformat(),
             "size": len(response.content),
             "headers": dict(response.headers)
         }
         
         try:
-            # Parse HTML with BeautifulSoup if it's HTML content
-            if "text/html" in page_data["content_type"]:
-                soup = BeautifulSoup(response.content, "lxml")
+            # Use the parsed HTML tree if it's HTML content
+            if document.is_html:
+                soup = document.soup
                 
                 # Extract title
                 page_data["title"] = soup.title.string.strip() if soup.title else ""
@@ -314,42 +1300,38 @@ class BaseCrawler:
         
         return page_data
     
-    def _extract_links(self, response: requests.Response, base_url: str) -> List[str]:
+    def _extract_links(self, document: ParsedDocument) -> List[str]:
         """
         Extract links from a page.
         
         Args:
-            response (requests.Response): HTTP response
-            base_url (str): Base URL for resolving relative URLs
+            document (ParsedDocument): Fetched page, whose URL is used to resolve
+                relative URLs
             
         Returns:
             List[str]: List of normalized URLs
         """
         links = []
+        base_url = document.url
         
         try:
             # Only extract links from HTML content
-            if "text/html" not in response.headers.get("Content-Type", ""):
+            if not document.is_html:
                 return links
             
-            soup = BeautifulSoup(response.content, "lxml")
+            resolver = LinkResolver(base_url)
             
-            # Extract all <a> tags with href attribute
-            for a_tag in soup.find_all("a", href=True):
-                href = a_tag["href"]
+            # Pages repeat links (navigation, footers), so each one is resolved once
+            for href in dict.fromkeys(document.hrefs):
+                link = resolver.resolve(href)
+                if link is None:
+                    continue
                 
-                # Resolve relative URLs
-                absolute_url = urljoin(base_url, href)
+                normalized_url, domain = link
                 
-                # Normalize and validate URL
-                if is_valid_url(absolute_url):
-                    normalized_url = normalize_url(absolute_url)
-                    
-                    # Check if the domain is allowed (if allowed_domains is specified)
-                    domain = get_domain(normalized_url)
-                    if (not self.config["allowed_domains"] or 
-                            domain in self.config["allowed_domains"]):
-                        links.append(normalized_url)
+                # Check if the domain is allowed (if allowed_domains is specified)
+                if self.url_filter.is_allowed_domain(domain):
+                    links.append(normalized_url)
         
         except Exception as e:
             self.logger.error(f"Error extracting links from {base_url}: {str(e)}")
@@ -0,0 +1,297 @@
+"""
+Crawl Budget - Page, byte and time limits of a crawl, per host, depth and path prefix
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Set
+
+from ..utils.url import parse_url
+from .frontier import get_host_key
+
+
+class CrawlBudget:
+    """
+    Accounts the pages and bytes of one crawl against its limits.
+    
+    Crawl-wide limits on pages, bytes and wall-clock time end the crawl once they
+    are used up. Page limits per host, per depth and per URL path prefix, and a
+    byte limit per host, only end the crawl of their scope: URLs in an exhausted
+    scope are neither queued nor fetched any more. A limit of 0 means unlimited.
+    
+    A page is charged when its fetch starts, so concurrent fetches cannot overshoot
+    a page limit, and refunded if the URL is queued again for a retry.
+    """
+    
+    def __init__(self, max_pages: int = 0, max_bytes: int = 0, max_seconds: float = 0,
+                 max_pages_per_host: int = 0, max_bytes_per_host: int = 0,
+                 max_pages_per_depth: Optional[Dict[int, int]] = None,
+                 max_pages_per_prefix: Optional[Dict[str, int]] = None):
+        """
+        Initialize the crawl budget.
+        
+        Args:
+            max_pages (int): Pages per crawl
+            max_bytes (int): Downloaded page bytes per crawl
+            max_seconds (float): Wall-clock time per crawl in seconds
+            max_pages_per_host (int): Pages per host
+            max_bytes_per_host (int): Downloaded page bytes per host
+            max_pages_per_depth (Dict[int, int], optional): Crawl depth mapped to
+                the pages allowed at that depth
+            max_pages_per_prefix (Dict[str, int], optional): URL path prefix mapped
+                to the pages allowed under it
+        """
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.max_pages_per_host = max_pages_per_host
+        self.max_bytes_per_host = max_bytes_per_host
+        self.max_pages_per_depth = {int(depth): pages for depth, pages in (max_pages_per_depth or {}).items()}
+        self.max_pages_per_prefix = dict(max_pages_per_prefix or {})
+        
+        self.started = time.monotonic()
+        self.pages = 0
+        self.bytes = 0
+        self.skipped = 0
+        
+        # Use of the scoped limits
+        self._host_pages: Dict[str, int] = {}
+        self._host_bytes: Dict[str, int] = {}
+        self._depth_pages: Dict[int, int] = {}
+        self._prefix_pages: Dict[str, int] = {}
+        
+        # Names of the limits that ran out, such as "host https://example.com"
+        self._exhausted: Set[str] = set()
+        
+        # Crawl-wide page and byte counters of a multi-process crawl and their lock
+        self._shared = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["CrawlBudget"]:
+        """
+        Create a budget from crawl_settings.max_pages and crawl_settings.budget.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            Optional[CrawlBudget]: Budget, or None if no limit is set
+        """
+        crawl_settings = config["crawl_settings"]
+        budget_config = crawl_settings.get("budget", {})
+        
+        budget = cls(
+            max_pages=crawl_settings.get("max_pages") or 0,
+            max_bytes=int((budget_config.get("max_bytes_mb") or 0) * 1024 * 1024),
+            max_seconds=budget_config.get("max_seconds") or 0,
+            max_pages_per_host=budget_config.get("max_pages_per_host") or 0,
+            max_bytes_per_host=int((budget_config.get("max_bytes_mb_per_host") or 0) * 1024 * 1024),
+            max_pages_per_depth=budget_config.get("max_pages_per_depth"),
+            max_pages_per_prefix=budget_config.get("max_pages_per_prefix")
+        )
+        
+        return budget if budget.has_limits() else None
+    
+    def has_limits(self) -> bool:
+        """
+        Check whether any limit is set.
+        
+        Returns:
+            bool: True if the budget limits the crawl
+        """
+        return bool(self.max_pages or self.max_bytes or self.max_seconds or self.max_pages_per_host
+                    or self.max_bytes_per_host or self.max_pages_per_depth or self.max_pages_per_prefix)
+    
+    def share(self, parts: int, pages, size, lock) -> None:
+        """
+        Set up the budget of one of the processes of a multi-process crawl.
+        
+        The crawl-wide pages and bytes are counted in counters shared by all the
+        processes. Per-host limits and the time limit stay as they are, as each host
+        is crawled by one process and the processes run at the same time. Of the
+        depth and path prefix limits, which span hosts, each process keeps an equal
+        share. Processes starting fetches at the same moment may overshoot the
+        crawl-wide page limit by a page each.
+        
+        Args:
+            parts (int): Number of processes sharing the crawl
+            pages (multiprocessing.Value): Pages charged by all processes
+            size (multiprocessing.Value): Bytes charged by all processes
+            lock (multiprocessing.Lock): Lock guarding the counters
+        """
+        def share(limit: int) -> int:
+            return max(1, limit // parts)
+        
+        self._shared = (pages, size, lock)
+        self.max_pages_per_depth = {depth: share(limit) for depth, limit in self.max_pages_per_depth.items()}
+        self.max_pages_per_prefix = {prefix: share(limit) for prefix, limit in self.max_pages_per_prefix.items()}
+    
+    def exhausted(self) -> Optional[str]:
+        """
+        Check whether a crawl-wide limit has run out.
+        
+        Returns:
+            Optional[str]: Name of the limit, or None if the crawl may go on
+        """
+        pages, size = self.pages, self.bytes
+        if self._shared is not None:
+            pages, size = self._shared[0].value, self._shared[1].value
+        
+        if self.max_pages and pages >= self.max_pages:
+            reason = "max_pages"
+        elif self.max_bytes and size >= self.max_bytes:
+            reason = "max_bytes"
+        elif self.max_seconds and time.monotonic() - self.started >= self.max_seconds:
+            reason = "max_seconds"
+        else:
+            return None
+        
+        self._exhausted.add(reason)
+        
+        return reason
+    
+    def allows(self, url: str, depth: int) -> bool:
+        """
+        Check whether a URL is in a scope with budget left, without charging it.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            
+        Returns:
+            bool: False if the crawl or one of the URL's scopes is exhausted
+        """
+        if self.exhausted() is not None:
+            return False
+        
+        host = get_host_key(url)
+        
+        if self.max_pages_per_host and self._host_pages.get(host, 0) >= self.max_pages_per_host:
+            return self._deny(f"host {host}")
+        
+        if self.max_bytes_per_host and self._host_bytes.get(host, 0) >= self.max_bytes_per_host:
+            return self._deny(f"host bytes {host}")
+        
+        limit = self.max_pages_per_depth.get(depth)
+        if limit is not None and self._depth_pages.get(depth, 0) >= limit:
+            return self._deny(f"depth {depth}")
+        
+        for prefix in self._prefixes(url):
+            if self._prefix_pages.get(prefix, 0) >= self.max_pages_per_prefix[prefix]:
+                return self._deny(f"prefix {prefix}")
+        
+        return True
+    
+    def admit(self, url: str, depth: int) -> bool:
+        """
+        Charge a page to the budget before it is fetched.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            
+        Returns:
+            bool: False if there is no budget left for the URL
+        """
+        if not self.allows(url, depth):
+            return False
+        
+        self._charge(url, depth, 1)
+        
+        return True
+    
+    def refund(self, url: str, depth: int) -> None:
+        """
+        Give back the page charged for a URL that is queued again.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+        """
+        self._charge(url, depth, -1)
+    
+    def add_bytes(self, url: str, size: int) -> None:
+        """
+        Charge downloaded bytes to the budget.
+        
+        Args:
+            url (str): URL of the page
+            size (int): Size of the page body in bytes
+        """
+        host = get_host_key(url)
+        
+        self.bytes += size
+        self._host_bytes[host] = self._host_bytes.get(host, 0) + size
+        
+        if self._shared is not None:
+            with self._shared[2]:
+                self._shared[1].value += size
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the use of the budget.
+        
+        Returns:
+            Dict[str, Any]: Pages and bytes charged, seconds elapsed, URLs skipped for
+                lack of budget and the limits that ran out
+        """
+        return {
+            "pages": self.pages,
+            "bytes": self.bytes,
+            "seconds": round(time.monotonic() - self.started, 3),
+            "skipped": self.skipped,
+            "exhausted": sorted(self._exhausted),
+        }
+    
+    def _prefixes(self, url: str) -> List[str]:
+        """
+        Get the configured path prefixes a URL falls under.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            List[str]: Matching prefixes
+        """
+        if not self.max_pages_per_prefix:
+            return []
+        
+        path = parse_url(url).path or "/"
+        
+        return [prefix for prefix in self.max_pages_per_prefix if path.startswith(prefix)]
+    
+    def _charge(self, url: str, depth: int, pages: int) -> None:
+        """
+        Add pages to the crawl and to every scope of a URL.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            pages (int): Number of pages to add, negative for a refund
+        """
+        host = get_host_key(url)
+        
+        self.pages += pages
+        if self._shared is not None:
+            with self._shared[2]:
+                self._shared[0].value += pages
+        
+        self._host_pages[host] = self._host_pages.get(host, 0) + pages
+        self._depth_pages[depth] = self._depth_pages.get(depth, 0) + pages
+        
+        for prefix in self._prefixes(url):
+            self._prefix_pages[prefix] = self._prefix_pages.get(prefix, 0) + pages
+    
+    def _deny(self, scope: str) -> bool:
+        """
+        Record that a URL was turned away because its scope is exhausted.
+        
+        Args:
+            scope (str): Name of the exhausted limit
+            
+        Returns:
+            bool: Always False
+        """
+        self._exhausted.add(scope)
+        self.skipped += 1
+        
+        return False
\ No newline at end of file
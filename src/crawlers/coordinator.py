@@ -0,0 +1,489 @@
+"""
+Crawl Coordinator - Shares one crawl between several SheikhBot nodes
+"""
+
+import os
+import time
+import socket
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+import logging
+
+from .frontier import get_host_key
+
+
+class CrawlCoordinator:
+    """
+    Interface of the service several nodes use to crawl one job together.
+    
+    A coordinator owns the shared state of a crawl: the deduplicated set of every
+    URL ever discovered, the URLs waiting to be fetched, the leases of URLs a node
+    is fetching and one politeness token per host, so that at most one node
+    fetches from a host at a time and the host's crawl delay is respected across
+    nodes. A lease that is not acknowledged in time is handed to another node.
+    """
+    
+    def add_urls(self, urls: List[Tuple[str, int, float]]) -> int:
+        """
+        Add discovered URLs to the crawl, ignoring those that were seen before.
+        
+        Args:
+            urls (List[Tuple[str, int, float]]): (url, depth, priority score) triples
+            
+        Returns:
+            int: Number of URLs that were new
+        """
+        raise NotImplementedError
+    
+    def lease(self, node_id: str) -> Optional[Tuple[str, int]]:
+        """
+        Lease the highest-priority URL of a host that is free and ready.
+        
+        Args:
+            node_id (str): Node taking the lease
+            
+        Returns:
+            Optional[Tuple[str, int]]: (url, depth), or None if no URL can be leased now
+        """
+        raise NotImplementedError
+    
+    def acknowledge(self, url: str, node_id: str, delay: float = 0.0) -> None:
+        """
+        Mark a leased URL as crawled and release its host token.
+        
+        Args:
+            url (str): Leased URL
+            node_id (str): Node holding the lease
+            delay (float): Seconds before the host may be fetched again
+        """
+        raise NotImplementedError
+    
+    def is_finished(self) -> bool:
+        """
+        Check whether every discovered URL has been crawled.
+        
+        Returns:
+            bool: True if no URL is waiting or leased
+        """
+        raise NotImplementedError
+    
+    def restart_if_finished(self) -> bool:
+        """
+        Forget a job that has been crawled completely, so it can be crawled again.
+        
+        Returns:
+            bool: True if a finished job was removed
+        """
+        raise NotImplementedError
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the progress of the crawl.
+        
+        Returns:
+            Dict[str, Any]: Number of URLs per state and pages crawled per node
+        """
+        raise NotImplementedError
+    
+    def close(self) -> None:
+        """Release the resources held by the coordinator."""
+
+
+class SqliteCoordinator(CrawlCoordinator):
+    """
+    Coordinator storing the shared crawl state in a SQLite database file.
+    
+    Every node on the same machine (or on machines sharing the file over a
+    filesystem with working locks) opens the same database. Leasing runs in an
+    immediate transaction, so two nodes never lease the same URL or host.
+    """
+    
+    def __init__(self, path: str, job: str = "default", lease_seconds: float = 120.0):
+        """
+        Initialize the SQLite coordinator.
+        
+        Args:
+            path (str): Path of the shared database file
+            job (str): Name of the crawl job, so one database can hold several jobs
+            lease_seconds (float): Seconds after which an unacknowledged lease expires
+        """
+        self.logger = logging.getLogger("sheikhbot")
+        self.path = path
+        self.job = job
+        self.lease_seconds = lease_seconds
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                job TEXT, url TEXT, host TEXT, depth INTEGER, score REAL,
+                state TEXT, node TEXT, lease_expires REAL,
+                PRIMARY KEY (job, url)
+            );
+            CREATE INDEX IF NOT EXISTS urls_pending ON urls (job, state, score);
+            CREATE TABLE IF NOT EXISTS hosts (
+                job TEXT, host TEXT, holder TEXT, lease_expires REAL, ready_at REAL,
+                PRIMARY KEY (job, host)
+            );
+        """)
+    
+    def add_urls(self, urls: List[Tuple[str, int, float]]) -> int:
+        """
+        Add discovered URLs to the crawl, ignoring those that were seen before.
+        
+        Args:
+            urls (List[Tuple[str, int, float]]): (url, depth, priority score) triples
+            
+        Returns:
+            int: Number of URLs that were new
+        """
+        if not urls:
+            return 0
+        
+        with self._transaction() as db:
+            before = db.total_changes
+            
+            db.executemany(
+                "INSERT OR IGNORE INTO urls VALUES (?, ?, ?, ?, ?, 'pending', NULL, NULL)",
+                [(self.job, url, get_host_key(url), depth, score) for url, depth, score in urls]
+            )
+            added = db.total_changes - before
+            
+            db.executemany(
+                "INSERT OR IGNORE INTO hosts VALUES (?, ?, NULL, NULL, 0)",
+                [(self.job, host) for host in {get_host_key(url) for url, _, _ in urls}]
+            )
+        
+        return added
+    
+    def lease(self, node_id: str) -> Optional[Tuple[str, int]]:
+        """
+        Lease the highest-priority URL of a host that is free and ready.
+        
+        Args:
+            node_id (str): Node taking the lease
+            
+        Returns:
+            Optional[Tuple[str, int]]: (url, depth), or None if no URL can be leased now
+        """
+        now = time.time()
+        
+        with self._transaction() as db:
+            self._expire_leases(db, now)
+            
+            row = db.execute(
+                "SELECT u.url, u.depth, u.host FROM urls u JOIN hosts h "
+                "ON h.job = u.job AND h.host = u.host "
+                "WHERE u.job = ? AND u.state = 'pending' AND h.holder IS NULL AND h.ready_at <= ? "
+                "ORDER BY u.score DESC LIMIT 1",
+                (self.job, now)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            url, depth, host = row
+            expires = now + self.lease_seconds
+            
+            db.execute(
+                "UPDATE urls SET state = 'leased', node = ?, lease_expires = ? WHERE job = ? AND url = ?",
+                (node_id, expires, self.job, url)
+            )
+            db.execute(
+                "UPDATE hosts SET holder = ?, lease_expires = ? WHERE job = ? AND host = ?",
+                (node_id, expires, self.job, host)
+            )
+        
+        return url, depth
+    
+    def acknowledge(self, url: str, node_id: str, delay: float = 0.0) -> None:
+        """
+        Mark a leased URL as crawled and release its host token.
+        
+        Args:
+            url (str): Leased URL
+            node_id (str): Node holding the lease
+            delay (float): Seconds before the host may be fetched again
+        """
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE urls SET state = 'done', lease_expires = NULL WHERE job = ? AND url = ? AND node = ?",
+                (self.job, url, node_id)
+            )
+            db.execute(
+                "UPDATE hosts SET holder = NULL, lease_expires = NULL, ready_at = ? "
+                "WHERE job = ? AND host = ? AND holder = ?",
+                (time.time() + delay, self.job, get_host_key(url), node_id)
+            )
+    
+    def is_finished(self) -> bool:
+        """
+        Check whether every discovered URL has been crawled.
+        
+        Returns:
+            bool: True if no URL is waiting or leased
+        """
+        row = self._db.execute(
+            "SELECT COUNT(*) FROM urls WHERE job = ? AND state != 'done'", (self.job,)
+        ).fetchone()
+        
+        return row[0] == 0
+    
+    def restart_if_finished(self) -> bool:
+        """
+        Forget a job that has been crawled completely, so it can be crawled again.
+        
+        Returns:
+            bool: True if a finished job was removed
+        """
+        with self._transaction() as db:
+            done, unfinished = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(state != 'done'), 0) FROM urls WHERE job = ?", (self.job,)
+            ).fetchone()
+            
+            if done == 0 or unfinished:
+                return False
+            
+            db.execute("DELETE FROM urls WHERE job = ?", (self.job,))
+            db.execute("DELETE FROM hosts WHERE job = ?", (self.job,))
+        
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the progress of the crawl.
+        
+        Returns:
+            Dict[str, Any]: Number of URLs per state and pages crawled per node
+        """
+        states = dict(self._db.execute(
+            "SELECT state, COUNT(*) FROM urls WHERE job = ? GROUP BY state", (self.job,)
+        ).fetchall())
+        nodes = dict(self._db.execute(
+            "SELECT node, COUNT(*) FROM urls WHERE job = ? AND state = 'done' GROUP BY node", (self.job,)
+        ).fetchall())
+        
+        return {
+            "pending": states.get("pending", 0),
+            "leased": states.get("leased", 0),
+            "done": states.get("done", 0),
+            "pages_per_node": nodes
+        }
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+    
+    def _expire_leases(self, db: sqlite3.Connection, now: float) -> None:
+        """
+        Return the URLs and host tokens of nodes that did not acknowledge in time.
+        
+        Args:
+            db (sqlite3.Connection): Connection inside a transaction
+            now (float): Current time
+        """
+        expired = db.execute(
+            "UPDATE urls SET state = 'pending', node = NULL, lease_expires = NULL "
+            "WHERE job = ? AND state = 'leased' AND lease_expires < ?",
+            (self.job, now)
+        ).rowcount
+        
+        if expired:
+            self.logger.warning(f"{expired} URL leases expired and were returned to the crawl")
+        
+        db.execute(
+            "UPDATE hosts SET holder = NULL, lease_expires = NULL "
+            "WHERE job = ? AND holder IS NOT NULL AND lease_expires < ?",
+            (self.job, now)
+        )
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a write transaction that takes the database lock before reading.
+        
+        Returns:
+            Iterator[sqlite3.Connection]: Connection to use inside the transaction
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        
+        try:
+            yield self._db
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        
+        self._db.execute("COMMIT")
+
+
+def create_coordinator(config: Dict[str, Any], job: str) -> CrawlCoordinator:
+    """
+    Create the coordinator configured in crawl_settings.coordinator.
+    
+    Args:
+        config (Dict[str, Any]): Configuration dictionary
+        job (str): Name of the crawl job
+        
+    Returns:
+        CrawlCoordinator: Coordinator shared by every node of the job
+    """
+    coordinator_config = config["crawl_settings"].get("coordinator", {})
+    backend = coordinator_config.get("backend", "sqlite")
+    
+    if backend == "sqlite":
+        return SqliteCoordinator(
+            coordinator_config.get("path", "data/coordinator/crawl.db"),
+            job=job,
+            lease_seconds=coordinator_config.get("lease_seconds", 120)
+        )
+    
+    raise ValueError(f"Unsupported coordinator backend: {backend}")
+
+
+def default_node_id() -> str:
+    """
+    Get a node id that is unique per machine and process.
+    
+    Returns:
+        str: Node id
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class CoordinatedCrawl:
+    """
+    Runs a crawler's crawl loop with URLs leased from a shared coordinator.
+    
+    The node fetches and processes pages with the crawler's own hooks, sends every
+    discovered URL to the coordinator instead of its local frontier, and
+    acknowledges each page with the crawl delay of its host. It returns the pages
+    it crawled itself, so each node stores its share of the results.
+    """
+    
+    def __init__(self, crawler, coordinator: CrawlCoordinator, node_id: Optional[str] = None,
+                 poll_interval: float = 1.0, restart_finished: bool = True):
+        """
+        Initialize the coordinated crawl.
+        
+        Args:
+            crawler (BaseCrawler): Crawler whose hooks and settings are used
+            coordinator (CrawlCoordinator): Coordinator shared with the other nodes
+            node_id (str, optional): Id of this node. Defaults to hostname and process id.
+            poll_interval (float): Seconds to wait when no URL can be leased
+            restart_finished (bool): Crawl the job again if it was already finished.
+                Set to False when the job name is unique per run, so that a node
+                joining late does not start the run's crawl over.
+        """
+        self.crawler = crawler
+        self.coordinator = coordinator
+        self.node_id = node_id or default_node_id()
+        self.poll_interval = poll_interval
+        self.restart_finished = restart_finished
+        self.logger = logging.getLogger("sheikhbot")
+        
+        # Discovered URLs waiting to be sent to the coordinator
+        self._discovered: List[Tuple[str, int, float]] = []
+        self._max_depth = 0
+    
+    def crawl(self, url: str, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Crawl a URL and its linked pages up to max_depth together with the other nodes.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int, optional): Maximum crawl depth. If None, uses config value.
+            
+        Returns:
+            List[Dict[str, Any]]: Pages crawled by this node
+        """
+        crawler = self.crawler
+        
+        if max_depth is None:
+            max_depth = crawler.config["crawl_settings"]["max_depth"]
+        
+        self.logger.info(f"Joining coordinated crawl of {url} as node {self.node_id}")
+        
+        start_time = time.time()
+        results = []
+        self._max_depth = max_depth
+        
+        if self.restart_finished and self.coordinator.restart_if_finished():
+            self.logger.info(f"Coordinated crawl of {url} had finished before, starting it again")
+        
+        # Settings changed for the coordinated crawl, given back afterwards
+        saved_settings = (crawler.checkpoint_enabled, crawler.prune_manifest, crawler.retry_failed)
+        
+        # The coordinator holds the crawl state, so local checkpoints are not needed
+        crawler.checkpoint_enabled = False
+        crawler.url_router = self._route
+        
+        # Each node only reaches part of the site, so none may prune the manifest
+        crawler.prune_manifest = False
+        
+        # URLs come from the coordinator, so a failed URL queued locally would never be fetched
+        crawler.retry_failed = False
+        
+        try:
+            # Every node adds the seed; the coordinator keeps only the first
+            crawler._start_crawl(url, max_depth, results)
+            self._send_urls()
+            
+            # Each node crawls within a budget of its own
+            while crawler._within_budget():
+                item = self.coordinator.lease(self.node_id)
+                
+                if item is None:
+                    if self.coordinator.is_finished():
+                        break
+                    
+                    # Other nodes hold the remaining hosts or they are waiting out their delay
+                    time.sleep(self.poll_interval)
+                    continue
+                
+                current_url, current_depth = item
+                crawler._crawl_page(current_url, current_depth, max_depth, results)
+                self._send_urls()
+                
+                # A host parked by its circuit breaker is held back on every node
+                host = get_host_key(current_url)
+                delay = max(crawler.scheduler.delay_for(host), crawler.scheduler.ready_at(host) - time.monotonic())
+                self.coordinator.acknowledge(current_url, self.node_id, delay)
+            
+            # Finish while the manifest may not be pruned
+            crawler._finish_crawl(start_time)
+        
+        finally:
+            crawler.url_router = None
+            crawler.checkpoint_enabled, crawler.prune_manifest, crawler.retry_failed = saved_settings
+        
+        self.logger.info(f"Coordinated crawl progress: {self.coordinator.get_stats()}")
+        
+        return results
+    
+    def _route(self, url: str, depth: int) -> bool:
+        """
+        Collect a discovered URL for the coordinator instead of the local frontier.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            
+        Returns:
+            bool: Always False, as no URL is queued locally
+        """
+        # The local visited set only saves sending the same URL twice
+        if self.crawler._should_crawl(url, depth, self._max_depth):
+            score = self.crawler.scorer(url, depth, 0, None)
+            self._discovered.append((url, depth, score))
+        
+        return False
+    
+    def _send_urls(self) -> None:
+        """Send the collected URLs to the coordinator."""
+        self.coordinator.add_urls(self._discovered)
+        self._discovered = []
\ No newline at end of file
@@ -9,15 +9,17 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 import time
-import requests
 from bs4 import BeautifulSoup
 
 from .base_crawler import BaseCrawler
+from ..parsers.document import ParsedDocument
 
 
 class DesktopCrawler(BaseCrawler):
     """Specialized crawler for desktop web pages."""
     
+    fetch_variant = "desktop"
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the desktop crawler.
@@ -94,20 +96,21 @@ class DesktopCrawler(BaseCrawler):
             self.logger.error(f"Error fetching {url} with Selenium: {str(e)}")
             raise
     
-    def _process_page(self, response: requests.Response, url: str, depth: int) -> Dict[str, Any]:
+    def _process_page(self, document: ParsedDocument, depth: int) -> Dict[str, Any]:
         """
         Process a page with desktop-specific enhancements.
         
         Args:
-            response (requests.Response): HTTP response
-            url (str): URL of the page
+            document (ParsedDocument): Fetched page
             depth (int): Current crawl depth
             
         Returns:
             Dict[str, Any]: Extracted page data
         """
+        url = document.url
+        
         # First get the base page data
-        page_data = super()._process_page(response, url, depth)
+        page_data = super()._process_page(document, depth)
         
         # Add desktop-specific data
         page_data["crawler_type"] = "desktop"
@@ -115,8 +118,8 @@ class DesktopCrawler(BaseCrawler):
         
         try:
             # If it's HTML content, extract additional desktop-specific content
-            if "text/html" in page_data["content_type"]:
-                soup = BeautifulSoup(response.content, "lxml")
+            if document.is_html:
+                soup = document.soup
                 
                 # Check if page might require JavaScript
                 scripts = soup.find_all("script")
@@ -0,0 +1,106 @@
+"""
+Shared Fetch Cache - Responses fetched once per crawl session and reused by every crawler
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+import logging
+
+from ..utils.http import FetchedResponse
+
+
+class SharedFetchCache:
+    """
+    Keeps the responses fetched during one SheikhBot.crawl session.
+    
+    Responses are keyed by request variant and URL. Crawlers that send the same kind
+    of request (the same User-Agent class) use the same variant, so a page fetched by
+    one of them is not downloaded again by the others. The bodies kept are limited
+    to max_bytes; the least recently used responses are dropped first.
+    """
+    
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the fetch cache.
+        
+        Args:
+            max_bytes (int): Maximum total size of the cached response bodies
+        """
+        self.logger = logging.getLogger("sheikhbot")
+        self.max_bytes = max_bytes
+        
+        self._responses: "OrderedDict[Tuple[str, str], FetchedResponse]" = OrderedDict()
+        self._size = 0
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        """
+        Get the number of cached responses.
+        
+        Returns:
+            int: Number of responses
+        """
+        return len(self._responses)
+    
+    def get(self, variant: str, url: str) -> Optional[FetchedResponse]:
+        """
+        Get the response of a URL fetched earlier with the same request variant.
+        
+        Args:
+            variant (str): Request variant, e.g. "desktop" or "mobile"
+            url (str): URL that was fetched
+            
+        Returns:
+            Optional[FetchedResponse]: The cached response, or None if not cached
+        """
+        key = (variant, url)
+        response = self._responses.get(key)
+        
+        if response is None:
+            self.misses += 1
+            return None
+        
+        self._responses.move_to_end(key)
+        self.hits += 1
+        
+        return response
+    
+    def put(self, variant: str, url: str, response) -> None:
+        """
+        Cache a response for the other crawlers of the session.
+        
+        Args:
+            variant (str): Request variant the response was fetched with
+            url (str): URL that was fetched
+            response (requests.Response): HTTP response or FetchedResponse
+        """
+        # A 304 only means something to the crawler that sent the validators
+        if response.status_code == 304:
+            return
+        
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        
+        key = (variant, url)
+        if key in self._responses:
+            self._size -= len(self._responses.pop(key).content)
+        
+        # Keep a plain copy so the connection of a requests.Response is not held
+        shared = FetchedResponse(response.url, response.status_code, dict(response.headers), response.content)
+        shared.truncated = getattr(response, "truncated", False)
+        shared.aborted = getattr(response, "aborted", None)
+        
+        self._responses[key] = shared
+        self._size += size
+        
+        while self._size > self.max_bytes:
+            _, evicted = self._responses.popitem(last=False)
+            self._size -= len(evicted.content)
+    
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._responses.clear()
+        self._size = 0
@@ -0,0 +1,770 @@
+"""
+Crawl Frontier - Priority queue of URLs waiting to be crawled, partitioned by host
+"""
+
+import heapq
+import itertools
+import math
+import os
+import re
+import sqlite3
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from ..utils.url import parse_url
+from .scheduler import HostScheduler
+
+# Positions in a frontier entry: [neg_score, seq, url, depth, inlinks, sitemap_priority]
+_SCORE, _SEQ, _URL, _DEPTH, _INLINKS, _SITEMAP = range(6)
+
+
+def get_host_key(url: str) -> str:
+    """
+    Get the politeness key (scheme://netloc) of a URL.
+    
+    Args:
+        url (str): Normalized URL to get the key for
+        
+    Returns:
+        str: Host origin of the URL
+    """
+    return parse_url(url).host
+
+
+class PriorityScorer:
+    """
+    Default priority function for the crawl frontier. Higher scores are crawled first.
+    
+    The score combines the crawl depth, the number of in-links discovered so far,
+    the priority a sitemap gave the URL and bonuses for URL patterns. Any callable
+    with the same signature as __call__ can be used in its place.
+    """
+    
+    def __init__(self, depth_weight: float = 1.0, inlink_weight: float = 0.5,
+                 sitemap_weight: float = 2.0, url_patterns: Optional[Dict[str, float]] = None):
+        """
+        Initialize the priority scorer.
+        
+        Args:
+            depth_weight (float): Score removed per level of depth
+            inlink_weight (float): Score added per log(1 + in-links)
+            sitemap_weight (float): Score added per unit of sitemap priority (0.0 - 1.0)
+            url_patterns (Dict[str, float], optional): Regex patterns mapped to the
+                score adjustment applied to URLs matching them
+        """
+        self.depth_weight = depth_weight
+        self.inlink_weight = inlink_weight
+        self.sitemap_weight = sitemap_weight
+        self.url_patterns = [
+            (re.compile(pattern), weight) for pattern, weight in (url_patterns or {}).items()
+        ]
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "PriorityScorer":
+        """
+        Create a scorer from the crawl_settings.priority configuration section.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            PriorityScorer: Configured scorer
+        """
+        priority_config = config["crawl_settings"].get("priority", {})
+        
+        return cls(
+            depth_weight=priority_config.get("depth_weight", 1.0),
+            inlink_weight=priority_config.get("inlink_weight", 0.5),
+            sitemap_weight=priority_config.get("sitemap_weight", 2.0),
+            url_patterns=priority_config.get("url_patterns")
+        )
+    
+    def __call__(self, url: str, depth: int, inlinks: int, sitemap_priority: Optional[float]) -> float:
+        """
+        Score a URL.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            inlinks (int): Number of links to the URL discovered so far
+            sitemap_priority (Optional[float]): Priority from a sitemap, if listed in one
+            
+        Returns:
+            float: Priority score
+        """
+        score = -self.depth_weight * depth + self.inlink_weight * math.log1p(inlinks)
+        
+        if sitemap_priority is not None:
+            score += self.sitemap_weight * sitemap_priority
+        
+        for pattern, weight in self.url_patterns:
+            if pattern.search(url):
+                score += weight
+        
+        return score
+
+
+class CrawlFrontier:
+    """
+    Frontier holding one priority queue per host.
+    
+    Hosts with queued URLs wait in a heap ordered by the time the scheduler allows
+    them to be fetched again. Once ready, they move to a second heap ordered by the
+    score of their best URL, so pop() hands out the highest-priority URL among the
+    hosts that are ready, and a host waiting out its crawl delay never blocks the
+    others. Push and pop are O(log n).
+    """
+    
+    def __init__(self, scheduler: HostScheduler,
+                 scorer: Optional[Callable[[str, int, int, Optional[float]], float]] = None):
+        """
+        Initialize the crawl frontier.
+        
+        Args:
+            scheduler (HostScheduler): Scheduler deciding when each host is ready
+            scorer (Callable, optional): Function of (url, depth, inlinks, sitemap_priority)
+                returning a priority score. Defaults to PriorityScorer().
+        """
+        self.scheduler = scheduler
+        self.scorer = scorer or PriorityScorer()
+        
+        # Heap of entries per host, and the live entry of every queued URL
+        self._queues: Dict[str, List[list]] = {}
+        self._entries: Dict[str, list] = {}
+        
+        # Heap of (ready_at, host) for hosts still waiting out their crawl delay
+        self._waiting: List[Tuple[float, str]] = []
+        
+        # Heap of (neg_score, seq, host) for ready hosts, keyed by their best URL
+        self._ready: List[Tuple[float, int, str]] = []
+        self._ready_keys: Dict[str, Tuple[float, int]] = {}
+        
+        # Hosts currently in either heap
+        self._scheduled: Set[str] = set()
+        
+        self._counter = itertools.count()
+    
+    def __len__(self) -> int:
+        """
+        Get the number of queued URLs.
+        
+        Returns:
+            int: Number of URLs in the frontier
+        """
+        return len(self._entries)
+    
+    def __contains__(self, url: str) -> bool:
+        """
+        Check whether a URL is queued.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            bool: True if the URL is waiting in the frontier
+        """
+        return url in self._entries
+    
+    def push(self, url: str, depth: int, sitemap_priority: Optional[float] = None) -> None:
+        """
+        Add a URL to the frontier.
+        
+        If the URL is already queued, it keeps the smaller depth and the sitemap
+        priority if one is given.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            sitemap_priority (float, optional): Priority of the URL in a sitemap
+        """
+        entry = self._entries.get(url)
+        
+        if entry is None:
+            self._add(url, depth, 0, sitemap_priority)
+            return
+        
+        if sitemap_priority is None:
+            sitemap_priority = entry[_SITEMAP]
+        
+        if depth < entry[_DEPTH] or sitemap_priority != entry[_SITEMAP]:
+            self._requeue(entry, min(depth, entry[_DEPTH]), entry[_INLINKS], sitemap_priority)
+    
+    def add_inlink(self, url: str) -> bool:
+        """
+        Count another discovered link to a queued URL and update its priority.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            bool: True if the URL is queued
+        """
+        entry = self._entries.get(url)
+        
+        if entry is None:
+            return False
+        
+        self._requeue(entry, entry[_DEPTH], entry[_INLINKS] + 1, entry[_SITEMAP])
+        
+        return True
+    
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Take the highest-priority URL from a host that is ready to be fetched.
+        
+        The caller must call done() with the URL once the fetch has finished.
+        
+        Returns:
+            Optional[Tuple[str, int]]: (url, depth), or None if no host is ready yet
+        """
+        now = time.monotonic()
+        
+        # Move hosts whose crawl delay has passed to the ready heap
+        while self._waiting and self._waiting[0][0] <= now:
+            _, host = heapq.heappop(self._waiting)
+            
+            # The host's slot may have moved since it was scheduled
+            ready_at = self.scheduler.ready_at(host)
+            if ready_at > now:
+                heapq.heappush(self._waiting, (ready_at, host))
+                continue
+            
+            self._make_ready(host)
+        
+        while self._ready:
+            neg_score, seq, host = heapq.heappop(self._ready)
+            
+            # Skip keys left behind when the host's best URL changed
+            if self._ready_keys.get(host) != (neg_score, seq):
+                continue
+            
+            del self._ready_keys[host]
+            
+            # The host may have been parked since it became ready
+            ready_at = self.scheduler.ready_at(host)
+            if ready_at > now:
+                heapq.heappush(self._waiting, (ready_at, host))
+                continue
+            
+            self._scheduled.discard(host)
+            
+            entry = self._head(host)
+            if entry is None:
+                continue
+            
+            heapq.heappop(self._queues[host])
+            del self._entries[entry[_URL]]
+            
+            if not self._queues[host]:
+                del self._queues[host]
+            
+            self.scheduler.acquire(host)
+            self._schedule(host)
+            
+            return entry[_URL], entry[_DEPTH]
+        
+        return None
+    
+    def done(self, url: str, fetched: bool = True) -> None:
+        """
+        Mark the fetch of a popped URL as finished.
+        
+        Args:
+            url (str): URL returned by pop()
+            fetched (bool): False if no request was sent to the host for the URL
+        """
+        host = get_host_key(url)
+        
+        self.scheduler.release(host, fetched)
+        self._schedule(host)
+    
+    def drop_host(self, host: str) -> int:
+        """
+        Remove every queued URL of a host.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            int: Number of URLs removed
+        """
+        dropped = 0
+        
+        for entry in self._queues.pop(host, []):
+            if entry[_URL] is not None:
+                del self._entries[entry[_URL]]
+                dropped += 1
+        
+        # A host left in the waiting heap is dropped when it comes up
+        if self._ready_keys.pop(host, None) is not None:
+            self._scheduled.discard(host)
+        
+        return dropped
+    
+    def wait_time(self) -> Optional[float]:
+        """
+        Get the time until the next host becomes ready.
+        
+        Returns:
+            Optional[float]: Seconds to wait, or None if every host with queued URLs
+                is busy and the caller has to wait for a fetch to finish
+        """
+        if self._ready_keys:
+            return 0.0
+        
+        if not self._waiting:
+            return None
+        
+        return max(0.0, self._waiting[0][0] - time.monotonic())
+    
+    def snapshot(self) -> List[list]:
+        """
+        Get the queued URLs in a form that can be saved and restored later.
+        
+        Returns:
+            List[list]: [url, depth, inlinks, sitemap_priority] of every queued URL,
+                in the order they were queued
+        """
+        entries = sorted(self._entries.values(), key=lambda entry: entry[_SEQ])
+        
+        return [[entry[_URL], entry[_DEPTH], entry[_INLINKS], entry[_SITEMAP]] for entry in entries]
+    
+    def restore(self, entries: List[list]) -> None:
+        """
+        Queue the URLs of a saved snapshot.
+        
+        Args:
+            entries (List[list]): Entries returned by snapshot()
+        """
+        for url, depth, inlinks, sitemap_priority in entries:
+            if url not in self:
+                self._add(url, depth, inlinks, sitemap_priority)
+    
+    def _add(self, url: str, depth: int, inlinks: int, sitemap_priority: Optional[float]) -> None:
+        """
+        Create a queue entry for a URL.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            inlinks (int): Number of links to the URL discovered so far
+            sitemap_priority (Optional[float]): Priority from a sitemap
+        """
+        host = get_host_key(url)
+        score = self.scorer(url, depth, inlinks, sitemap_priority)
+        
+        entry = [-score, next(self._counter), url, depth, inlinks, sitemap_priority]
+        
+        heapq.heappush(self._queues.setdefault(host, []), entry)
+        self._entries[url] = entry
+        
+        self._refresh_ready(host)
+        self._schedule(host)
+    
+    def _requeue(self, entry: list, depth: int, inlinks: int, sitemap_priority: Optional[float]) -> None:
+        """
+        Replace a queued entry with a rescored one.
+        
+        The old entry stays in the host heap marked as removed and is dropped when
+        it reaches the top.
+        
+        Args:
+            entry (list): Live entry of the URL
+            depth (int): New crawl depth
+            inlinks (int): New in-link count
+            sitemap_priority (Optional[float]): New sitemap priority
+        """
+        url = entry[_URL]
+        entry[_URL] = None
+        
+        self._add(url, depth, inlinks, sitemap_priority)
+    
+    def _head(self, host: str) -> Optional[list]:
+        """
+        Get the best live entry of a host, dropping removed entries on top.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            Optional[list]: The entry, or None if the host has no queued URLs
+        """
+        queue = self._queues.get(host)
+        
+        while queue and queue[0][_URL] is None:
+            heapq.heappop(queue)
+        
+        if not queue:
+            self._queues.pop(host, None)
+            return None
+        
+        return queue[0]
+    
+    def _has_urls(self, host: str) -> bool:
+        """
+        Check whether a host has queued URLs.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            bool: True if the host has URLs waiting
+        """
+        return host in self._queues
+    
+    def _make_ready(self, host: str) -> None:
+        """
+        Put a host whose crawl delay has passed in the ready heap.
+        
+        Args:
+            host (str): Host origin
+        """
+        entry = self._head(host)
+        
+        if entry is None:
+            self._scheduled.discard(host)
+            return
+        
+        key = (entry[_SCORE], entry[_SEQ])
+        self._ready_keys[host] = key
+        heapq.heappush(self._ready, (key[0], key[1], host))
+    
+    def _refresh_ready(self, host: str) -> None:
+        """
+        Update the ready heap key of a host after its best URL changed.
+        
+        Args:
+            host (str): Host origin
+        """
+        if host in self._ready_keys:
+            self._make_ready(host)
+    
+    def _schedule(self, host: str) -> None:
+        """
+        Put a host in the waiting heap if it has queued URLs and free capacity.
+        
+        Args:
+            host (str): Host origin
+        """
+        if host in self._scheduled or not self._has_urls(host):
+            return
+        
+        if not self.scheduler.has_capacity(host):
+            return
+        
+        heapq.heappush(self._waiting, (self.scheduler.ready_at(host), host))
+        self._scheduled.add(host)
+
+
+class DiskBackedFrontier(CrawlFrontier):
+    """
+    Crawl frontier that keeps a bounded head in memory and spills the rest to SQLite.
+    
+    Once max_in_memory URLs are queued, newly discovered URLs are written to an
+    on-disk table indexed by host and score. A host's best spilled URLs are paged
+    back into memory whenever they would outrank its in-memory head, so the crawl
+    order stays the same as with the in-memory frontier while memory use stays
+    bounded by max_in_memory + page_size entries plus per-host bookkeeping.
+    """
+    
+    def __init__(self, scheduler: HostScheduler,
+                 scorer: Optional[Callable[[str, int, int, Optional[float]], float]] = None,
+                 directory: str = "data/frontier", max_in_memory: int = 100000,
+                 page_size: int = 1000):
+        """
+        Initialize the disk-backed frontier.
+        
+        Args:
+            scheduler (HostScheduler): Scheduler deciding when each host is ready
+            scorer (Callable, optional): Function of (url, depth, inlinks, sitemap_priority)
+                returning a priority score. Defaults to PriorityScorer().
+            directory (str): Directory for the spill database
+            max_in_memory (int): Maximum number of URLs kept in memory before spilling
+            page_size (int): Number of URLs loaded back from disk at a time per host
+        """
+        super().__init__(scheduler, scorer)
+        
+        self.max_in_memory = max(1, int(max_in_memory))
+        self.page_size = max(1, int(page_size))
+        
+        os.makedirs(directory, exist_ok=True)
+        fd, self.db_path = tempfile.mkstemp(prefix="frontier_", suffix=".db", dir=directory)
+        os.close(fd)
+        
+        self._db = sqlite3.connect(self.db_path)
+        self._db.execute("PRAGMA journal_mode=OFF")
+        self._db.execute("PRAGMA synchronous=OFF")
+        self._db.execute(
+            "CREATE TABLE frontier (host TEXT, neg_score REAL, seq INTEGER, url TEXT, "
+            "depth INTEGER, inlinks INTEGER, sitemap_priority REAL)"
+        )
+        self._db.execute("CREATE INDEX frontier_host ON frontier (host, neg_score, seq)")
+        self._db.execute("CREATE UNIQUE INDEX frontier_url ON frontier (url)")
+        
+        # Number of spilled URLs and (neg_score, seq) of the best spilled URL per host
+        self._spilled: Dict[str, int] = {}
+        self._spilled_best: Dict[str, Tuple[float, int]] = {}
+        self._spilled_total = 0
+    
+    def __len__(self) -> int:
+        """
+        Get the number of queued URLs, in memory and on disk.
+        
+        Returns:
+            int: Number of URLs in the frontier
+        """
+        return len(self._entries) + self._spilled_total
+    
+    def __contains__(self, url: str) -> bool:
+        """
+        Check whether a URL is queued, in memory or on disk.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            bool: True if the URL is waiting in the frontier
+        """
+        if url in self._entries:
+            return True
+        
+        return self._spilled_total > 0 and self._fetch_spilled(url) is not None
+    
+    def push(self, url: str, depth: int, sitemap_priority: Optional[float] = None) -> None:
+        """
+        Add a URL to the frontier, spilling it to disk if it is already full.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            sitemap_priority (float, optional): Priority of the URL in a sitemap
+        """
+        if url not in self._entries and self._spilled_total:
+            row = self._fetch_spilled(url)
+            
+            if row is not None:
+                _, _, _, old_depth, inlinks, old_sitemap = row
+                if sitemap_priority is None:
+                    sitemap_priority = old_sitemap
+                
+                if depth < old_depth or sitemap_priority != old_sitemap:
+                    self._delete_spilled(url)
+                    self._add(url, min(depth, old_depth), inlinks, sitemap_priority)
+                return
+        
+        super().push(url, depth, sitemap_priority)
+    
+    def add_inlink(self, url: str) -> bool:
+        """
+        Count another discovered link to a queued URL and update its priority.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            bool: True if the URL is queued
+        """
+        if super().add_inlink(url):
+            return True
+        
+        if not self._spilled_total:
+            return False
+        
+        row = self._fetch_spilled(url)
+        if row is None:
+            return False
+        
+        _, _, _, depth, inlinks, sitemap_priority = row
+        self._delete_spilled(url)
+        self._add(url, depth, inlinks + 1, sitemap_priority)
+        
+        return True
+    
+    def snapshot(self) -> List[list]:
+        """
+        Get the queued URLs, in memory and on disk, in a form that can be restored.
+        
+        Returns:
+            List[list]: [url, depth, inlinks, sitemap_priority] of every queued URL
+        """
+        entries = super().snapshot()
+        
+        if self._spilled_total:
+            rows = self._db.execute(
+                "SELECT url, depth, inlinks, sitemap_priority FROM frontier ORDER BY seq"
+            )
+            entries.extend([list(row) for row in rows])
+        
+        return entries
+    
+    def drop_host(self, host: str) -> int:
+        """
+        Remove every queued URL of a host, in memory and on disk.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            int: Number of URLs removed
+        """
+        dropped = super().drop_host(host)
+        spilled = self._spilled.get(host, 0)
+        
+        if spilled:
+            self._db.execute("DELETE FROM frontier WHERE host = ?", (host,))
+            self._update_spilled(host, -spilled)
+        
+        return dropped + spilled
+    
+    def close(self) -> None:
+        """Close and remove the spill database."""
+        try:
+            self._db.close()
+            os.remove(self.db_path)
+        except OSError:
+            pass
+    
+    def _add(self, url: str, depth: int, inlinks: int, sitemap_priority: Optional[float]) -> None:
+        """
+        Create a queue entry for a URL in memory, or on disk if memory is full.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            inlinks (int): Number of links to the URL discovered so far
+            sitemap_priority (Optional[float]): Priority from a sitemap
+        """
+        if url in self._entries or len(self._entries) < self.max_in_memory:
+            super()._add(url, depth, inlinks, sitemap_priority)
+            return
+        
+        host = get_host_key(url)
+        key = (-self.scorer(url, depth, inlinks, sitemap_priority), next(self._counter))
+        
+        self._db.execute(
+            "INSERT INTO frontier VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (host, key[0], key[1], url, depth, inlinks, sitemap_priority)
+        )
+        
+        self._spilled[host] = self._spilled.get(host, 0) + 1
+        self._spilled_total += 1
+        
+        best = self._spilled_best.get(host)
+        if best is None or key < best:
+            self._spilled_best[host] = key
+        
+        self._refresh_ready(host)
+        self._schedule(host)
+    
+    def _head(self, host: str) -> Optional[list]:
+        """
+        Get the best entry of a host, paging spilled URLs in when they outrank it.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            Optional[list]: The entry, or None if the host has no queued URLs
+        """
+        entry = super()._head(host)
+        best = self._spilled_best.get(host)
+        
+        if best is not None and (entry is None or best < (entry[_SCORE], entry[_SEQ])):
+            self._page_in(host)
+            entry = super()._head(host)
+        
+        return entry
+    
+    def _has_urls(self, host: str) -> bool:
+        """
+        Check whether a host has queued URLs in memory or on disk.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            bool: True if the host has URLs waiting
+        """
+        return host in self._queues or host in self._spilled
+    
+    def _make_ready(self, host: str) -> None:
+        """
+        Put a host in the ready heap, keyed by its best URL in memory or on disk.
+        
+        Args:
+            host (str): Host origin
+        """
+        # Make sure the in-memory head reflects the best spilled URL
+        self._head(host)
+        super()._make_ready(host)
+    
+    def _page_in(self, host: str) -> None:
+        """
+        Move the best spilled URLs of a host back into memory.
+        
+        Args:
+            host (str): Host origin
+        """
+        rows = self._db.execute(
+            "SELECT rowid, neg_score, seq, url, depth, inlinks, sitemap_priority FROM frontier "
+            "WHERE host = ? ORDER BY neg_score, seq LIMIT ?",
+            (host, self.page_size)
+        ).fetchall()
+        
+        self._db.executemany("DELETE FROM frontier WHERE rowid = ?", [(row[0],) for row in rows])
+        
+        queue = self._queues.setdefault(host, [])
+        for _, neg_score, seq, url, depth, inlinks, sitemap_priority in rows:
+            entry = [neg_score, seq, url, depth, inlinks, sitemap_priority]
+            heapq.heappush(queue, entry)
+            self._entries[url] = entry
+        
+        self._update_spilled(host, -len(rows))
+    
+    def _fetch_spilled(self, url: str) -> Optional[tuple]:
+        """
+        Look up a spilled URL.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            Optional[tuple]: (host, neg_score, seq, depth, inlinks, sitemap_priority) or None
+        """
+        return self._db.execute(
+            "SELECT host, neg_score, seq, depth, inlinks, sitemap_priority FROM frontier WHERE url = ?",
+            (url,)
+        ).fetchone()
+    
+    def _delete_spilled(self, url: str) -> None:
+        """
+        Remove a spilled URL from disk.
+        
+        Args:
+            url (str): Normalized URL
+        """
+        self._db.execute("DELETE FROM frontier WHERE url = ?", (url,))
+        self._update_spilled(get_host_key(url), -1)
+    
+    def _update_spilled(self, host: str, change: int) -> None:
+        """
+        Update the spill count and best spilled score of a host.
+        
+        Args:
+            host (str): Host origin
+            change (int): Change in the number of spilled URLs
+        """
+        count = self._spilled.get(host, 0) + change
+        self._spilled_total += change
+        
+        if count <= 0:
+            self._spilled.pop(host, None)
+            self._spilled_best.pop(host, None)
+            return
+        
+        self._spilled[host] = count
+        self._spilled_best[host] = tuple(self._db.execute(
+            "SELECT neg_score, seq FROM frontier WHERE host = ? ORDER BY neg_score, seq LIMIT 1",
+            (host,)
+        ).fetchone())
@@ -2,24 +2,29 @@
 Image Crawler - Specialized crawler for images
 """
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Iterator
 import logging
-import requests
-from bs4 import BeautifulSoup
 import os
 import hashlib
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlsplit
 import re
 import io
 from PIL import Image
 import time
 
+from ..utils.visited import create_visited_set
+from ..utils.http import ResponseLimits
+from ..parsers.document import ParsedDocument
 from .base_crawler import BaseCrawler
 
 
 class ImageCrawler(BaseCrawler):
     """Specialized crawler for images."""
     
+    # Pages are requested like the desktop crawler's, so a desktop crawl of the same
+    # session has already fetched them
+    fetch_variant = "desktop"
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the image crawler.
@@ -45,43 +50,52 @@ class ImageCrawler(BaseCrawler):
         # Whether to download images
         self.download_images = self.config["specialized_crawlers"]["images"]["download"]
         
+        # Images are downloaded within the image/* size limit of response_limits,
+        # whichever content types are allowed for pages
+        self.image_limits = None
+        if self.response_limits is not None:
+            limits_config = self.config["crawl_settings"]["response_limits"]
+            self.image_limits = ResponseLimits(["image/*"], limits_config.get("max_size_mb"))
+        
         # Initialize a set to track visited image URLs
-        self.visited_image_urls = set()
+        self.visited_image_urls = create_visited_set(self.config)
+        
+        # Images found on each page of the current crawl, by page URL
+        self.page_images = {}
     
-    def crawl(self, url: str, max_depth: int = None) -> List[Dict[str, Any]]:
+    def iter_crawl(self, url: str, max_depth: int = None, resume: bool = False,
+                   batch_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
         """
-        Crawl a URL and extract images.
+        Crawl a URL and yield the images found, one batch per batch of crawled pages.
         
         Args:
             url (str): The URL to start crawling from
             max_depth (int, optional): Maximum crawl depth. If None, uses config value.
+            resume (bool): Continue the page crawl from its last checkpoint if there is one
+            batch_size (int): Number of pages per batch, or 0 for a single batch
             
-        Returns:
-            List[Dict[str, Any]]: List of crawled images with their data
+        Yields:
+            List[Dict[str, Any]]: Batch of crawled images with their data
         """
-        # First, get regular page data using base crawler
-        page_results = super().crawl(url, max_depth)
-        
-        # Now extract and process images from those pages
-        image_results = []
+        # Images of each page, collected while the page is processed
+        self.page_images = {}
+        total = 0
         
-        for page_data in page_results:
-            if page_data.get("content_type", "").startswith("text/html"):
-                # Extract images from this page
-                page_url = page_data["url"]
-                
-                try:
-                    self.logger.info(f"Extracting images from {page_url}")
-                    
-                    # Get the actual response content from the page data
-                    response = requests.get(
-                        page_url,
-                        headers={"User-Agent": self.user_agent},
-                        timeout=self.timeout
-                    )
+        # First, get regular page data using base crawler
+        for page_results in super().iter_crawl(url, max_depth, resume, batch_size):
+            # Now process the images found on those pages
+            image_results = []
+            
+            for page_data in page_results:
+                if page_data.get("content_type", "").startswith("text/html"):
+                    page_url = page_data["url"]
                     
-                    if response.status_code == 200:
-                        images = self._extract_images(response, page_url)
+                    try:
+                        images = self.page_images.pop(page_url, None)
+                        
+                        # Pages restored from a checkpoint were processed by an earlier run
+                        if images is None:
+                            images = self._fetch_page_images(page_url)
                         
                         # Process each image
                         for img_url, img_data in images:
@@ -97,28 +111,84 @@ class ImageCrawler(BaseCrawler):
                                 
                                 except Exception as e:
                                     self.logger.error(f"Error processing image {img_url}: {str(e)}")
-                
-                except Exception as e:
-                    self.logger.error(f"Error extracting images from {page_url}: {str(e)}")
+                    
+                    except Exception as e:
+                        self.logger.error(f"Error extracting images from {page_url}: {str(e)}")
+            
+            total += len(image_results)
+            yield image_results
+        
+        self.page_images = {}
         
-        self.logger.info(f"Extracted {len(image_results)} images in total")
-        return image_results
+        self.logger.info(f"Extracted {total} images in total")
     
-    def _extract_images(self, response: requests.Response, page_url: str) -> List[Tuple[str, Dict[str, Any]]]:
+    def _process_page(self, document: ParsedDocument, depth: int) -> Dict[str, Any]:
         """
-        Extract image URLs and metadata from a page.
+        Process a page and collect its images from the already parsed document.
+        
+        Args:
+            document (ParsedDocument): Fetched page
+            depth (int): Current crawl depth
+            
+        Returns:
+            Dict[str, Any]: Extracted page data
+        """
+        page_data = super()._process_page(document, depth)
+        
+        if document.is_html:
+            self.logger.info(f"Extracting images from {document.url}")
+            self.page_images[document.url] = self._extract_images(document)
+            
+            if self.dns_cache is not None:
+                # Image CDNs are resolved while the rest of the batch is crawled
+                for img_url, _ in self.page_images[document.url]:
+                    self.dns_cache.prefetch(urlsplit(img_url).hostname)
+        
+        return page_data
+    
+    def _fetch_page_images(self, page_url: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Fetch a page that was not processed by this run and extract its images.
         
         Args:
-            response (requests.Response): HTTP response
             page_url (str): URL of the page
             
+        Returns:
+            List[Tuple[str, Dict[str, Any]]]: List of (image_url, metadata) tuples
+        """
+        self.logger.info(f"Extracting images from {page_url}")
+        
+        response = self._shared_response(page_url)
+        if response is None:
+            response = self.session.get(page_url, timeout=self.timeout,
+                                        stream=self.response_limits is not None)
+            if self.response_limits is not None:
+                response = self.response_limits.read(response)
+        
+        if getattr(response, "aborted", None):
+            self.logger.info(f"Skipping {page_url}: {response.aborted}")
+            return []
+        
+        if response.status_code != 200:
+            return []
+        
+        return self._extract_images(ParsedDocument(response, page_url))
+    
+    def _extract_images(self, document: ParsedDocument) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Extract image URLs and metadata from a page.
+        
+        Args:
+            document (ParsedDocument): Fetched page
+            
         Returns:
             List[Tuple[str, Dict[str, Any]]]: List of (image_url, metadata) tuples
         """
         images = []
+        page_url = document.url
         
         try:
-            soup = BeautifulSoup(response.content, "lxml")
+            soup = document.soup
             
             # 1. Extract <img> tags
             for img in soup.find_all("img"):
@@ -294,8 +364,17 @@ class ImageCrawler(BaseCrawler):
             # Check if it's a valid image
             if not response.headers.get("Content-Type", "").startswith("image/"):
                 self.logger.info(f"Skipping {img_url}: not an image (Content-Type: {response.headers.get('Content-Type')})")
+                # Free the pooled connection without downloading the body
+                response.close()
                 return None
             
+            # Download the image within its size limit
+            if self.image_limits is not None:
+                response = self.image_limits.read(response)
+                if response.aborted:
+                    self.logger.info(f"Skipping {img_url}: {response.aborted}")
+                    return None
+            
             # Get base data
             result = {
                 "url": img_url,
@@ -5,7 +5,6 @@ Mobile Crawler - Specialized crawler for mobile web pages
 from typing import Dict, Any, List
 import logging
 import time
-import requests
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -13,11 +12,15 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
 from .base_crawler import BaseCrawler
+from ..parsers.document import ParsedDocument
+from ..utils.http import ACCEPT_ENCODING
 
 
 class MobileCrawler(BaseCrawler):
     """Specialized crawler for mobile web pages."""
     
+    fetch_variant = "mobile"
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the mobile crawler.
@@ -121,7 +124,7 @@ class MobileCrawler(BaseCrawler):
             "User-Agent": self.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
             # Mobile-specific headers
@@ -133,7 +136,7 @@ class MobileCrawler(BaseCrawler):
         
         return headers
     
-    def _fetch_with_cache(self, url: str) -> tuple:
+    def _request_headers(self, url: str) -> Dict[str, str]:
         """
         Override to add mobile-specific headers.
         
@@ -141,56 +144,26 @@ class MobileCrawler(BaseCrawler):
             url (str): URL to fetch
             
         Returns:
-            tuple: (response, from_cache) where from_cache is a boolean
+            Dict[str, str]: Headers dictionary including HTTP caching validators
         """
         headers = self._modify_request_headers(url)
+        headers.update(super()._request_headers(url))
         
-        # Add If-None-Match header if we have a cached ETag
-        if url in self.etag_cache:
-            headers["If-None-Match"] = self.etag_cache[url]
-        
-        # Add If-Modified-Since header if we have a cached Last-Modified
-        if url in self.last_modified_cache:
-            headers["If-Modified-Since"] = self.last_modified_cache[url]
-        
-        # Make the request with the conditional headers
-        try:
-            response = self.session.get(
-                url,
-                headers=headers,
-                timeout=self.timeout,
-                allow_redirects=self.config["crawl_settings"]["follow_redirects"],
-                verify=self.config["crawl_settings"]["verify_ssl"]
-            )
-            
-            # Save ETag if present in response
-            if "ETag" in response.headers:
-                self.etag_cache[url] = response.headers["ETag"]
-            
-            # Save Last-Modified if present in response
-            if "Last-Modified" in response.headers:
-                self.last_modified_cache[url] = response.headers["Last-Modified"]
-            
-            # Check if we got a 304 Not Modified
-            from_cache = response.status_code == 304
-            
-            return response, from_cache
-            
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"Request error for {url}: {str(e)}")
-            raise
+        return headers
     
-    def _check_for_mobile_redirect(self, response: requests.Response, url: str) -> bool:
+    def _check_for_mobile_redirect(self, document: ParsedDocument) -> bool:
         """
         Check if the page is redirecting to a mobile version.
         
         Args:
-            response (requests.Response): HTTP response
-            url (str): Original URL
+            document (ParsedDocument): Fetched page
             
         Returns:
             bool: True if a mobile redirect was detected
         """
+        response = document.response
+        url = document.url
+        
         # Check location header for redirects
         if 300 <= response.status_code < 400 and "Location" in response.headers:
             location = response.headers["Location"]
@@ -200,8 +173,7 @@ class MobileCrawler(BaseCrawler):
         
         # Check meta refresh redirects
         try:
-            soup = BeautifulSoup(response.content, "lxml")
-            meta_refresh = soup.find("meta", attrs={"http-equiv": "refresh"})
+            meta_refresh = document.soup.find("meta", attrs={"http-equiv": "refresh"})
             
             if meta_refresh and "content" in meta_refresh.attrs:
                 content = meta_refresh["content"].lower()
@@ -215,20 +187,21 @@ class MobileCrawler(BaseCrawler):
         
         return False
     
-    def _process_page(self, response: requests.Response, url: str, depth: int) -> Dict[str, Any]:
+    def _process_page(self, document: ParsedDocument, depth: int) -> Dict[str, Any]:
         """
         Process a page with mobile-specific enhancements.
         
         Args:
-            response (requests.Response): HTTP response
-            url (str): URL of the page
+            document (ParsedDocument): Fetched page
             depth (int): Current crawl depth
             
         Returns:
             Dict[str, Any]: Extracted page data
         """
+        url = document.url
+        
         # First get the base page data
-        page_data = super()._process_page(response, url, depth)
+        page_data = super()._process_page(document, depth)
         
         # Add mobile-specific data
         page_data["crawler_type"] = "mobile"
@@ -236,12 +209,12 @@ class MobileCrawler(BaseCrawler):
         
         try:
             # Check for mobile redirects
-            has_mobile_redirect = self._check_for_mobile_redirect(response, url)
+            has_mobile_redirect = self._check_for_mobile_redirect(document)
             page_data["has_mobile_redirect"] = has_mobile_redirect
             
             # If it's HTML content, check for mobile-specific elements
-            if "text/html" in page_data["content_type"]:
-                soup = BeautifulSoup(response.content, "lxml")
+            if document.is_html:
+                soup = document.soup
                 
                 # Check for mobile viewport meta tag
                 viewport_meta = soup.find("meta", attrs={"name": "viewport"})
@@ -0,0 +1,414 @@
+"""
+Multi-process Crawl - Host-partitioned crawling across several worker processes
+"""
+
+import time
+import queue
+import zlib
+import multiprocessing
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from .frontier import get_host_key
+
+
+def get_shard(host: str, processes: int) -> int:
+    """
+    Get the index of the worker process that owns a host.
+    
+    Args:
+        host (str): Host origin (scheme://netloc)
+        processes (int): Number of worker processes
+        
+    Returns:
+        int: Worker index
+    """
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    return zlib.crc32(host.encode("utf-8")) % processes
+
+
+class ShardWorker:
+    """
+    Crawl loop of one worker process in a multi-process crawl.
+    
+    The worker owns every host that hashes to its index, so the frontier,
+    politeness state, robots.txt cache and visited set of those hosts live only in
+    this process. Links to hosts owned by another worker are batched per page and
+    sent to that worker's inbox, where they are deduplicated on arrival.
+    """
+    
+    def __init__(self, index: int, processes: int, crawler, inboxes: List, result_queue,
+                 active, in_transit, lock, budget_counters: Tuple):
+        """
+        Initialize the shard worker.
+        
+        Args:
+            index (int): Index of this worker
+            processes (int): Number of worker processes
+            crawler (BaseCrawler): Crawler whose hooks and settings are used
+            inboxes (List[multiprocessing.Queue]): Inbox of every worker
+            result_queue (multiprocessing.Queue): Queue for crawled pages and stats
+            active (multiprocessing.Value): Number of workers with URLs to crawl
+            in_transit (multiprocessing.Value): Number of URL batches not yet received
+            lock (multiprocessing.Lock): Lock guarding active and in_transit
+            budget_counters (Tuple): Pages and bytes charged to the crawl budget by
+                all workers (multiprocessing.Value)
+        """
+        self.index = index
+        self.processes = processes
+        self.crawler = crawler
+        self.inboxes = inboxes
+        self.result_queue = result_queue
+        self.active = active
+        self.in_transit = in_transit
+        self.lock = lock
+        self.budget_counters = budget_counters
+        self.logger = logging.getLogger("sheikhbot")
+        
+        # URLs discovered for other workers, flushed after each page
+        self._outboxes: Dict[int, List[tuple]] = {}
+        self._is_active = False
+        
+        # Workers are not resumable, and only the parent process stores results
+        crawler.checkpoint_enabled = False
+        crawler.url_router = self._route
+        
+        # Each worker only reaches part of the site, so none may prune the shared manifest
+        crawler.prune_manifest = False
+    
+    def run(self, url: str, max_depth: int) -> None:
+        """
+        Crawl the hosts owned by this worker until every worker is idle.
+        
+        Args:
+            url (str): The URL the crawl starts from
+            max_depth (int): Maximum crawl depth
+        """
+        crawler = self.crawler
+        start_time = time.time()
+        results = []
+        
+        self._is_active = get_shard(get_host_key(url), self.processes) == self.index
+        if self._is_active:
+            crawler._start_crawl(url, max_depth, results)
+            self._send_urls()
+        else:
+            crawler._reset_crawl()
+            crawler._open_manifest(url)
+        
+        # Crawl-wide budget limits are counted across all workers
+        if crawler.budget is not None:
+            crawler.budget.share(self.processes, *self.budget_counters, self.lock)
+        
+        while True:
+            # Once the crawl budget is used up, workers stay idle until the end
+            if not crawler.frontier or not crawler._within_budget():
+                if not self._wait_for_urls(max_depth):
+                    break
+                continue
+            
+            self._receive_urls(max_depth)
+            
+            item = crawler.frontier.pop()
+            if item is None:
+                # Every owned host is still waiting out its crawl delay
+                time.sleep(crawler.frontier.wait_time() or 0)
+                continue
+            
+            current_url, current_depth = item
+            crawler._crawl_page(current_url, current_depth, max_depth, results)
+            
+            for page_data in results:
+                self.result_queue.put(("page", page_data))
+            results.clear()
+            
+            self._send_urls()
+        
+        crawler._finish_crawl(start_time)
+        self.result_queue.put(("stats", crawler.stats))
+    
+    def _route(self, url: str, depth: int) -> bool:
+        """
+        Keep URLs of owned hosts and hand the others to their worker.
+        
+        Args:
+            url (str): Normalized URL
+            depth (int): Crawl depth of the URL
+            
+        Returns:
+            bool: True if this worker owns the URL's host
+        """
+        shard = get_shard(get_host_key(url), self.processes)
+        if shard == self.index:
+            return True
+        
+        self._outboxes.setdefault(shard, []).append((url, depth))
+        
+        return False
+    
+    def _send_urls(self) -> None:
+        """Send the URLs collected for other workers, one batch per worker."""
+        for shard, urls in self._outboxes.items():
+            # Count the batch before sending it so the crawl cannot look finished
+            with self.lock:
+                self.in_transit.value += 1
+            self.inboxes[shard].put(urls)
+        
+        self._outboxes = {}
+    
+    def _accept(self, urls: List[tuple], max_depth: int) -> None:
+        """
+        Queue a batch of URLs sent by another worker.
+        
+        Args:
+            urls (List[tuple]): (url, depth) pairs
+            max_depth (int): Maximum crawl depth
+        """
+        for url, depth in urls:
+            self.crawler._enqueue(url, depth, max_depth)
+    
+    def _receive_urls(self, max_depth: int) -> None:
+        """
+        Queue the URL batches waiting in the inbox without blocking.
+        
+        Args:
+            max_depth (int): Maximum crawl depth
+        """
+        inbox = self.inboxes[self.index]
+        
+        while True:
+            try:
+                urls = inbox.get_nowait()
+            except queue.Empty:
+                return
+            
+            with self.lock:
+                self.in_transit.value -= 1
+            self._accept(urls, max_depth)
+    
+    def _wait_for_urls(self, max_depth: int) -> bool:
+        """
+        Go idle until another worker sends URLs or the crawl is finished.
+        
+        Args:
+            max_depth (int): Maximum crawl depth
+            
+        Returns:
+            bool: False if the crawl is finished
+        """
+        if self._is_active:
+            with self.lock:
+                self.active.value -= 1
+            self._is_active = False
+        
+        urls = self.inboxes[self.index].get()
+        if urls is None:
+            return False
+        
+        # Become active before the batch stops counting as in transit
+        with self.lock:
+            self.active.value += 1
+            self.in_transit.value -= 1
+        self._is_active = True
+        
+        self._accept(urls, max_depth)
+        
+        return True
+
+
+def _run_shard(index: int, processes: int, crawler_class, config: Dict[str, Any], url: str,
+               max_depth: int, inboxes: List, result_queue, active, in_transit, lock,
+               budget_counters: Tuple) -> None:
+    """
+    Entry point of a worker process.
+    
+    Args:
+        index (int): Index of this worker
+        processes (int): Number of worker processes
+        crawler_class (type): BaseCrawler subclass to crawl with
+        config (Dict[str, Any]): Configuration dictionary
+        url (str): The URL the crawl starts from
+        max_depth (int): Maximum crawl depth
+        inboxes (List[multiprocessing.Queue]): Inbox of every worker
+        result_queue (multiprocessing.Queue): Queue for crawled pages and stats
+        active (multiprocessing.Value): Number of workers with URLs to crawl
+        in_transit (multiprocessing.Value): Number of URL batches not yet received
+        lock (multiprocessing.Lock): Lock guarding active and in_transit
+        budget_counters (Tuple): Pages and bytes charged to the crawl budget by all workers
+    """
+    crawler = crawler_class(config)
+    worker = ShardWorker(index, processes, crawler, inboxes, result_queue, active, in_transit, lock,
+                         budget_counters)
+    worker.run(url, max_depth)
+
+
+class MultiProcessCrawl:
+    """
+    Runs one crawl with its hosts hashed onto several worker processes.
+    
+    Each worker runs a crawler of the given class, so parsing happens on as many
+    cores as there are workers while each host is still crawled by exactly one
+    process. Workers send discovered URLs to each other directly. The parent
+    collects the crawled pages, merges the workers' stats and ends the crawl once
+    no worker has URLs left and no batch of URLs is on its way between workers.
+    """
+    
+    def __init__(self, crawler_class, config: Dict[str, Any], processes: int):
+        """
+        Initialize the multi-process crawl.
+        
+        Args:
+            crawler_class (type): BaseCrawler subclass to crawl with
+            config (Dict[str, Any]): Configuration dictionary
+            processes (int): Number of worker processes
+        """
+        self.crawler_class = crawler_class
+        self.config = config
+        self.processes = max(1, int(processes))
+        self.logger = logging.getLogger("sheikhbot")
+        self.stats: Dict[str, Any] = {}
+    
+    def crawl(self, url: str, max_depth: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Crawl a URL and its linked pages up to max_depth.
+        
+        Args:
+            url (str): The URL to start crawling from
+            max_depth (int, optional): Maximum crawl depth. If None, uses config value.
+            
+        Returns:
+            List[Dict[str, Any]]: List of crawled pages with their data
+        """
+        if max_depth is None:
+            max_depth = self.config["crawl_settings"]["max_depth"]
+        
+        self.logger.info(f"Starting crawl of {url} with {self.processes} processes")
+        
+        start_time = time.time()
+        context = multiprocessing.get_context()
+        inboxes = [context.Queue() for _ in range(self.processes)]
+        result_queue = context.Queue()
+        lock = context.Lock()
+        
+        # The worker owning the seed URL starts out active
+        active = context.Value("i", 1, lock=False)
+        in_transit = context.Value("i", 0, lock=False)
+        
+        # Crawl-wide pages and bytes of the crawl budget, counted across workers
+        budget_counters = (context.Value("q", 0, lock=False), context.Value("q", 0, lock=False))
+        
+        workers = [
+            context.Process(
+                target=_run_shard,
+                args=(index, self.processes, self.crawler_class, self.config, url, max_depth,
+                      inboxes, result_queue, active, in_transit, lock, budget_counters),
+                daemon=True
+            )
+            for index in range(self.processes)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        results = []
+        worker_stats = []
+        
+        # Collect pages until every worker is idle and no URLs are in transit
+        while True:
+            self._collect(result_queue, results, worker_stats)
+            
+            with lock:
+                finished = active.value == 0 and in_transit.value == 0
+            if finished:
+                break
+            
+            if any(worker.exitcode not in (None, 0) for worker in workers):
+                self.logger.error("A crawl worker process failed, stopping the crawl")
+                break
+        
+        for inbox in inboxes:
+            inbox.put(None)
+        
+        # Each worker sends its stats after its last page
+        while len(worker_stats) < self.processes and any(worker.is_alive() for worker in workers):
+            self._collect(result_queue, results, worker_stats)
+        self._collect(result_queue, results, worker_stats, timeout=0)
+        
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        
+        self.stats = {"pages_crawled": 0, "urls_discovered": 0, "bytes_downloaded": 0,
+                      "not_modified": 0, "carried_forward": 0, "unchanged": 0,
+                      "changed": 0, "near_duplicates": 0, "truncated": 0,
+                      "aborted": 0, "retries": 0, "retries_denied": 0, "dropped": 0,
+                      "errors": 0}
+        for stats in worker_stats:
+            for key in self.stats:
+                self.stats[key] += stats.get(key, 0)
+        self.stats["crawl_time"] = time.time() - start_time
+        
+        # Every host is crawled by one process, so the per-host limits do not overlap
+        hosts = {}
+        for stats in worker_stats:
+            hosts.update(stats.get("hosts", {}))
+        if hosts:
+            self.stats["hosts"] = hosts
+        
+        circuits = {"trips": 0, "open": {}, "given_up": []}
+        for stats in worker_stats:
+            if "circuits" in stats:
+                circuits["trips"] += stats["circuits"]["trips"]
+                circuits["open"].update(stats["circuits"]["open"])
+                circuits["given_up"].extend(stats["circuits"]["given_up"])
+        if circuits["trips"]:
+            self.stats["circuits"] = circuits
+        
+        budgets = [stats["budget"] for stats in worker_stats if "budget" in stats]
+        if budgets:
+            self.stats["budget"] = {
+                "pages": sum(budget["pages"] for budget in budgets),
+                "bytes": sum(budget["bytes"] for budget in budgets),
+                "seconds": max(budget["seconds"] for budget in budgets),
+                "skipped": sum(budget["skipped"] for budget in budgets),
+                "exhausted": sorted({name for budget in budgets for name in budget["exhausted"]}),
+            }
+        
+        # Each process has its own DNS cache and connection pools
+        for name in ("dns", "protocols", "connections"):
+            totals = {}
+            for stats in worker_stats:
+                for key, value in stats.get(name, {}).items():
+                    totals[key] = totals.get(key, 0) + value
+            if totals:
+                self.stats[name] = totals
+        
+        self.logger.info(f"Crawl completed: {self.stats['pages_crawled']} pages crawled by "
+                         f"{self.processes} processes, {self.stats['errors']} errors, "
+                         f"{self.stats['crawl_time']:.2f} seconds")
+        
+        return results
+    
+    def _collect(self, result_queue, results: List[Dict[str, Any]],
+                 worker_stats: List[Dict[str, Any]], timeout: float = 0.1) -> None:
+        """
+        Read the messages waiting in the result queue.
+        
+        Args:
+            result_queue (multiprocessing.Queue): Queue for crawled pages and stats
+            results (List[Dict[str, Any]]): List collecting crawled page data
+            worker_stats (List[Dict[str, Any]]): List collecting the stats of finished workers
+            timeout (float): Seconds to wait for the first message
+        """
+        while True:
+            try:
+                kind, payload = result_queue.get(timeout=timeout)
+            except queue.Empty:
+                return
+            
+            if kind == "page":
+                results.append(payload)
+            else:
+                worker_stats.append(payload)
+            
+            timeout = 0
\ No newline at end of file
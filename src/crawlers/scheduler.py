@@ -0,0 +1,412 @@
+"""
+Host Scheduler - Per-host politeness state for the crawl loop
+"""
+
+import time
+import random
+from concurrent.futures import Executor, Future
+from typing import Dict, Any, Optional, Set, Tuple
+import logging
+
+# Latency changes smaller than this are noise rather than a slower host (seconds)
+_LATENCY_SLACK = 0.05
+
+# How often a host whose robots.txt is fetched in the background is checked again (seconds)
+_ROBOTS_POLL = 0.05
+
+
+class HostLimits:
+    """Adaptive concurrency limit, delay and latency statistics of one host."""
+    
+    def __init__(self, delay: float, floor: float):
+        """
+        Initialize the limits of a host.
+        
+        Args:
+            delay (float): Starting delay between requests in seconds
+            floor (float): Lowest delay allowed, such as the robots.txt Crawl-delay
+        """
+        self.concurrency = 1.0
+        self.delay = max(delay, floor)
+        self.floor = floor
+        
+        # Smoothed response time and the lowest smoothed response time seen
+        self.latency: Optional[float] = None
+        self.baseline: Optional[float] = None
+        
+        # No further back-off until this time, so one burst of failures counts once
+        self.hold_until = 0.0
+        
+        # Number of decisions taken and the reason for the last back-off
+        self.increases = 0
+        self.decreases = 0
+        self.last_backoff = ""
+
+
+class HostScheduler:
+    """
+    Keeps one ready-time per host so that each host is crawled at its own pace.
+    
+    The delay for a host is the configured crawl delay or the host's own robots.txt
+    Crawl-delay, whichever is larger. Hosts are identified by their origin
+    (scheme://netloc), which is also the scope of a robots.txt file.
+    
+    With adaptive limits enabled, the delay and the number of fetches in flight are
+    tuned per host from the outcome of each fetch (AIMD): every healthy response
+    raises the concurrency additively and shortens the delay by a small step, while
+    429/503 responses, other server errors, timeouts and rising latency cut the
+    concurrency and double the delay. The robots.txt Crawl-delay stays a floor.
+    
+    A host can also be parked, which holds back all of its fetches until a given
+    time, such as while its circuit breaker is open.
+    
+    Robots.txt files are fetched in the calling thread, unless an executor is set
+    with set_robots_executor(). Then a new host is not ready until its robots.txt
+    has been fetched on the executor, so the caller's event loop never blocks.
+    """
+    
+    def __init__(self, delay: float, robots_parser=None, user_agent: str = "", jitter: float = 0.5,
+                 adaptive: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the host scheduler.
+        
+        Args:
+            delay (float): Configured delay between requests to the same host in seconds
+            robots_parser (RobotsTxtParser, optional): Parser used to look up each host's
+                Crawl-delay. If None, robots.txt delays are ignored.
+            user_agent (str): User-Agent used for robots.txt lookups
+            jitter (float): Maximum random delay added after each request for politeness
+            adaptive (Dict[str, Any], optional): crawl_settings.adaptive settings. If
+                not enabled, every host keeps a fixed delay and one fetch in flight.
+        """
+        self.logger = logging.getLogger("sheikhbot")
+        self.delay = delay
+        self.robots_parser = robots_parser
+        self.user_agent = user_agent
+        self.jitter = jitter
+        
+        # Effective delay, next allowed fetch time and fetches in flight per host
+        self._delays: Dict[str, float] = {}
+        self._ready_at: Dict[str, float] = {}
+        self._in_flight: Dict[str, int] = {}
+        
+        # Adaptive (AIMD) limits
+        adaptive = adaptive or {}
+        self.adaptive = adaptive.get("enabled", False)
+        self.max_concurrency = max(1, int(adaptive.get("max_concurrency", 4)))
+        self.min_delay = adaptive.get("min_delay", 0.0)
+        self.max_delay = adaptive.get("max_delay", 60.0)
+        self.delay_step = adaptive.get("delay_step", 0.1)
+        self.decrease_factor = adaptive.get("decrease_factor", 0.5)
+        self.latency_factor = adaptive.get("latency_factor", 2.0)
+        
+        # Robots.txt Crawl-delay, adaptive limits and the (ready_at, previous ready_at)
+        # set by the last acquire() per host
+        self._robots_delays: Dict[str, float] = {}
+        self._limits: Dict[str, HostLimits] = {}
+        self._reservations: Dict[str, Tuple[float, float]] = {}
+        
+        # Hosts parked by an open circuit breaker, until the time they may be probed
+        self._parked: Dict[str, float] = {}
+        
+        # Executor fetching robots.txt files, the fetches it is running per host and
+        # the hosts whose fetch has finished
+        self._robots_executor: Optional[Executor] = None
+        self._robots_pending: Dict[str, Future] = {}
+        self._robots_fetched: Set[str] = set()
+    
+    def set_robots_executor(self, executor: Optional[Executor]) -> None:
+        """
+        Fetch robots.txt files on an executor instead of in the calling thread.
+        
+        Args:
+            executor (Executor, optional): Executor running the fetches, or None to
+                fetch them in the calling thread again
+        """
+        self._robots_executor = executor
+        self._robots_pending = {}
+        self._robots_fetched = set()
+    
+    def _robots_resolved(self, host: str) -> bool:
+        """
+        Check whether the robots.txt of a host can be read without blocking.
+        
+        With an executor set, the first check of a host starts the fetch of its
+        robots.txt on the executor.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            bool: False while the robots.txt of the host is being fetched
+        """
+        if (self._robots_executor is None or self.robots_parser is None
+                or host in self._delays or host in self._robots_fetched):
+            return True
+        
+        future = self._robots_pending.get(host)
+        if future is None:
+            future = self._robots_pending[host] = self._robots_executor.submit(
+                self.robots_parser.fetch, f"{host}/robots.txt", self.user_agent
+            )
+        
+        if not future.done():
+            return False
+        
+        del self._robots_pending[host]
+        self._robots_fetched.add(host)
+        
+        return True
+    
+    def delay_for(self, host: str) -> float:
+        """
+        Get the delay between requests for a host.
+        
+        Args:
+            host (str): Host origin (scheme://netloc)
+            
+        Returns:
+            float: Delay in seconds
+        """
+        if self.adaptive:
+            return self._limits_for(host).delay
+        
+        return self._base_delay(host)
+    
+    def _base_delay(self, host: str) -> float:
+        """
+        Get the configured delay for a host, raised to its robots.txt Crawl-delay.
+        
+        Args:
+            host (str): Host origin (scheme://netloc)
+            
+        Returns:
+            float: Delay in seconds
+        """
+        if host not in self._delays:
+            if not self._robots_resolved(host):
+                # Not fetched before the host is ready, so the delay is not used yet
+                return self.delay
+            
+            delay = self.delay
+            self._robots_delays[host] = 0.0
+            
+            if self.robots_parser is not None:
+                robots_url = f"{host}/robots.txt"
+                
+                try:
+                    self.robots_parser.fetch(robots_url, self.user_agent)
+                    crawl_delay = self.robots_parser.get_crawl_delay(self.user_agent, robots_url)
+                    
+                    if crawl_delay is not None:
+                        self._robots_delays[host] = crawl_delay
+                    
+                    # Use robots.txt crawl delay if it's higher than our configured delay
+                    if crawl_delay is not None and crawl_delay > delay:
+                        delay = crawl_delay
+                        self.logger.info(f"Using crawl delay from robots.txt for {host}: {delay} seconds")
+                except Exception as e:
+                    self.logger.warning(f"Error fetching robots.txt for {host}: {str(e)}")
+            
+            self._delays[host] = delay
+        
+        return self._delays[host]
+    
+    def _limits_for(self, host: str) -> HostLimits:
+        """
+        Get the adaptive limits of a host, starting from its base delay.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            HostLimits: Limits of the host
+        """
+        limits = self._limits.get(host)
+        
+        if limits is None:
+            if not self._robots_resolved(host):
+                # Limits of a host start once its robots.txt Crawl-delay is known
+                return HostLimits(self.delay, self.min_delay)
+            
+            delay = self._base_delay(host)
+            floor = max(self.min_delay, self._robots_delays[host])
+            limits = self._limits[host] = HostLimits(delay, floor)
+        
+        return limits
+    
+    def ready_at(self, host: str) -> float:
+        """
+        Get the earliest time the host may be fetched again.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            float: Time on the time.monotonic() clock
+        """
+        if not self._robots_resolved(host):
+            return time.monotonic() + _ROBOTS_POLL
+        
+        ready_at = self._ready_at.get(host, 0.0)
+        
+        if host in self._parked:
+            ready_at = max(ready_at, self._parked[host])
+        
+        return ready_at
+    
+    def park(self, host: str, until: float) -> None:
+        """
+        Hold back every fetch of a host until a given time, whatever its delay.
+        
+        Args:
+            host (str): Host origin
+            until (float): Time on the time.monotonic() clock, or 0.0 to unpark the host
+        """
+        if until > time.monotonic():
+            self._parked[host] = until
+        else:
+            self._parked.pop(host, None)
+    
+    def has_capacity(self, host: str) -> bool:
+        """
+        Check whether another fetch may be started for a host.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            bool: True if the host has fewer fetches in flight than its limit
+        """
+        limit = int(self._limits_for(host).concurrency) if self.adaptive else 1
+        
+        return self._in_flight.get(host, 0) < limit
+    
+    def acquire(self, host: str) -> None:
+        """
+        Record that a fetch for a host has started.
+        
+        Args:
+            host (str): Host origin
+        """
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+        
+        if self.adaptive:
+            # Adaptive limits space the starts of fetches, which may overlap
+            delay = self._limits_for(host).delay
+            previous = self._ready_at.get(host, 0.0)
+            self._ready_at[host] = time.monotonic() + delay + random.uniform(0, min(self.jitter, delay / 2))
+            self._reservations[host] = (self._ready_at[host], previous)
+    
+    def release(self, host: str, fetched: bool = True) -> None:
+        """
+        Record that a fetch for a host has finished and schedule its next slot.
+        
+        Args:
+            host (str): Host origin
+            fetched (bool): False if the response came from a cache and the host
+                was not contacted, which leaves its next slot unchanged
+        """
+        self._in_flight[host] = max(0, self._in_flight.get(host, 0) - 1)
+        
+        if self.adaptive:
+            # Give back the slot of a fetch that never reached the host, unless
+            # another fetch has been started or the host backed off since
+            reservation = self._reservations.pop(host, None)
+            if not fetched and reservation is not None and self._ready_at.get(host) == reservation[0]:
+                self._ready_at[host] = reservation[1]
+            return
+        
+        if not fetched:
+            return
+        
+        # Respect crawl delay - add small random variation for politeness
+        self._ready_at[host] = time.monotonic() + self.delay_for(host) + random.uniform(0, self.jitter)
+    
+    def record(self, host: str, status_code: Optional[int], latency: float,
+               timed_out: bool = False, retry_after: Optional[float] = None) -> None:
+        """
+        Adjust the adaptive limits of a host from the outcome of a fetch.
+        
+        Args:
+            host (str): Host origin
+            status_code (Optional[int]): HTTP status, or None if the request failed
+            latency (float): Response time in seconds
+            timed_out (bool): Whether the request timed out
+            retry_after (float, optional): Seconds from a Retry-After header
+        """
+        if not self.adaptive:
+            return
+        
+        limits = self._limits_for(host)
+        now = time.monotonic()
+        
+        if status_code is not None and not timed_out:
+            limits.latency = latency if limits.latency is None else 0.8 * limits.latency + 0.2 * latency
+            limits.baseline = limits.latency if limits.baseline is None else min(limits.baseline, limits.latency)
+        
+        if timed_out:
+            reason = "timeout"
+        elif status_code is None:
+            reason = "request error"
+        elif status_code in (429, 503):
+            reason = f"HTTP {status_code}"
+        elif status_code >= 500:
+            reason = "server error"
+        elif limits.latency > self.latency_factor * limits.baseline + _LATENCY_SLACK:
+            reason = "rising latency"
+        else:
+            reason = None
+        
+        if reason is None:
+            # Additive increase: about one more fetch in flight per round of responses
+            limits.concurrency = min(self.max_concurrency, limits.concurrency + 1 / limits.concurrency)
+            limits.delay = max(limits.floor, limits.delay - self.delay_step)
+            limits.increases += 1
+            return
+        
+        if now < limits.hold_until:
+            return
+        
+        # Multiplicative decrease
+        limits.concurrency = max(1.0, limits.concurrency * self.decrease_factor)
+        limits.delay = min(self.max_delay, max(limits.delay, self.delay_step) / self.decrease_factor)
+        if retry_after is not None:
+            limits.delay = max(limits.delay, min(retry_after, self.max_delay))
+        limits.delay = max(limits.delay, limits.floor)
+        limits.decreases += 1
+        limits.last_backoff = reason
+        limits.hold_until = now + max(limits.delay, limits.latency or 0.0)
+        
+        self._ready_at[host] = max(self._ready_at.get(host, 0.0), now + limits.delay)
+        
+        self.logger.info(f"Backing off {host} ({reason}): {int(limits.concurrency)} concurrent "
+                         f"fetches, {limits.delay:.2f}s delay")
+    
+    def get_delay_stats(self) -> Dict[str, float]:
+        """
+        Get the effective delay of every host seen so far.
+        
+        Returns:
+            Dict[str, float]: Mapping of host origin to delay in seconds
+        """
+        return dict(self._delays)
+    
+    def get_host_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the adaptive concurrency and rate decisions of every host seen so far.
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of host origin to its current limits
+        """
+        return {
+            host: {
+                "concurrency": int(limits.concurrency),
+                "delay": round(limits.delay, 3),
+                "latency": round(limits.latency, 3) if limits.latency is not None else None,
+                "increases": limits.increases,
+                "decreases": limits.decreases,
+                "last_backoff": limits.last_backoff,
+            }
+            for host, limits in self._limits.items()
+        }
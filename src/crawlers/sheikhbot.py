@@ -10,16 +10,20 @@ from typing import List, Dict, Any, Optional, Union
 import logging
 
 from ..utils.config import load_config
-from ..utils.url import normalize_url, is_valid_url, get_domain
+from ..utils.url import parse_url, is_valid_url, get_domain
+from ..utils.url_filter import UrlFilter
 from ..utils.logger import setup_logger
 from ..utils.indexnow import IndexNowClient
 from ..utils.sitemap import SitemapGenerator
-from ..storage import FileStorage, MongoDBStorage, IndexBuilder
+from ..storage import FileStorage, MongoDBStorage, IndexBuilder, CrawlCheckpoint
 
 from .base_crawler import BaseCrawler
 from .desktop_crawler import DesktopCrawler
 from .mobile_crawler import MobileCrawler
 from .image_crawler import ImageCrawler
+from .multiprocess import MultiProcessCrawl
+from .coordinator import CoordinatedCrawl, create_coordinator
+from .fetch_cache import SharedFetchCache
 
 
 class SheikhBot:
@@ -41,12 +45,19 @@ class SheikhBot:
         
         self.logger.info(f"Initializing SheikhBot v{self.config['general']['version']}")
         
+        # Excluded URL patterns and allowed domains, compiled once
+        self.url_filter = UrlFilter.from_config(self.config)
+        
         # Initialize storage
         self._init_storage()
         
         # Initialize specialized crawlers
         self.crawlers = self._init_crawlers()
         
+        # Number of worker processes each crawl is spread over (1 = this process only)
+        multiprocess_config = self.config["crawl_settings"].get("multiprocess", {})
+        self.processes = multiprocess_config.get("processes", 1) if multiprocess_config.get("enabled", False) else 1
+        
         # Initialize index builder if enabled
         if self.config.get("index_settings", {}).get("build_index", False):
             self.index_builder = IndexBuilder(self.config)
@@ -180,13 +191,15 @@ class SheikhBot:
             self.logger.error(f"Error submitting URLs to IndexNow: {str(e)}")
             return 0
     
-    def crawl(self, urls: Union[str, List[str]] = None) -> None:
+    def crawl(self, urls: Union[str, List[str]] = None, resume: bool = False) -> None:
         """
         Start the crawling process.
         
         Args:
             urls (Union[str, List[str]], optional): URL or list of URLs to crawl.
                 If None, uses the start_urls from config.
+            resume (bool): Continue an interrupted crawl from its last checkpoint,
+                skipping the seed URLs and crawlers that already finished
         """
         if urls is None:
             urls = self.config["start_urls"]
@@ -206,52 +219,175 @@ class SheikhBot:
         # For collecting URLs to submit to IndexNow
         indexnow_urls = []
         
+        # Pages of the last crawl, for the sitemaps
+        sitemap_pages = []
+        
+        # Streamed crawls hand their pages on in batches instead of one list per crawl
+        streaming_config = self.config["crawl_settings"].get("streaming", {})
+        streaming = streaming_config.get("enabled", False)
+        batch_size = max(1, streaming_config.get("batch_size", 100))
+        
+        # Nodes sharing a crawl through a coordinator
+        coordinator_config = self.config["crawl_settings"].get("coordinator", {})
+        
+        # Remember which seed URL and crawler pairs finished, for --resume
+        session = None
+        completed = set()
+        
+        checkpoint_config = self.config["crawl_settings"].get("checkpoint", {})
+        if checkpoint_config.get("enabled", False):
+            session = CrawlCheckpoint(checkpoint_config.get("directory", "data/checkpoints"), "session")
+            
+            loaded = session.load() if resume else None
+            if loaded is not None:
+                completed = {tuple(pair) for pair in loaded[0]["completed"]}
+                self.logger.info(f"Resuming crawl: {len(completed)} crawls already completed")
+            else:
+                session.clear()
+        
+        elif resume:
+            self.logger.warning("Cannot resume: checkpoints are disabled (crawl_settings.checkpoint)")
+        
+        # Pages fetched by one crawler are reused by the crawlers sending the same
+        # kind of request instead of being downloaded again
+        fetch_cache = None
+        
+        shared_fetch_config = self.config["crawl_settings"].get("shared_fetch", {})
+        if shared_fetch_config.get("enabled", False):
+            fetch_cache = SharedFetchCache(int(shared_fetch_config.get("max_mb", 256) * 1024 * 1024))
+        
+        for crawler in self.crawlers.values():
+            crawler.fetch_cache = fetch_cache
+        
         # Crawl each URL with each enabled crawler
         for url in urls:
             if not is_valid_url(url):
                 self.logger.warning(f"Invalid URL: {url}, skipping")
                 continue
                 
-            normalized_url = normalize_url(url)
-            domain = get_domain(normalized_url)
+            parsed = parse_url(url)
+            normalized_url, domain = parsed.url, parsed.domain
             
             self.logger.info(f"Crawling {normalized_url} ({domain})")
             
             # Check if domain is allowed if allowed_domains is not empty
-            if self.config["allowed_domains"] and domain not in self.config["allowed_domains"]:
+            if not self.url_filter.is_allowed_domain(domain):
                 self.logger.warning(f"Domain {domain} not in allowed domains, skipping")
                 continue
             
             # Use each enabled crawler for this URL
             for crawler_type, crawler in self.crawlers.items():
+                if (normalized_url, crawler_type) in completed:
+                    self.logger.info(f"Skipping {crawler_type} crawl of {normalized_url} - already completed")
+                    continue
+                
                 try:
                     self.logger.info(f"Using {crawler_type} crawler for {normalized_url}")
-                    crawl_results = crawler.crawl(normalized_url)
                     
-                    # Store the results
-                    self.storage.store(crawl_results, crawler_type)
+                    # Crawlers that only use the page loop hooks can be shared between
+                    # nodes or spread over processes
+                    uses_page_loop = type(crawler).iter_crawl is BaseCrawler.iter_crawl
+                    
+                    # Whatever ran the crawl holds its stats once it has finished
+                    stats_holder = crawler
+                    
+                    if coordinator_config.get("enabled", False) and uses_page_loop:
+                        # With a run id, each run of the nodes is a job of its own;
+                        # without one, a finished job is crawled again
+                        run_id = str(coordinator_config.get("run_id") or "")
+                        job = f"{crawler_type}:{normalized_url}"
+                        if run_id:
+                            job = f"{job}@{run_id}"
+                        
+                        coordinator = create_coordinator(self.config, job)
+                        try:
+                            batches = [CoordinatedCrawl(
+                                crawler,
+                                coordinator,
+                                node_id=coordinator_config.get("node_id") or None,
+                                poll_interval=coordinator_config.get("poll_interval", 1.0),
+                                restart_finished=not run_id
+                            ).crawl(normalized_url)]
+                        finally:
+                            coordinator.close()
+                    elif self.processes > 1 and uses_page_loop:
+                        stats_holder = MultiProcessCrawl(type(crawler), self.config, self.processes)
+                        batches = [stats_holder.crawl(normalized_url)]
+                    elif streaming:
+                        # Pages flow to storage, the index and IndexNow while the crawl runs
+                        batches = crawler.iter_crawl(normalized_url, resume=resume, batch_size=batch_size)
+                    else:
+                        batches = [crawler.crawl(normalized_url, resume=resume)]
+                    
+                    sitemap_pages = []
+                    
+                    for crawl_results in batches:
+                        # Store the results
+                        if streaming:
+                            self.storage.append(crawl_results, crawler_type)
+                        else:
+                            self.storage.store(crawl_results, crawler_type)
+                        
+                        # Build index if enabled (written to disk once the crawl has finished)
+                        if self.config["index_settings"]["build_index"]:
+                            self.index_builder.add_to_index(crawl_results, save=False)
+                        
+                        # Collect URLs for IndexNow submission if enabled
+                        if "indexnow" in self.config and self.config["indexnow"]["enabled"] and self.config["indexnow"]["auto_submit"]:
+                            if self.indexnow_client:
+                                if isinstance(crawl_results, list):
+                                    for result in crawl_results:
+                                        # Pages unchanged since the previous crawl need no notification
+                                        if "url" in result and result["url"] and not result.get("unchanged"):
+                                            indexnow_urls.append(result["url"])
+                                elif isinstance(crawl_results, dict) and "url" in crawl_results and crawl_results["url"]:
+                                    indexnow_urls.append(crawl_results["url"])
+                        
+                        # Streamed crawls submit each batch right away
+                        if streaming and indexnow_urls:
+                            submitted_count = self.submit_urls_to_indexnow(indexnow_urls) or 0
+                            stats["urls_submitted_to_indexnow"] = stats.get("urls_submitted_to_indexnow", 0) + submitted_count
+                            indexnow_urls = []
+                        
+                        # Keep what the sitemap needs, without the page content
+                        if self.config["sitemap_settings"]["enabled"]:
+                            sitemap_pages.extend(
+                                {key: value for key, value in result.items() if key not in ("content", "headers")}
+                                for result in crawl_results
+                            )
+                        
+                        stats["pages_indexed"] += len(crawl_results) if isinstance(crawl_results, list) else 1
                     
-                    # Build index if enabled
                     if self.config["index_settings"]["build_index"]:
-                        self.index_builder.add_to_index(crawl_results)
+                        self.index_builder.save_index()
+                    
+                    # Budget use of every crawl goes into the stored stats
+                    if "budget" in stats_holder.stats:
+                        stats.setdefault("budgets", {})[f"{crawler_type} {normalized_url}"] = stats_holder.stats["budget"]
                     
-                    # Collect URLs for IndexNow submission if enabled
-                    if "indexnow" in self.config and self.config["indexnow"]["enabled"] and self.config["indexnow"]["auto_submit"]:
-                        if self.indexnow_client:
-                            if isinstance(crawl_results, list):
-                                for result in crawl_results:
-                                    if "url" in result and result["url"]:
-                                        indexnow_urls.append(result["url"])
-                            elif isinstance(crawl_results, dict) and "url" in crawl_results and crawl_results["url"]:
-                                indexnow_urls.append(crawl_results["url"])
+                    if session is not None:
+                        completed.add((normalized_url, crawler_type))
+                        session.save({"completed": sorted(completed)})
                     
                     stats["urls_crawled"] += 1
-                    stats["pages_indexed"] += len(crawl_results) if isinstance(crawl_results, list) else 1
                     
                 except Exception as e:
                     self.logger.error(f"Error crawling {normalized_url} with {crawler_type} crawler: {str(e)}")
                     stats["errors"] += 1
         
+        # Every crawl of this session finished
+        if session is not None:
+            session.clear()
+        
+        if fetch_cache is not None:
+            stats["shared_fetches"] = fetch_cache.hits
+            self.logger.info(f"Shared fetch cache: {fetch_cache.hits} pages reused, "
+                             f"{fetch_cache.misses} fetched")
+            
+            fetch_cache.clear()
+            for crawler in self.crawlers.values():
+                crawler.fetch_cache = None
+        
         # Submit collected URLs to IndexNow if enabled
         if indexnow_urls and "indexnow" in self.config and self.config["indexnow"]["enabled"] and self.config["indexnow"]["auto_submit"]:
             submitted_count = self.submit_urls_to_indexnow(indexnow_urls)
@@ -261,7 +397,7 @@ class SheikhBot:
         if self.config["sitemap_settings"]["enabled"]:
             try:
                 domain_urls = {}
-                for result in crawl_results:
+                for result in sitemap_pages:
                     domain = get_domain(result["url"])
                     if domain not in domain_urls:
                         domain_urls[domain] = []
@@ -2,8 +2,4 @@
 SheikhBot Parsers - Content parsers for extracting information from web pages
 """
 
-from .html_parser import HTMLParser
-from .json_parser import JSONParser
-from .xml_parser import XMLParser
-from .image_parser import ImageParser
-from .video_parser import VideoParser 
\ No newline at end of file
+from .document import ParsedDocument 
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Parsed Document - A fetched response whose HTML is parsed at most once
+"""
+
+from typing import Optional, List, Dict
+from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
+import requests
+
+# Elements whose text is not shown on the page
+_INVISIBLE_TAGS = frozenset(["script", "style", "noscript", "template", "head", "title"])
+
+
+class _HrefCollector:
+    """lxml parser target that keeps the href of each <a> tag and builds no tree."""
+    
+    def __init__(self):
+        self.hrefs = []
+    
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == "a":
+            href = attrib.get("href")
+            if href is not None:
+                self.hrefs.append(href)
+    
+    def close(self) -> List[str]:
+        return self.hrefs
+
+
+class ParsedDocument:
+    """
+    A fetched page shared by every processing and link-extraction hook.
+    
+    The HTML tree is built on first access to soup and reused afterwards, so a
+    page is parsed once no matter how many hooks of a crawler and its subclasses
+    look at it.
+    """
+    
+    # Number of HTML parses done by all documents, for profiling
+    parse_count = 0
+    
+    def __init__(self, response: requests.Response, url: str):
+        """
+        Initialize the document.
+        
+        Args:
+            response (requests.Response): HTTP response
+            url (str): URL of the page
+        """
+        self.response = response
+        self.url = url
+        self.content_type = response.headers.get("Content-Type", "")
+        self._soup: Optional[BeautifulSoup] = None
+        self._hrefs: Optional[List[str]] = None
+        self._text: Optional[str] = None
+    
+    @property
+    def is_html(self) -> bool:
+        """
+        Check whether the response is an HTML page.
+        
+        Returns:
+            bool: True if the Content-Type is text/html
+        """
+        return "text/html" in self.content_type
+    
+    @property
+    def soup(self) -> BeautifulSoup:
+        """
+        Get the parsed HTML tree, parsing the response on first access.
+        
+        Returns:
+            BeautifulSoup: Parsed HTML
+        """
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.response.content, "lxml")
+            ParsedDocument.parse_count += 1
+        
+        return self._soup
+    
+    @property
+    def hrefs(self) -> List[str]:
+        """
+        Get the href of every <a> tag, in document order.
+        
+        The links are read with a streaming lxml parser instead of from the
+        BeautifulSoup tree, which is several times faster and does not parse the
+        page into soup if no hook needs it.
+        
+        Returns:
+            List[str]: Link targets as written in the page
+        """
+        if self._hrefs is None:
+            # The header charset wins over <meta> tags, as in a browser
+            encoding = None
+            if "charset=" in self.content_type.lower():
+                encoding = self.response.encoding
+            
+            try:
+                parser = etree.HTMLParser(target=_HrefCollector(), encoding=encoding)
+            except LookupError:
+                # Unknown charset, let lxml detect the encoding
+                parser = etree.HTMLParser(target=_HrefCollector())
+            
+            try:
+                parser.feed(self.response.content)
+                self._hrefs = parser.close()
+            except (etree.Error, ValueError):
+                self._hrefs = []
+        
+        return self._hrefs
+    
+    @property
+    def text(self) -> str:
+        """
+        Get the visible text of the page, without scripts, styles and comments.
+        
+        Returns:
+            str: Text of the page's strings joined by spaces
+        """
+        if self._text is None:
+            # Comments, doctypes and script contents are NavigableString subclasses
+            self._text = " ".join(
+                string for string in self.soup.find_all(string=True)
+                if type(string) is NavigableString and string.parent.name not in _INVISIBLE_TAGS
+            )
+        
+        return self._text
\ No newline at end of file
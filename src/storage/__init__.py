@@ -4,4 +4,7 @@ SheikhBot Storage - Data storage solutions for crawled content
 
 from .file_storage import FileStorage
 from .mongodb_storage import MongoDBStorage
-from .index_builder import IndexBuilder 
\ No newline at end of file
+from .index_builder import IndexBuilder
+from .checkpoint import CrawlCheckpoint
+from .response_cache import ResponseCache
+from .manifest import CrawlManifest 
\ No newline at end of file
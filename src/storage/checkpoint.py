@@ -0,0 +1,151 @@
+"""
+Crawl Checkpoint - Periodic on-disk snapshots for resuming interrupted crawls
+"""
+
+import os
+import json
+from typing import Dict, List, Any, Optional, Tuple
+import logging
+
+
+class CrawlCheckpoint:
+    """
+    Stores the state of a running crawl so it can be resumed after a crash.
+    
+    The crawl state (frontier, visited URLs, HTTP caching validators and stats) is
+    rewritten atomically on every save, while crawled pages are appended to a
+    JSON Lines file so each save only writes the pages crawled since the last one.
+    """
+    
+    def __init__(self, directory: str, name: str):
+        """
+        Initialize the checkpoint.
+        
+        Args:
+            directory (str): Directory where checkpoint files are written
+            name (str): Name identifying the crawl (e.g. crawler type and seed hash)
+        """
+        self.logger = logging.getLogger("sheikhbot.storage.checkpoint")
+        self.directory = directory
+        self.state_file = os.path.join(directory, f"{name}.json")
+        self.results_file = os.path.join(directory, f"{name}.results.jsonl")
+        
+        os.makedirs(directory, exist_ok=True)
+    
+    def exists(self) -> bool:
+        """
+        Check whether a checkpoint has been saved.
+        
+        Returns:
+            bool: True if a checkpoint state file exists
+        """
+        return os.path.exists(self.state_file)
+    
+    def save(self, state: Dict[str, Any], new_results: Optional[List[Dict[str, Any]]] = None) -> None:
+        """
+        Save the crawl state and append newly crawled results.
+        
+        Args:
+            state (Dict[str, Any]): JSON-serializable crawl state
+            new_results (List[Dict[str, Any]], optional): Results crawled since the last save
+        """
+        results_saved, results_size = self._saved_results()
+        
+        try:
+            # Drop results appended by a save that crashed before its state was written
+            if os.path.exists(self.results_file) and os.path.getsize(self.results_file) > results_size:
+                with open(self.results_file, 'r+b') as f:
+                    f.truncate(results_size)
+            
+            if new_results:
+                with open(self.results_file, 'ab') as f:
+                    for result in new_results:
+                        f.write((json.dumps(result, ensure_ascii=False) + "\n").encode('utf-8'))
+                    results_size = f.tell()
+                results_saved += len(new_results)
+            
+            state = dict(state, results_saved=results_saved, results_size=results_size)
+            
+            # Write to a temporary file first so a crash never leaves a partial state
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+            os.replace(tmp_file, self.state_file)
+            
+            self.logger.info(f"Checkpoint saved to {self.state_file} ({results_saved} results)")
+        except Exception as e:
+            self.logger.error(f"Error saving checkpoint: {str(e)}")
+    
+    def load(self) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        Load the last saved checkpoint.
+        
+        Returns:
+            Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]: (state, results), or
+                None if there is no usable checkpoint
+        """
+        if not self.exists():
+            return None
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            
+            # Only trust results that were recorded by the saved state
+            results = []
+            if os.path.exists(self.results_file):
+                with open(self.results_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if len(results) >= state.get("results_saved", 0):
+                            break
+                        results.append(json.loads(line))
+            
+            return state, results
+        except Exception as e:
+            self.logger.error(f"Error loading checkpoint {self.state_file}: {str(e)}")
+            return None
+    
+    def clear(self) -> None:
+        """Remove the checkpoint files."""
+        for path in (self.state_file, self.results_file):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                self.logger.warning(f"Error removing checkpoint file {path}: {str(e)}")
+    
+    def _saved_results(self) -> Tuple[int, int]:
+        """
+        Get the number and size of the results recorded by the current state file.
+        
+        Returns:
+            Tuple[int, int]: Number of saved results and the length in bytes of the
+                results file they take up
+        """
+        if not self.exists():
+            # Results without a state are from an unfinished first save
+            if os.path.exists(self.results_file):
+                os.remove(self.results_file)
+            return 0, 0
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except Exception:
+            return 0, 0
+        
+        results_saved = state.get("results_saved", 0)
+        if "results_size" in state:
+            return results_saved, state["results_size"]
+        
+        # States written before results_size was recorded: measure the saved lines
+        results_size = 0
+        if os.path.exists(self.results_file):
+            with open(self.results_file, 'rb') as f:
+                for _ in range(results_saved):
+                    line = f.readline()
+                    if not line:
+                        break
+                    results_size += len(line)
+        
+        return results_saved, results_size
\ No newline at end of file
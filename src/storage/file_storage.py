@@ -25,6 +25,9 @@ class FileStorage:
         # Create output directory if it doesn't exist
         os.makedirs(self.output_dir, exist_ok=True)
         
+        # JSON Lines file that append() writes to, per data type
+        self.append_files = {}
+    
     def store(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], data_type: str = None) -> None:
         """
         Store the crawled data to a file.
@@ -47,6 +50,38 @@ class FileStorage:
         except Exception as e:
             self.logger.error(f"Error storing data to file: {str(e)}")
     
+    def append(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], data_type: str = None) -> None:
+        """
+        Append crawled data to a JSON Lines file, one item per line.
+        
+        Every call for the same data type appends to the same file, so a crawl can be
+        stored in batches while it is running.
+        
+        Args:
+            data (Union[Dict[str, Any], List[Dict[str, Any]]]): Data to store
+            data_type (str, optional): Type of data (e.g., desktop, mobile)
+        """
+        if not data:
+            return
+        
+        if not isinstance(data, list):
+            data = [data]
+        
+        if data_type not in self.append_files:
+            timestamp = int(time.time())
+            filename = f"{data_type}_{timestamp}.jsonl" if data_type else f"data_{timestamp}.jsonl"
+            self.append_files[data_type] = os.path.join(self.output_dir, filename)
+        
+        filepath = self.append_files[data_type]
+        
+        try:
+            with open(filepath, 'a', encoding='utf-8') as f:
+                for item in data:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            self.logger.info(f"{len(data)} items appended to {filepath}")
+        except Exception as e:
+            self.logger.error(f"Error appending data to file: {str(e)}")
+    
     def store_stats(self, stats: Dict[str, Any]) -> None:
         """
         Store crawl statistics to a file.
@@ -82,7 +117,7 @@ class FileStorage:
         
         try:
             for filename in os.listdir(self.output_dir):
-                if not filename.endswith('.json'):
+                if not filename.endswith(('.json', '.jsonl')):
                     continue
                     
                 # Skip if data_type specified and file doesn't match
@@ -92,7 +127,10 @@ class FileStorage:
                 filepath = os.path.join(self.output_dir, filename)
                 
                 with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                    if filename.endswith('.jsonl'):
+                        data = [json.loads(line) for line in f if line.strip()]
+                    else:
+                        data = json.load(f)
                     
                 if isinstance(data, list):
                     all_data.extend(data)
@@ -97,6 +97,10 @@ class IndexBuilder:
         
         return None
     
+    def save_index(self) -> None:
+        """Save the current index to disk."""
+        self._save_index()
+    
     def _save_index(self) -> None:
         """Save the current index to disk."""
         try:
@@ -195,12 +199,14 @@ class IndexBuilder:
 
         return results
 
-    def add_to_index(self, data: Union[Dict[str, Any], List[Dict[str, Any]]]) -> None:
+    def add_to_index(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], save: bool = True) -> None:
         """
         Add data to the search index.
         
         Args:
             data (Union[Dict[str, Any], List[Dict[str, Any]]]): Data to add to the index
+            save (bool): Write the index to disk afterwards. Callers adding many small
+                batches can pass False and call save_index() once at the end.
         """
         if not data:
             return
@@ -213,6 +219,10 @@ class IndexBuilder:
                 # Only index items with at least url and title
                 if "url" not in item or "title" not in item:
                     continue
+                
+                # Near-duplicates are found through the page they duplicate
+                if item.get("duplicate_of"):
+                    continue
                     
                 # Check if URL already exists in index
                 doc_id = None
@@ -293,7 +303,8 @@ class IndexBuilder:
                 self.logger.error(f"Error indexing item: {str(e)}")
         
         # Save the updated index
-        self._save_index()
+        if save:
+            self._save_index()
     
     def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
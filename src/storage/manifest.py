@@ -0,0 +1,239 @@
+"""
+Crawl Manifest - Per-URL record of the previous crawl for incremental recrawls
+"""
+
+import os
+import json
+import time
+import sqlite3
+from typing import Dict, List, Any, Optional
+import logging
+
+
+class CrawlManifest:
+    """
+    Remembers what every page of a crawl looked like when it was last fetched.
+    
+    Each URL keeps the hash of its body, the time it was last fetched or revalidated,
+    its ETag/Last-Modified validators, the extracted page data and its outgoing
+    links. The next crawl of the same site can then take over unchanged pages,
+    and keep following their links, without downloading them again.
+    """
+    
+    def __init__(self, directory: str, name: str):
+        """
+        Initialize the crawl manifest.
+        
+        Args:
+            directory (str): Directory where manifest databases are written
+            name (str): Name identifying the crawl (e.g. crawler type and seed hash)
+        """
+        self.logger = logging.getLogger("sheikhbot.storage.manifest")
+        self.directory = directory
+        self.db_path = os.path.join(directory, f"{name}.manifest.db")
+        
+        # The connection is opened on first use, in the process that uses it
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get the database connection, opening it if needed.
+        
+        Returns:
+            sqlite3.Connection: Connection to the manifest database
+        """
+        if self._db is not None and self._pid == os.getpid():
+            return self._db
+        
+        os.makedirs(self.directory, exist_ok=True)
+        
+        # Worker processes of a multi-process crawl share the manifest
+        self._db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self._pid = os.getpid()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY, content_hash TEXT, fetched_at REAL, seen_at REAL,
+                etag TEXT, last_modified TEXT, page TEXT, links TEXT
+            )
+        """)
+        
+        return self._db
+    
+    def __len__(self) -> int:
+        """
+        Get the number of pages in the manifest.
+        
+        Returns:
+            int: Number of pages
+        """
+        return self._connect().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+    
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the record of a page.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            Optional[Dict[str, Any]]: Record with "content_hash", "fetched_at", "etag",
+                "last_modified", "page" and "links" keys, or None if the page is unknown
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT content_hash, fetched_at, etag, last_modified, page, links FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading crawl manifest: {str(e)}")
+            return None
+        
+        if row is None:
+            return None
+        
+        content_hash, fetched_at, etag, last_modified, page, links = row
+        
+        return {
+            "content_hash": content_hash,
+            "fetched_at": fetched_at,
+            "etag": etag,
+            "last_modified": last_modified,
+            "page": json.loads(page),
+            "links": json.loads(links)
+        }
+    
+    def content_hash(self, url: str) -> Optional[str]:
+        """
+        Get the hash of a page's body when it was last fetched.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            Optional[str]: Content hash, or None if the page is unknown
+        """
+        try:
+            row = self._connect().execute("SELECT content_hash FROM pages WHERE url = ?", (url,)).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading crawl manifest: {str(e)}")
+            return None
+        
+        return row[0] if row else None
+    
+    def validators(self, url: str) -> Dict[str, str]:
+        """
+        Get the conditional request headers for a page of the previous crawl.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            Dict[str, str]: If-None-Match and If-Modified-Since headers, empty if the
+                page is unknown
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT etag, last_modified FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading crawl manifest: {str(e)}")
+            return {}
+        
+        if row is None:
+            return {}
+        
+        etag, last_modified = row
+        headers = {}
+        
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        return headers
+    
+    def put(self, url: str, content_hash: str, headers: Dict[str, str], page: Dict[str, Any],
+            links: List[str]) -> None:
+        """
+        Record a freshly fetched page.
+        
+        Args:
+            url (str): Normalized URL
+            content_hash (str): Hash of the response body
+            headers (Dict[str, str]): Response headers with the page's validators
+            page (Dict[str, Any]): Extracted page data
+            links (List[str]): Normalized URLs the page links to
+        """
+        now = time.time()
+        
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, content_hash, now, now, headers.get("ETag"), headers.get("Last-Modified"),
+                 json.dumps(page, ensure_ascii=False, default=str), json.dumps(links))
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error writing crawl manifest: {str(e)}")
+    
+    def revalidated(self, url: str, headers: Dict[str, str]) -> None:
+        """
+        Mark a page as fetched now after the server answered 304 Not Modified.
+        
+        Args:
+            url (str): Normalized URL
+            headers (Dict[str, str]): Headers of the 304 response
+        """
+        now = time.time()
+        
+        try:
+            self._connect().execute(
+                "UPDATE pages SET fetched_at = ?, seen_at = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, headers.get("ETag"), headers.get("Last-Modified"), url)
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error writing crawl manifest: {str(e)}")
+    
+    def seen(self, url: str) -> None:
+        """
+        Mark a page that was taken over without a request as part of the current crawl.
+        
+        Args:
+            url (str): Normalized URL
+        """
+        try:
+            self._connect().execute("UPDATE pages SET seen_at = ? WHERE url = ?", (time.time(), url))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error writing crawl manifest: {str(e)}")
+    
+    def prune(self, before: float) -> int:
+        """
+        Remove the pages a complete crawl no longer reached.
+        
+        Args:
+            before (float): Start time of the crawl; pages not seen since are removed
+            
+        Returns:
+            int: Number of removed pages
+        """
+        try:
+            return self._connect().execute("DELETE FROM pages WHERE seen_at < ?", (before,)).rowcount
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error pruning crawl manifest: {str(e)}")
+            return 0
+    
+    def clear(self) -> None:
+        """Remove every page from the manifest."""
+        try:
+            self._connect().execute("DELETE FROM pages")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error clearing crawl manifest: {str(e)}")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        
+        self._db = None
\ No newline at end of file
@@ -81,6 +81,18 @@ class MongoDBStorage:
         except Exception as e:
             self.logger.error(f"Error storing data to MongoDB: {str(e)}")
     
+    def append(self, data: Union[Dict[str, Any], List[Dict[str, Any]]], data_type: str = None) -> None:
+        """
+        Append a batch of crawled data to MongoDB.
+        
+        Documents are inserted one batch at a time anyway, so this is the same as store().
+        
+        Args:
+            data (Union[Dict[str, Any], List[Dict[str, Any]]]): Data to store
+            data_type (str, optional): Type of data (e.g., desktop, mobile)
+        """
+        self.store(data, data_type)
+    
     def store_stats(self, stats: Dict[str, Any]) -> None:
         """
         Store crawl statistics to MongoDB.
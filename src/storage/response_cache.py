@@ -0,0 +1,277 @@
+"""
+Response Cache - Persistent on-disk cache of fetched pages and their validators
+"""
+
+import os
+import json
+import time
+import sqlite3
+from typing import Dict, Any, Optional
+import logging
+
+from ..utils.http import FetchedResponse
+
+
+class ResponseCache:
+    """
+    Keeps the body, headers and ETag/Last-Modified validators of fetched pages on disk.
+    
+    Entries are keyed by request variant and URL and stored in one SQLite database,
+    so conditional requests keep working across runs and a 304 Not Modified can be
+    answered with the cached page. The total size of the cached bodies is bounded
+    by max_size_mb; the least recently used entries are evicted first. Entries that
+    have not been stored or revalidated for expiry_days are dropped.
+    """
+    
+    def __init__(self, directory: str, max_size_mb: float = 500, expiry_days: float = 7):
+        """
+        Initialize the response cache.
+        
+        Args:
+            directory (str): Directory of the cache database
+            max_size_mb (float): Maximum total size of the cached bodies in megabytes
+            expiry_days (float): Days after which an entry that was not revalidated
+                is dropped. 0 keeps entries until they are evicted.
+        """
+        self.logger = logging.getLogger("sheikhbot.storage.cache")
+        self.directory = directory
+        self.db_path = os.path.join(directory, "responses.db")
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.expiry_seconds = expiry_days * 24 * 3600
+        
+        # The connection is opened on first use, in the process that uses it
+        self._db: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._size = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["ResponseCache"]:
+        """
+        Create the response cache configured in storage.cache.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            Optional[ResponseCache]: The cache, or None if it is disabled
+        """
+        cache_config = config.get("storage", {}).get("cache", {})
+        
+        if not cache_config.get("enabled", False):
+            return None
+        
+        return cls(
+            cache_config.get("directory", "cache"),
+            max_size_mb=cache_config.get("max_size_mb", 500),
+            expiry_days=cache_config.get("expiry_days", 7)
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get the database connection, opening it if needed.
+        
+        Returns:
+            sqlite3.Connection: Connection to the cache database
+        """
+        if self._db is not None and self._pid == os.getpid():
+            return self._db
+        
+        os.makedirs(self.directory, exist_ok=True)
+        
+        # Several crawlers and worker processes may share the cache
+        self._db = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        self._pid = os.getpid()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                variant TEXT, url TEXT, final_url TEXT, status INTEGER, headers TEXT,
+                body BLOB, etag TEXT, last_modified TEXT, size INTEGER,
+                stored_at REAL, accessed_at REAL,
+                PRIMARY KEY (variant, url)
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+        """)
+        
+        if self.expiry_seconds > 0:
+            self._db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.expiry_seconds,))
+        
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        
+        return self._db
+    
+    def __len__(self) -> int:
+        """
+        Get the number of cached responses.
+        
+        Returns:
+            int: Number of responses
+        """
+        return self._connect().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def _is_expired(self, stored_at: float) -> bool:
+        """
+        Check whether an entry is too old to be used.
+        
+        Args:
+            stored_at (float): Time the entry was stored or last revalidated
+            
+        Returns:
+            bool: True if the entry has expired
+        """
+        return self.expiry_seconds > 0 and stored_at < time.time() - self.expiry_seconds
+    
+    def validators(self, variant: str, url: str) -> Dict[str, str]:
+        """
+        Get the conditional request headers for a cached page.
+        
+        Args:
+            variant (str): Request variant, e.g. "desktop" or "mobile"
+            url (str): URL to fetch
+            
+        Returns:
+            Dict[str, str]: If-None-Match and If-Modified-Since headers, empty if the
+                page is not cached
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT etag, last_modified, stored_at FROM responses WHERE variant = ? AND url = ?",
+                (variant, url)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading response cache: {str(e)}")
+            return {}
+        
+        if row is None or self._is_expired(row[2]):
+            return {}
+        
+        etag, last_modified, _ = row
+        headers = {}
+        
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        return headers
+    
+    def put(self, variant: str, url: str, response) -> None:
+        """
+        Cache a fetched page if it can be revalidated later.
+        
+        Args:
+            variant (str): Request variant the response was fetched with
+            url (str): URL that was fetched
+            response (requests.Response): HTTP response or FetchedResponse
+        """
+        if response.status_code != 200:
+            return
+        
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        
+        # Without validators the page would be downloaded again anyway
+        if not etag and not last_modified:
+            return
+        
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        
+        now = time.time()
+        
+        try:
+            db = self._connect()
+            
+            old = db.execute("SELECT size FROM responses WHERE variant = ? AND url = ?", (variant, url)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (variant, url, response.url, response.status_code, json.dumps(dict(response.headers)),
+                 sqlite3.Binary(response.content), etag, last_modified, size, now, now)
+            )
+            self._size += size - (old[0] if old else 0)
+            
+            if self._size > self.max_bytes:
+                self._evict()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error writing response cache: {str(e)}")
+    
+    def revalidate(self, variant: str, url: str, headers: Dict[str, str]) -> Optional[FetchedResponse]:
+        """
+        Get the cached page for a 304 Not Modified response and mark it as fresh.
+        
+        Args:
+            variant (str): Request variant the request was sent with
+            url (str): URL that was fetched
+            headers (Dict[str, str]): Headers of the 304 response, which replace the
+                cached ones they update (such as ETag or Cache-Control)
+                
+        Returns:
+            Optional[FetchedResponse]: The cached page, or None if it is not cached
+        """
+        try:
+            db = self._connect()
+            row = db.execute(
+                "SELECT final_url, status, headers, body, stored_at FROM responses WHERE variant = ? AND url = ?",
+                (variant, url)
+            ).fetchone()
+            
+            if row is None or self._is_expired(row[4]):
+                return None
+            
+            final_url, status, cached_headers, body, _ = row
+            
+            cached_headers = json.loads(cached_headers)
+            response = FetchedResponse(final_url, status, cached_headers, bytes(body))
+            
+            # Content headers describe the cached body, every other header is updated
+            for name, value in headers.items():
+                if name.lower() not in ("content-length", "content-encoding", "transfer-encoding"):
+                    response.headers[name] = value
+            
+            now = time.time()
+            db.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, stored_at = ?, accessed_at = ? "
+                "WHERE variant = ? AND url = ?",
+                (json.dumps(dict(response.headers)), response.headers.get("ETag"),
+                 response.headers.get("Last-Modified"), now, now, variant, url)
+            )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error reading response cache: {str(e)}")
+            return None
+        
+        return response
+    
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits max_size_mb."""
+        db = self._connect()
+        
+        while self._size > self.max_bytes:
+            rows = db.execute(
+                "SELECT variant, url, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            
+            if not rows:
+                self._size = 0
+                break
+            
+            for variant, url, size in rows:
+                db.execute("DELETE FROM responses WHERE variant = ? AND url = ?", (variant, url))
+                self._size -= size
+                
+                if self._size <= self.max_bytes:
+                    break
+    
+    def clear(self) -> None:
+        """Remove every cached response."""
+        try:
+            self._connect().execute("DELETE FROM responses")
+            self._size = 0
+        except sqlite3.Error as e:
+            self.logger.warning(f"Error clearing response cache: {str(e)}")
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._db is not None and self._pid == os.getpid():
+            self._db.close()
+        
+        self._db = None
\ No newline at end of file
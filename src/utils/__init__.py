@@ -3,7 +3,7 @@ SheikhBot Utils - Utility functions and helpers
 """
 
 from .config import load_config, save_config
-from .url import normalize_url, is_valid_url, get_domain
-from .http import make_request, download_file
+from .url import normalize_url, parse_url, ParsedURL, is_valid_url, get_domain
+from .http import make_request, download_file, HttpClient
 from .logger import setup_logger
 from .robots import RobotsTxtParser 
\ No newline at end of file
@@ -0,0 +1,314 @@
+"""
+Circuit Breaker - Per-host circuit breakers and a retry budget shared by all fetches
+"""
+
+import time
+import threading
+from typing import Dict, Any, Optional, Set
+
+# Circuit states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Outcome of a host whose circuit keeps opening
+GIVEN_UP = "given_up"
+
+# Responses that count as a failure of the host rather than of the page
+FAILURE_STATUSES = (500, 502, 503, 504)
+
+# Responses worth fetching again later
+RETRY_STATUSES = (429,) + FAILURE_STATUSES
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one host.
+    
+    The circuit opens after failure_threshold consecutive failures and stays open
+    for the recovery time, which doubles every time the circuit opens again without
+    a success in between. Once the recovery time has passed the circuit is half
+    open: the next outcome closes it on success or opens it again on failure.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0,
+                 max_recovery_time: float = 600.0):
+        """
+        Initialize the circuit breaker.
+        
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            recovery_time (float): Seconds the circuit stays open the first time
+            max_recovery_time (float): Longest time the circuit stays open in seconds
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.recovery_time = recovery_time
+        self.max_recovery_time = max_recovery_time
+        
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+    
+    @property
+    def state(self) -> str:
+        """
+        Get the current state of the circuit.
+        
+        Returns:
+            str: CLOSED, OPEN or HALF_OPEN
+        """
+        if self.trips == 0:
+            return CLOSED
+        
+        return OPEN if time.monotonic() < self.open_until else HALF_OPEN
+    
+    def record_success(self) -> bool:
+        """
+        Record a successful request.
+        
+        Returns:
+            bool: True if this closed an open or half-open circuit
+        """
+        was_open = self.trips > 0
+        
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        
+        return was_open
+    
+    def record_failure(self) -> bool:
+        """
+        Record a failed request.
+        
+        Failures of requests sent before the circuit opened do not open it again.
+        
+        Returns:
+            bool: True if this opened the circuit
+        """
+        state = self.state
+        
+        if state == OPEN:
+            return False
+        
+        self.failures += 1
+        
+        if state == CLOSED and self.failures < self.failure_threshold:
+            return False
+        
+        self.trips += 1
+        recovery = min(self.max_recovery_time, self.recovery_time * 2 ** (self.trips - 1))
+        self.open_until = time.monotonic() + recovery
+        
+        return True
+
+
+class HostCircuitBreakers:
+    """
+    Circuit breakers of every host of a crawl.
+    
+    A host whose circuit opens max_trips times in a row without a success in
+    between is given up for the rest of the crawl.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0,
+                 max_recovery_time: float = 600.0, max_trips: int = 5):
+        """
+        Initialize the circuit breakers.
+        
+        Args:
+            failure_threshold (int): Consecutive failures that open a host's circuit
+            recovery_time (float): Seconds a circuit stays open the first time
+            max_recovery_time (float): Longest time a circuit stays open in seconds
+            max_trips (int): Consecutive openings after which a host is given up,
+                or 0 to never give up a host
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.max_recovery_time = max_recovery_time
+        self.max_trips = max_trips
+        
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.given_up: Set[str] = set()
+        self.trips = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["HostCircuitBreakers"]:
+        """
+        Create the circuit breakers configured in crawl_settings.circuit_breaker.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            Optional[HostCircuitBreakers]: Circuit breakers, or None if they are disabled
+        """
+        breaker_config = config["crawl_settings"].get("circuit_breaker", {})
+        
+        if not breaker_config.get("enabled", False):
+            return None
+        
+        return cls(
+            failure_threshold=breaker_config.get("failure_threshold", 5),
+            recovery_time=breaker_config.get("recovery_seconds", 30),
+            max_recovery_time=breaker_config.get("max_recovery_seconds", 600),
+            max_trips=breaker_config.get("max_trips", 5)
+        )
+    
+    def record(self, host: str, success: bool) -> Optional[str]:
+        """
+        Record the outcome of a request to a host.
+        
+        Args:
+            host (str): Host origin
+            success (bool): Whether the host answered without a server error
+            
+        Returns:
+            Optional[str]: CLOSED if the host recovered, OPEN if its circuit opened,
+                GIVEN_UP if it opened max_trips times in a row, otherwise None
+        """
+        breaker = self._breakers.get(host)
+        
+        if success:
+            if breaker is not None and breaker.record_success():
+                return CLOSED
+            return None
+        
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(
+                self.failure_threshold, self.recovery_time, self.max_recovery_time
+            )
+        
+        if not breaker.record_failure():
+            return None
+        
+        self.trips += 1
+        
+        if self.max_trips and breaker.trips >= self.max_trips and host not in self.given_up:
+            self.given_up.add(host)
+            return GIVEN_UP
+        
+        return OPEN
+    
+    def open_until(self, host: str) -> float:
+        """
+        Get the time until which a host's circuit is open.
+        
+        Args:
+            host (str): Host origin
+            
+        Returns:
+            float: Time on the time.monotonic() clock, 0.0 if the circuit is closed
+        """
+        breaker = self._breakers.get(host)
+        
+        return breaker.open_until if breaker is not None else 0.0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the number of circuits opened and the hosts not yet recovered.
+        
+        Returns:
+            Dict[str, Any]: Circuit breaker statistics
+        """
+        return {
+            "trips": self.trips,
+            "open": {
+                host: breaker.state for host, breaker in self._breakers.items()
+                if breaker.trips > 0
+            },
+            "given_up": sorted(self.given_up),
+        }
+
+
+class RetryBudget:
+    """
+    Limits retries to a share of the requests sent, across every URL and host.
+    
+    Requests and retries are counted over a sliding window (exponentially decayed
+    with a half-life of window seconds). A retry is allowed while the retries in
+    the window stay below min_retries plus ratio times the requests, so a few
+    failures are always retried but an outage cannot multiply the load on the
+    hosts that are still up.
+    """
+    
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10, max_attempts: int = 3,
+                 window: float = 60.0):
+        """
+        Initialize the retry budget.
+        
+        Args:
+            ratio (float): Retries allowed per request sent
+            min_retries (int): Retries allowed per window regardless of the ratio
+            max_attempts (int): Attempts per URL, the first one included
+            window (float): Half-life in seconds of the request and retry counts
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.max_attempts = max(1, int(max_attempts))
+        self.window = window
+        
+        self._requests = 0.0
+        self._retries = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        
+        self.retries = 0
+        self.denied = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["RetryBudget"]:
+        """
+        Create the retry budget configured in crawl_settings.circuit_breaker.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            Optional[RetryBudget]: Retry budget, or None if failed fetches are not retried
+        """
+        breaker_config = config["crawl_settings"].get("circuit_breaker", {})
+        max_attempts = breaker_config.get("max_attempts", 1)
+        
+        if not breaker_config.get("enabled", False) or max_attempts <= 1:
+            return None
+        
+        return cls(
+            ratio=breaker_config.get("retry_ratio", 0.1),
+            min_retries=breaker_config.get("min_retries", 10),
+            max_attempts=max_attempts
+        )
+    
+    def _decay(self) -> None:
+        """Age the request and retry counts to the current time."""
+        now = time.monotonic()
+        factor = 0.5 ** ((now - self._updated) / self.window)
+        
+        self._requests *= factor
+        self._retries *= factor
+        self._updated = now
+    
+    def record_request(self) -> None:
+        """Count a request sent, which adds ratio to the budget."""
+        with self._lock:
+            self._decay()
+            self._requests += 1
+    
+    def try_retry(self) -> bool:
+        """
+        Take a retry from the budget.
+        
+        Returns:
+            bool: True if the request may be sent again
+        """
+        with self._lock:
+            self._decay()
+            
+            if self._retries + 1 > self.min_retries + self.ratio * self._requests:
+                self.denied += 1
+                return False
+            
+            self._retries += 1
+            self.retries += 1
+        
+        return True
\ No newline at end of file
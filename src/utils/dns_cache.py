@@ -0,0 +1,345 @@
+"""
+DNS Cache - Cache of host name resolutions for the crawler's connections with background prefetching
+"""
+
+import os
+import socket
+import asyncio
+import time
+import threading
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+# aiohttp is optional - only the async engine resolves through CachedResolver
+try:
+    from aiohttp.abc import AbstractResolver
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AbstractResolver = object
+    AIOHTTP_AVAILABLE = False
+
+
+class DnsCache:
+    """
+    Caches the addresses of the host names the crawler connects to.
+    
+    The cache is not installed process-wide. The pooled HTTP client resolves the
+    hosts of its new connections through lookup(), and the async engine passes it
+    to aiohttp as the connector's resolver (CachedResolver); every other socket of
+    the process, including HTTP/2 connections made by httpx, uses the system
+    resolver. Addresses are kept for ttl seconds and failed lookups for
+    negative_ttl seconds, since the system resolver does not report record TTLs.
+    Hosts can be resolved ahead of time on background threads with prefetch(),
+    and a lookup of a host being prefetched waits for that resolution instead of
+    starting another one.
+    """
+    
+    def __init__(self, ttl: float = 300, negative_ttl: float = 60, max_entries: int = 10000,
+                 prefetch_threads: int = 4):
+        """
+        Initialize the DNS cache.
+        
+        Args:
+            ttl (float): Seconds to keep the addresses of a host
+            negative_ttl (float): Seconds to remember that a host could not be resolved
+            max_entries (int): Maximum number of cached hosts; the oldest are dropped first
+            prefetch_threads (int): Number of threads resolving prefetched hosts
+        """
+        self.logger = logging.getLogger("sheikhbot")
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.prefetch_threads = prefetch_threads
+        
+        # host -> (expires_at, addresses or the resolution error)
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid = os.getpid()
+        
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.prefetches = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["DnsCache"]:
+        """
+        Create the DNS cache configured in crawl_settings.dns_cache.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            Optional[DnsCache]: The cache, or None if it is disabled
+        """
+        dns_config = config["crawl_settings"].get("dns_cache", {})
+        
+        if not dns_config.get("enabled", False):
+            return None
+        
+        return cls(
+            ttl=dns_config.get("ttl_seconds", 300),
+            negative_ttl=dns_config.get("negative_ttl_seconds", 60),
+            max_entries=dns_config.get("max_entries", 10000),
+            prefetch_threads=dns_config.get("prefetch_threads", 4)
+        )
+    
+    def close(self) -> None:
+        """Stop the prefetch threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def _check_fork(self) -> None:
+        """Start over with fresh threads and locks in a forked child process."""
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._lock = threading.Lock()
+            self._pending = {}
+            self._executor = None
+    
+    def _resolve(self, host: str) -> List[tuple]:
+        """
+        Resolve a host name with the system resolver and cache the result.
+        
+        Args:
+            host (str): Host name
+            
+        Returns:
+            List[tuple]: getaddrinfo() results for TCP connections to port 0
+            
+        Raises:
+            socket.gaierror: If the host cannot be resolved
+        """
+        try:
+            addresses = socket.getaddrinfo(host, 0, 0, socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            self._store(host, e, self.negative_ttl)
+            raise
+        
+        self._store(host, addresses, self.ttl)
+        
+        return addresses
+    
+    def _store(self, host: str, value: Any, ttl: float) -> None:
+        """
+        Cache the addresses or resolution error of a host.
+        
+        Args:
+            host (str): Host name
+            value (Any): getaddrinfo() results or the socket.gaierror raised
+            ttl (float): Seconds to keep the entry
+        """
+        with self._lock:
+            self._entries.pop(host, None)
+            self._entries[host] = (time.monotonic() + ttl, value)
+            
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+    
+    def _cached(self, host: str) -> Optional[Any]:
+        """
+        Get the unexpired entry of a host.
+        
+        Args:
+            host (str): Host name
+            
+        Returns:
+            Optional[Any]: getaddrinfo() results or socket.gaierror, or None if the
+                host is not cached
+        """
+        entry = self._entries.get(host)
+        
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        
+        return entry[1]
+    
+    def lookup(self, host: str) -> List[tuple]:
+        """
+        Get the TCP addresses of a host name, resolving it if it is not cached.
+        
+        Args:
+            host (str): Host name; IP addresses are returned without caching
+            
+        Returns:
+            List[tuple]: getaddrinfo() results for TCP connections to port 0
+            
+        Raises:
+            socket.gaierror: If the host cannot be resolved
+        """
+        if _is_ip_address(host):
+            return socket.getaddrinfo(host, 0, 0, socket.SOCK_STREAM)
+        
+        self._check_fork()
+        host = host.lower()
+        
+        with self._lock:
+            value = self._cached(host)
+            pending = self._pending.get(host) if value is None else None
+            
+            if value is not None:
+                if isinstance(value, socket.gaierror):
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+            elif pending is not None:
+                # A prefetch already started the lookup
+                self.hits += 1
+            else:
+                self.misses += 1
+        
+        if value is None:
+            if pending is None:
+                return self._resolve(host)
+            
+            try:
+                value = pending.result()
+            except socket.gaierror as e:
+                value = e
+        
+        if isinstance(value, socket.gaierror):
+            raise socket.gaierror(*value.args)
+        
+        return value
+    
+    def prefetch(self, host: Optional[str]) -> None:
+        """
+        Resolve a host name in the background unless it is cached or being resolved.
+        
+        Args:
+            host (str, optional): Host name of a URL about to be fetched
+        """
+        if not host or _is_ip_address(host):
+            return
+        
+        self._check_fork()
+        host = host.lower()
+        
+        if self._cached(host) is not None:
+            return
+        
+        with self._lock:
+            if host in self._pending:
+                return
+            
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.prefetch_threads,
+                                                    thread_name_prefix="dns-prefetch")
+            
+            future = self._executor.submit(self._resolve, host)
+            self._pending[host] = future
+            self.prefetches += 1
+        
+        future.add_done_callback(lambda _: self._done_prefetching(host))
+    
+    def _done_prefetching(self, host: str) -> None:
+        """
+        Forget a finished background resolution, whose result is cached by now.
+        
+        Args:
+            host (str): Host name
+        """
+        with self._lock:
+            self._pending.pop(host, None)
+    
+    def get_stats(self, since: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Get the cache statistics.
+        
+        Args:
+            since (Dict[str, int], optional): Statistics returned by an earlier call;
+                the counters are then reported relative to them
+                
+        Returns:
+            Dict[str, int]: Hits, misses, hits of failed lookups, prefetched hosts
+                and the number of cached hosts
+        """
+        with self._lock:
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "negative_hits": self.negative_hits,
+                "prefetches": self.prefetches
+            }
+        
+        if since:
+            stats = {key: value - since.get(key, 0) for key, value in stats.items()}
+        
+        stats["entries"] = len(self._entries)
+        
+        return stats
+
+
+class CachedResolver(AbstractResolver):
+    """aiohttp resolver answering the connector's lookups from a DnsCache."""
+    
+    def __init__(self, cache: DnsCache):
+        """
+        Initialize the resolver.
+        
+        Args:
+            cache (DnsCache): Cache the addresses are taken from
+        """
+        self.cache = cache
+    
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        """
+        Resolve a host name for a connection of the connector.
+        
+        Args:
+            host (str): Host name
+            port (int): Port to connect to
+            family (int): Address family, or 0 for any
+            
+        Returns:
+            List[Dict[str, Any]]: Addresses in the format aiohttp connects to
+            
+        Raises:
+            OSError: If the host cannot be resolved
+        """
+        # Uncached hosts are resolved on a thread so the event loop keeps running
+        addresses = await asyncio.get_running_loop().run_in_executor(None, self.cache.lookup, host)
+        
+        results = []
+        for address_family, _, protocol, _, sockaddr in addresses:
+            if family and address_family != family:
+                continue
+            results.append({
+                "hostname": host,
+                "host": sockaddr[0],
+                "port": port,
+                "family": address_family,
+                "proto": protocol,
+                "flags": socket.AI_NUMERICHOST | socket.AI_NUMERICSERV
+            })
+        
+        if not results:
+            raise OSError(f"No addresses of {host} in the requested address family")
+        
+        return results
+    
+    async def close(self) -> None:
+        """The cache outlives the connector, so there is nothing to close."""
+
+
+def _is_ip_address(host: str) -> bool:
+    """
+    Check whether a host is an IP address literal rather than a name.
+    
+    Args:
+        host (str): Host of a URL, without brackets
+        
+    Returns:
+        bool: True for IPv4 and IPv6 addresses
+    """
+    try:
+        ipaddress.ip_address(host.split("%", 1)[0])
+    except ValueError:
+        return False
+    
+    return True
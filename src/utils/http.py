@@ -3,13 +3,44 @@ HTTP utilities for making requests and downloading files.
 """
 
 import os
+import ssl
+import socket
 import requests
 import time
 import random
-from typing import Dict, Any, Optional, Tuple, Union
+import threading
+import weakref
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple, Union, List
 import logging
 from urllib.parse import urlparse
+from email.utils import parsedate_to_datetime
 import hashlib
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from . import user_agents
+from .circuit_breaker import RetryBudget
+from .dns_cache import DnsCache
+
+# brotli is optional - without it servers are not offered br-compressed responses,
+# which urllib3 could not decode
+try:
+    import brotli  # noqa: F401
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+# Content codings every outbound request accepts
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
 
 
 def make_request(
@@ -24,7 +55,8 @@ def make_request(
     retry_delay: float = 1.0,
     verify_ssl: bool = True,
     allow_redirects: bool = True,
-    stream: bool = False
+    stream: bool = False,
+    retry_budget: Optional[RetryBudget] = None
 ) -> requests.Response:
     """
     Make an HTTP request with retries and error handling.
@@ -42,6 +74,8 @@ def make_request(
         verify_ssl (bool): Whether to verify SSL certificates
         allow_redirects (bool): Whether to follow redirects
         stream (bool): Whether to stream the response
+        retry_budget (RetryBudget, optional): Budget shared with other requests that
+            every retry is taken from
         
     Returns:
         requests.Response: HTTP response
@@ -57,9 +91,12 @@ def make_request(
             "User-Agent": user_agents.DEFAULT_USER_AGENT,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br"
+            "Accept-Encoding": ACCEPT_ENCODING
         }
     
+    # Requests share the process's keep-alive connections
+    client = HttpClient.shared()
+    
     # Keep track of attempts
     attempt = 0
     last_error = None
@@ -68,8 +105,11 @@ def make_request(
         try:
             logger.debug(f"Making {method} request to {url} (attempt {attempt + 1}/{retries})")
             
+            if retry_budget is not None:
+                retry_budget.record_request()
+            
             # Make the request
-            response = requests.request(
+            response = client.request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -101,6 +141,10 @@ def make_request(
                     logger.warning(f"Request to {url} failed with status code {status_code}, not retrying")
                     break
             
+            if attempt < retries and retry_budget is not None and not retry_budget.try_retry():
+                logger.warning(f"Retry budget exhausted, not retrying {url}")
+                break
+            
             if attempt < retries:
                 # Add jitter to retry delay to prevent thundering herd
                 jitter = random.uniform(0, 0.5)
@@ -241,4 +285,714 @@ def get_content_type(response: requests.Response) -> str:
     if ";" in content_type:
         content_type = content_type.split(";")[0]
     
-    return content_type.strip().lower()
\ No newline at end of file
+    return content_type.strip().lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+    
+    Args:
+        value (Optional[str]): Header value, either seconds or an HTTP date
+        
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if retry_at is None:
+        return None
+    
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class FetchedResponse:
+    """
+    Minimal response object for fetches made outside of a requests.Session.
+    
+    Mirrors the attributes of requests.Response that the crawler hooks rely on
+    (status_code, headers, content, text, url) so that responses produced by the
+    asynchronous engine can be handled by _handle_response unchanged.
+    """
+    
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        """
+        Initialize the response.
+        
+        Args:
+            url (str): Final URL of the response (after redirects)
+            status_code (int): HTTP status code
+            headers (Dict[str, str]): Response headers
+            content (bytes): Response body
+        """
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = None
+        
+        # Set when the body was cut at the size limit, or not downloaded at all
+        self.truncated = False
+        self.aborted: Optional[str] = None
+        
+        # Pick up the charset from the Content-Type header if present
+        content_type = self.headers.get("Content-Type", "")
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset" and value:
+                self.encoding = value.strip().strip('"\'')
+    
+    @property
+    def text(self) -> str:
+        """
+        Get the response body decoded as text.
+        
+        Returns:
+            str: Decoded response body
+        """
+        try:
+            return self.content.decode(self.encoding or "utf-8", errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+    
+    @property
+    def ok(self) -> bool:
+        """
+        Check whether the status code indicates success.
+        
+        Returns:
+            bool: True for status codes below 400
+        """
+        return self.status_code < 400
+
+
+class ResponseLimits:
+    """
+    Content types a crawler downloads and the largest body it keeps of each.
+    
+    Responses are checked as soon as their headers arrive: a disallowed
+    Content-Type, or a Content-Length above the limit of a type that cannot be
+    truncated, ends the download before any of the body is read. HTML bodies
+    that grow past their limit are cut off and processed as far as they were
+    downloaded; other bodies are dropped.
+    """
+    
+    # Content types whose beginning is still a usable page
+    TRUNCATABLE_TYPES = ("text/html", "application/xhtml+xml")
+    
+    def __init__(self, allowed_content_types: Optional[List[str]] = None,
+                 max_sizes_mb: Optional[Dict[str, float]] = None):
+        """
+        Initialize the response limits.
+        
+        Args:
+            allowed_content_types (List[str], optional): Content types to download,
+                either exact ("text/html") or by main type ("text/*"). Responses
+                without a Content-Type are always downloaded. If empty, every
+                type is allowed.
+            max_sizes_mb (Dict[str, float], optional): Maximum body size in megabytes
+                per content type, exact or by main type, with the limit of every
+                other type under "default"
+        """
+        self.allowed_content_types = {value.lower(): True for value in allowed_content_types or []}
+        
+        max_sizes_mb = {key.lower(): value for key, value in (max_sizes_mb or {}).items()}
+        self.default_max_bytes = int(max_sizes_mb.pop("default", 10) * 1024 * 1024)
+        self.max_bytes = {key: int(value * 1024 * 1024) for key, value in max_sizes_mb.items()}
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["ResponseLimits"]:
+        """
+        Create the response limits configured in crawl_settings.response_limits.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            Optional[ResponseLimits]: The limits, or None if they are disabled
+        """
+        limits_config = config["crawl_settings"].get("response_limits", {})
+        
+        if not limits_config.get("enabled", False):
+            return None
+        
+        return cls(limits_config.get("allowed_content_types"), limits_config.get("max_size_mb"))
+    
+    def _lookup(self, content_type: str, values: Dict[str, Any]) -> Optional[Any]:
+        """
+        Find the entry for a content type, exact or by its main type.
+        
+        Args:
+            content_type (str): Lowercase content type without parameters
+            values (Dict[str, Any]): Entries keyed by content type or "type/*"
+            
+        Returns:
+            Optional[Any]: The matching entry, or None
+        """
+        if content_type in values:
+            return values[content_type]
+        
+        return values.get(content_type.split("/")[0] + "/*")
+    
+    def check(self, headers: Dict[str, str]) -> Optional[str]:
+        """
+        Decide from the response headers whether the body should be downloaded.
+        
+        Args:
+            headers (Dict[str, str]): Response headers
+            
+        Returns:
+            Optional[str]: Why the download is aborted, or None to download the body
+        """
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        
+        if content_type and self.allowed_content_types:
+            if not self._lookup(content_type, self.allowed_content_types):
+                return f"Content-Type {content_type} is not allowed"
+        
+        max_bytes, truncate = self.body_limit(headers)
+        content_length = headers.get("Content-Length", "")
+        
+        if not truncate and content_length.isdigit() and int(content_length) > max_bytes:
+            return f"Content-Length {content_length} exceeds the limit of {max_bytes} bytes"
+        
+        return None
+    
+    def body_limit(self, headers: Dict[str, str]) -> Tuple[int, bool]:
+        """
+        Get the size limit of a response body.
+        
+        Args:
+            headers (Dict[str, str]): Response headers
+            
+        Returns:
+            Tuple[int, bool]: (max_bytes, truncate) where truncate tells whether a
+                larger body is cut off at max_bytes instead of being dropped
+        """
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        max_bytes = self._lookup(content_type, self.max_bytes)
+        
+        if max_bytes is None:
+            max_bytes = self.default_max_bytes
+        
+        return max_bytes, content_type in self.TRUNCATABLE_TYPES
+    
+    def read(self, response: requests.Response, chunk_size: int = 65536) -> FetchedResponse:
+        """
+        Download the body of a streamed response within the limits and close it.
+        
+        Args:
+            response (requests.Response): Response of a request made with stream=True
+            chunk_size (int): Number of bytes to read at a time
+            
+        Returns:
+            FetchedResponse: The response with the downloaded body, marked as
+                truncated or aborted if the limits were hit
+        """
+        body = LimitedBody(self, response.headers)
+        
+        try:
+            if body.aborted is None:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not body.add(chunk):
+                        break
+        finally:
+            # Closing a partly read response drops the connection, ending the download
+            response.close()
+        
+        return body.response(response.url, response.status_code, response.headers)
+
+
+class LimitedBody:
+    """
+    Collects a response body chunk by chunk within the limits of its content type.
+    
+    Used by every client the crawler fetches with, so the limits behave the same
+    whichever library downloads the body.
+    """
+    
+    def __init__(self, limits: ResponseLimits, headers: Dict[str, str]):
+        """
+        Initialize the body from the response headers.
+        
+        Args:
+            limits (ResponseLimits): Limits to apply
+            headers (Dict[str, str]): Response headers
+        """
+        # Why the body is not downloaded, or None while it is wanted
+        self.aborted = limits.check(headers)
+        self.max_bytes, self.truncate = limits.body_limit(headers)
+        self.truncated = False
+        self._chunks = []
+        self._size = 0
+    
+    def add(self, chunk: bytes) -> bool:
+        """
+        Add a downloaded chunk.
+        
+        Args:
+            chunk (bytes): Next part of the body
+            
+        Returns:
+            bool: False if the limit was reached and no more should be read
+        """
+        self._size += len(chunk)
+        
+        if self._size > self.max_bytes:
+            if self.truncate:
+                self._chunks.append(chunk[:len(chunk) - (self._size - self.max_bytes)])
+                self.truncated = True
+            else:
+                self.aborted = f"Body exceeds the limit of {self.max_bytes} bytes"
+            return False
+        
+        self._chunks.append(chunk)
+        
+        return True
+    
+    def response(self, url: str, status_code: int, headers: Dict[str, str]) -> FetchedResponse:
+        """
+        Build the response with the collected body.
+        
+        Args:
+            url (str): Final URL of the response
+            status_code (int): HTTP status code
+            headers (Dict[str, str]): Response headers
+            
+        Returns:
+            FetchedResponse: The response, marked as truncated or aborted if the
+                limits were hit
+        """
+        fetched = FetchedResponse(url, status_code, dict(headers),
+                                  b"".join(self._chunks) if self.aborted is None else b"")
+        fetched.truncated = self.truncated
+        fetched.aborted = self.aborted
+        
+        return fetched
+
+
+# Requests sent, connections opened and TLS sessions resumed by the pooled client
+# in this process
+_pool_counts = Counter()
+_pool_counts_lock = threading.Lock()
+
+# Client shared by the process, if created
+_shared_client: Optional["HttpClient"] = None
+
+
+def _count(key: str) -> None:
+    """
+    Increment a connection pool counter.
+    
+    Args:
+        key (str): Counter name
+    """
+    with _pool_counts_lock:
+        _pool_counts[key] += 1
+
+
+class _CountingConnection:
+    """
+    Connection mixin counting every connection opened, including reconnects, and
+    resolving the host through the client's DNS cache.
+    """
+    
+    def __init__(self, *args, dns_cache: Optional[DnsCache] = None, **kwargs):
+        self.dns_cache = dns_cache
+        super().__init__(*args, **kwargs)
+    
+    def connect(self):
+        _count("connections")
+        return super().connect()
+    
+    def _new_conn(self):
+        if self.dns_cache is None:
+            return super()._new_conn()
+        
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.lookup(host)
+        except socket.gaierror as e:
+            raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+        
+        # The socket connects to _dns_host; the Host header, SNI and certificate
+        # checks keep using the host name. Addresses are tried in order, like
+        # the system resolver's results would be.
+        error = None
+        try:
+            for address in dict.fromkeys(sockaddr[0] for *_, sockaddr in addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except ConnectTimeoutError as e:
+                    error = e
+        finally:
+            self._dns_host = host
+        
+        raise error
+
+
+class _CountingHTTPConnection(_CountingConnection, HTTPConnection):
+    pass
+
+
+class _CountingHTTPSConnection(_CountingConnection, HTTPSConnection):
+    pass
+
+
+class _CountingPool:
+    """Connection pool mixin counting the requests sent."""
+    
+    def urlopen(self, *args, **kwargs):
+        _count("requests")
+        return super().urlopen(*args, **kwargs)
+
+
+class _CountingHTTPConnectionPool(_CountingPool, HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(_CountingPool, HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class _TlsSessionContext(ssl.SSLContext):
+    """
+    SSL context offering new connections the TLS session of the last one to the host.
+    
+    Python does not resume client sessions on its own. TLS 1.3 servers send their
+    session tickets after the handshake, so the session is read from the previous
+    connection while it is still open, and kept for when it is gone.
+    """
+    
+    def setup(self, max_hosts: int, ca_location: str) -> None:
+        """
+        Initialize the session cache and load the trusted certificates.
+        
+        Args:
+            max_hosts (int): Maximum number of hosts whose sessions are kept
+            ca_location (str): CA bundle file or directory certificates are verified with
+        """
+        self.max_hosts = max_hosts
+        self.minimum_version = ssl.TLSVersion.TLSv1_2
+        self.set_alpn_protocols(["http/1.1"])
+        
+        if os.path.isdir(ca_location):
+            self.load_verify_locations(capath=ca_location)
+        else:
+            self.load_verify_locations(cafile=ca_location)
+        
+        # host -> (last session, weak reference to the socket it came from)
+        self._sessions: Dict[str, Tuple[Optional[ssl.SSLSession], Any]] = {}
+        self._sessions_lock = threading.Lock()
+    
+    def _session_for(self, host: str) -> Optional[ssl.SSLSession]:
+        """
+        Get the session to resume for a host.
+        
+        Args:
+            host (str): Server host name
+            
+        Returns:
+            Optional[ssl.SSLSession]: Session of the last connection, or None
+        """
+        with self._sessions_lock:
+            entry = self._sessions.get(host)
+        
+        if entry is None:
+            return None
+        
+        session, socket_ref = entry
+        sock = socket_ref()
+        
+        # A session read once the connection carried data includes its tickets
+        if sock is not None and sock.session is not None:
+            session = sock.session
+        
+        return session
+    
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        if session is None and server_hostname:
+            session = self._session_for(server_hostname)
+        
+        ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session,
+                                       **kwargs)
+        
+        _count("tls_handshakes")
+        if ssl_sock.session_reused:
+            _count("tls_resumed")
+        
+        if server_hostname:
+            with self._sessions_lock:
+                self._sessions.pop(server_hostname, None)
+                self._sessions[server_hostname] = (ssl_sock.session, weakref.ref(ssl_sock))
+                
+                while len(self._sessions) > self.max_hosts:
+                    del self._sessions[next(iter(self._sessions))]
+        
+        return ssl_sock
+
+
+class _PooledAdapter(HTTPAdapter):
+    """Transport adapter whose keep-alive pools are shared by every session of a client."""
+    
+    def __init__(self, client: "HttpClient"):
+        """
+        Initialize the adapter.
+        
+        Args:
+            client (HttpClient): Client owning the adapter
+        """
+        self.client = client
+        self._pid = os.getpid()
+        super().__init__(pool_connections=client.pool_connections, pool_maxsize=client.pool_maxsize)
+    
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool
+        }
+    
+    def cert_verify(self, conn, url, verify, cert):
+        super().cert_verify(conn, url, verify, cert)
+        
+        # Called with the pool of every request; its new connections resolve
+        # through the client's DNS cache
+        conn.conn_kw["dns_cache"] = self.client.dns_cache
+        
+        if not url.lower().startswith("https"):
+            return
+        
+        # Verified connections resume TLS sessions; the context has the CA bundle
+        # loaded already
+        context = self.client._tls_context(verify)
+        if context is not None:
+            conn.conn_kw["ssl_context"] = context
+            conn.ca_certs = None
+            conn.ca_cert_dir = None
+        else:
+            conn.conn_kw.pop("ssl_context", None)
+    
+    def send(self, request, *args, **kwargs):
+        # A forked process must not share the parent's sockets
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self.init_poolmanager(self._pool_connections, self._pool_maxsize, self._pool_block)
+        
+        return super().send(request, *args, **kwargs)
+    
+    def close(self):
+        # Sessions come and go; the pools live as long as the client
+        if self.client.closed:
+            super().close()
+
+
+class HttpClient:
+    """
+    Process-wide HTTP client with keep-alive connection pools for all outbound requests.
+    
+    Crawler sessions, robots.txt and sitemap fetches, IndexNow submissions,
+    make_request() and the scripts all send their requests through the same pools,
+    which keep up to pool_maxsize idle connections open for each of
+    pool_connections hosts. New TLS connections resume the session of the last
+    connection to the host, saving a full handshake, and responses are decoded
+    from gzip, deflate and, with brotli installed, br. With a DNS cache, new
+    connections look up their host in it. Pool efficiency is reported by
+    get_stats().
+    """
+    
+    def __init__(self, pool_connections: int = 100, pool_maxsize: int = 10,
+                 tls_session_reuse: bool = True, dns_cache: Optional[DnsCache] = None):
+        """
+        Initialize the HTTP client.
+        
+        Args:
+            pool_connections (int): Number of hosts whose connections are kept open
+            pool_maxsize (int): Maximum number of idle connections kept per host
+            tls_session_reuse (bool): Whether new TLS connections resume earlier sessions
+            dns_cache (DnsCache, optional): Cache new connections resolve their host with
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.tls_session_reuse = tls_session_reuse
+        self.dns_cache = dns_cache
+        self.closed = False
+        
+        # One SSL context, with its TLS sessions, per CA bundle requests verify with
+        self._tls_contexts: Dict[str, _TlsSessionContext] = {}
+        self._tls_lock = threading.Lock()
+        
+        self.adapter = _PooledAdapter(self)
+        self._session: Optional[requests.Session] = None
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "HttpClient":
+        """
+        Get the process-wide client, creating it from crawl_settings.http_client
+        and crawl_settings.dns_cache.
+        
+        The first configuration of a process decides the pool sizes and the DNS
+        cache, and later ones share the client.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            HttpClient: The shared client
+        """
+        global _shared_client
+        
+        if _shared_client is None:
+            client_config = config["crawl_settings"].get("http_client", {})
+            _shared_client = cls(
+                pool_connections=client_config.get("pool_connections", 100),
+                pool_maxsize=client_config.get("pool_maxsize", 10),
+                tls_session_reuse=client_config.get("tls_session_reuse", True),
+                dns_cache=DnsCache.from_config(config)
+            )
+        
+        return _shared_client
+    
+    @classmethod
+    def shared(cls) -> "HttpClient":
+        """
+        Get the process-wide client, creating it with the default settings if needed.
+        
+        Returns:
+            HttpClient: The shared client
+        """
+        global _shared_client
+        
+        if _shared_client is None:
+            _shared_client = cls()
+        
+        return _shared_client
+    
+    def _tls_context(self, verify: Union[bool, str]) -> Optional[_TlsSessionContext]:
+        """
+        Get the session-resuming SSL context for a requests verify setting.
+        
+        Args:
+            verify (Union[bool, str]): True for the default CA bundle, or the path of
+                a CA bundle; False when certificates are not verified
+                
+        Returns:
+            Optional[_TlsSessionContext]: The context, or None if TLS sessions are not
+                reused for such connections
+        """
+        if not self.tls_session_reuse or not verify:
+            return None
+        
+        ca_location = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        
+        with self._tls_lock:
+            context = self._tls_contexts.get(ca_location)
+            
+            if context is None:
+                context = _TlsSessionContext(ssl.PROTOCOL_TLS_CLIENT)
+                context.setup(self.pool_connections, ca_location)
+                self._tls_contexts[ca_location] = context
+        
+        return context
+    
+    def session(self) -> requests.Session:
+        """
+        Create a session sending its requests through the client's pools.
+        
+        Sessions keep their own headers and cookies, so every crawler has one.
+        
+        Returns:
+            requests.Session: New session
+        """
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        
+        return session
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request with the client's default session.
+        
+        Args:
+            method (str): HTTP method
+            url (str): URL to request
+            **kwargs: Arguments of requests.Session.request()
+            
+        Returns:
+            requests.Response: HTTP response
+        """
+        if self._session is None:
+            self._session = self.session()
+        
+        return self._session.request(method, url, **kwargs)
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a GET request with the client's default session.
+        
+        Args:
+            url (str): URL to request
+            **kwargs: Arguments of requests.Session.request()
+            
+        Returns:
+            requests.Response: HTTP response
+        """
+        return self.request("GET", url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        Send a POST request with the client's default session.
+        
+        Args:
+            url (str): URL to request
+            **kwargs: Arguments of requests.Session.request()
+            
+        Returns:
+            requests.Response: HTTP response
+        """
+        return self.request("POST", url, **kwargs)
+    
+    def get_stats(self, since: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Get the connection pool statistics of the process.
+        
+        Args:
+            since (Dict[str, int], optional): Statistics returned by an earlier call;
+                the counters are then reported relative to them
+                
+        Returns:
+            Dict[str, int]: Requests sent, connections opened, requests sent over a
+                reused connection, and the TLS handshakes and resumed sessions of
+                verified connections
+        """
+        with _pool_counts_lock:
+            stats = {key: _pool_counts[key]
+                     for key in ("requests", "connections", "tls_handshakes", "tls_resumed")}
+        
+        if since:
+            stats = {key: value - since.get(key, 0) for key, value in stats.items()}
+        
+        stats["reused"] = max(0, stats["requests"] - stats["connections"])
+        
+        return stats
+    
+    def close(self) -> None:
+        """Close every pooled connection."""
+        self.closed = True
+        self.adapter.close()
+        
+        if self.dns_cache is not None:
+            self.dns_cache.close()
\ No newline at end of file
@@ -16,7 +16,7 @@ import urllib.parse
 from typing import List, Dict, Any, Union, Optional
 from pathlib import Path
 
-import requests
+from .http import HttpClient
 
 logger = logging.getLogger(__name__)
 
@@ -157,7 +157,7 @@ class IndexNowClient:
         logger.debug(f"Submitting URL to {search_engine}: {url}")
         
         try:
-            response = requests.post(
+            response = HttpClient.shared().post(
                 endpoint,
                 json=payload,
                 headers={"Content-Type": "application/json; charset=utf-8"},
@@ -264,7 +264,7 @@ class IndexNowClient:
         logger.debug(f"Bulk submitting {len(urls)} URLs to {search_engine}")
         
         try:
-            response = requests.post(
+            response = HttpClient.shared().post(
                 endpoint,
                 json=payload,
                 headers={"Content-Type": "application/json; charset=utf-8"},
@@ -309,7 +309,7 @@ class IndexNowClient:
             key_location = self._get_key_location(url)
         
         try:
-            response = requests.get(key_location, timeout=30)
+            response = HttpClient.shared().get(key_location, timeout=30)
             status_code = response.status_code
             
             if status_code == 200:
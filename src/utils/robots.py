@@ -2,13 +2,149 @@
 Robots.txt parser for respecting robots exclusion protocol.
 """
 
-import requests
 import time
-from urllib.parse import urlparse, urljoin
-from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse, urlsplit, urljoin
+from typing import Dict, List, Optional, Set, Tuple
 import re
 import logging
 
+from .http import HttpClient
+
+# Keys of the rules stored at a node of RobotsMatcher's trie. Other keys are
+# single characters.
+_PREFIX_RULE = 0
+_EXACT_RULE = 1
+_WILDCARD_RULES = 2
+
+
+class RobotsMatcher:
+    """
+    Allow and disallow rules of one robots.txt, compiled for matching URL paths.
+    
+    Rules are matched with the longest-match semantics of RFC 9309: the rule with
+    the most characters that matches the path decides, and an allow rule wins a tie
+    with a disallow rule. A '*' in a rule matches any sequence of characters and a
+    '$' at its end anchors it to the end of the path.
+    
+    Rules are kept in a character trie that is walked once along the path. Rules
+    without '*' end at a node of the trie, so their cost does not grow with their
+    number. Rules with '*' are stored at the node of the literal part before their
+    first '*', as one precompiled regex per node whose alternatives are ordered from
+    the most to the least specific rule, so a path only tries the patterns whose
+    literal prefix it starts with.
+    """
+    
+    def __init__(self, allow: Set[str], disallow: Set[str]):
+        """
+        Compile the rules.
+        
+        Args:
+            allow (Set[str]): Paths of the Allow rules
+            disallow (Set[str]): Paths of the Disallow rules
+        """
+        self._trie: Dict = {}
+        
+        # Wildcard rules by the literal part before their first '*'
+        wildcard_rules: Dict[str, List[Tuple[int, bool, str]]] = {}
+        
+        for rules, allowed in ((disallow, False), (allow, True)):
+            for rule in rules:
+                if "*" in rule:
+                    prefix, _, rest = rule.partition("*")
+                    wildcard_rules.setdefault(prefix, []).append((len(rule), allowed, "*" + rest))
+                    continue
+                
+                if rule.endswith("$"):
+                    node, kind = self._node(rule[:-1]), _EXACT_RULE
+                else:
+                    node, kind = self._node(rule), _PREFIX_RULE
+                
+                # An allow rule wins over a disallow rule of the same path
+                node[kind] = max(node.get(kind, (0, False)), (len(rule), allowed))
+        
+        for prefix, rules in wildcard_rules.items():
+            # Most specific first, so that the regex returns the longest match
+            rules.sort(reverse=True)
+            
+            regex = re.compile("|".join(f"({self._translate(rest)})" for _, _, rest in rules), re.DOTALL)
+            self._node(prefix)[_WILDCARD_RULES] = (regex, [(length, allowed) for length, allowed, _ in rules])
+    
+    def _node(self, path: str) -> Dict:
+        """
+        Get the trie node of a literal path, adding it if needed.
+        
+        Args:
+            path (str): Literal path
+            
+        Returns:
+            Dict: Trie node
+        """
+        node = self._trie
+        for char in path:
+            node = node.setdefault(char, {})
+        
+        return node
+    
+    @staticmethod
+    def _translate(rule: str) -> str:
+        """
+        Translate (the rest of) a rule with wildcards to a regex.
+        
+        Args:
+            rule (str): Rule path
+            
+        Returns:
+            str: Regex pattern matching at the start of the text
+        """
+        anchored = rule.endswith("$")
+        if anchored:
+            rule = rule[:-1]
+        
+        pattern = ".*".join(re.escape(part) for part in rule.split("*"))
+        
+        return pattern + r"\Z" if anchored else pattern
+    
+    def is_allowed(self, path: str) -> bool:
+        """
+        Check whether the rules allow a path.
+        
+        Args:
+            path (str): URL path, with the query string if any
+            
+        Returns:
+            bool: True if no rule matches or the longest match is an allow rule
+        """
+        best = (0, True)
+        
+        # Walk the trie along the path, keeping the longest rule that matches
+        node = self._trie
+        depth = 0
+        while True:
+            rule = node.get(_PREFIX_RULE)
+            if rule is not None and rule > best:
+                best = rule
+            
+            wildcards = node.get(_WILDCARD_RULES)
+            if wildcards is not None:
+                match = wildcards[0].match(path, depth)
+                if match is not None:
+                    rule = wildcards[1][match.lastindex - 1]
+                    if rule > best:
+                        best = rule
+            
+            if depth == len(path):
+                rule = node.get(_EXACT_RULE)
+                if rule is not None and rule > best:
+                    best = rule
+                break
+            
+            node = node.get(path[depth])
+            if node is None:
+                break
+            depth += 1
+        
+        return best[1]
+
 
 class RobotsTxtParser:
     """Parser for robots.txt files that handles the robots exclusion protocol."""
@@ -45,7 +181,7 @@ class RobotsTxtParser:
         self.logger.info(f"Fetching robots.txt from {robots_url}")
         
         try:
-            response = requests.get(
+            response = HttpClient.shared().get(
                 robots_url,
                 headers={"User-Agent": user_agent},
                 timeout=10
@@ -214,88 +350,76 @@ class RobotsTxtParser:
         Returns:
             bool: True if allowed, False if disallowed
         """
-        parsed_url = urlparse(url)
+        parsed_url = urlsplit(url)
         robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
         
         # Ensure we have fetched the robots.txt
         if robots_url not in self.robots_cache:
             self.fetch(robots_url, user_agent)
         
-        # Extract the path from the URL
-        path = parsed_url.path
-        if not path:
-            path = "/"
-        
-        # Get the stored rules
-        rules = self.robots_cache[robots_url]["data"]
-        
-        # Check if the path matches any disallow rule
-        is_disallowed = False
-        most_specific_disallow = ""
-        
-        for disallow_path in rules["disallow"]:
-            if self._path_matches(path, disallow_path) and len(disallow_path) > len(most_specific_disallow):
-                most_specific_disallow = disallow_path
-                is_disallowed = True
-        
-        # Check if the path matches any allow rule
-        most_specific_allow = ""
-        
-        for allow_path in rules["allow"]:
-            if self._path_matches(path, allow_path) and len(allow_path) > len(most_specific_allow):
-                most_specific_allow = allow_path
+        # Rules are matched against the path and the query string
+        path = parsed_url.path or "/"
+        if parsed_url.query:
+            path = f"{path}?{parsed_url.query}"
         
-        # Allow has precedence over disallow if it's more specific
-        if is_disallowed and len(most_specific_allow) > len(most_specific_disallow):
-            return True
-        
-        return not is_disallowed
-    
-    def _path_matches(self, url_path: str, rule_path: str) -> bool:
-        """
-        Check if a URL path matches a robots.txt rule path.
+        # Compile the rules on the first check of the host
+        cache_entry = self.robots_cache[robots_url]
+        matcher = cache_entry.get("matcher")
+        if matcher is None:
+            rules = cache_entry["data"]
+            matcher = cache_entry["matcher"] = RobotsMatcher(rules["allow"], rules["disallow"])
         
-        Args:
-            url_path (str): Path from the URL
-            rule_path (str): Path from robots.txt rule
-            
-        Returns:
-            bool: True if they match
-        """
-        # Handle wildcards in the rule path
-        if '*' in rule_path:
-            # Convert the rule path to a regex pattern
-            pattern = rule_path.replace('.', '\\.')
-            pattern = pattern.replace('*', '.*')
-            pattern = '^' + pattern + '.*$'
-            return bool(re.match(pattern, url_path))
-        else:
-            # Simple prefix matching
-            return url_path.startswith(rule_path)
+        return matcher.is_allowed(path)
     
-    def get_crawl_delay(self, user_agent: str) -> Optional[float]:
+    def get_crawl_delay(self, user_agent: str, url: Optional[str] = None) -> Optional[float]:
         """
         Get the crawl delay for a site based on robots.txt.
         
         Args:
             user_agent (str): User-Agent to check rules for
+            url (str, optional): Any URL on the site to get the crawl delay for.
+                If None, uses the first cached robots.txt.
             
         Returns:
             Optional[float]: Crawl delay in seconds, or None if not specified
         """
+        if url is not None:
+            parsed_url = urlparse(url)
+            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
+            
+            cache_entry = self.robots_cache.get(robots_url)
+            if cache_entry is None:
+                return None
+            
+            return cache_entry["data"]["crawl_delay"]
+        
         for robots_url, cache_entry in self.robots_cache.items():
             rules = cache_entry["data"]
             return rules["crawl_delay"]
         
         return None
     
-    def get_sitemaps(self) -> List[str]:
+    def get_sitemaps(self, url: Optional[str] = None) -> List[str]:
         """
         Get sitemaps listed in robots.txt.
         
+        Args:
+            url (str, optional): Any URL on the site to get the sitemaps for.
+                If None, returns the sitemaps of every cached robots.txt.
+                
         Returns:
             List[str]: List of sitemap URLs
         """
+        if url is not None:
+            parsed_url = urlparse(url)
+            robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
+            
+            cache_entry = self.robots_cache.get(robots_url)
+            if cache_entry is None:
+                return []
+            
+            return list(cache_entry["data"]["sitemaps"])
+        
         sitemaps = []
         
         for robots_url, cache_entry in self.robots_cache.items():
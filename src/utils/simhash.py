@@ -0,0 +1,159 @@
+"""
+SimHash - Page fingerprints and a Hamming-distance index for near-duplicate detection
+"""
+
+import re
+import hashlib
+from collections import Counter
+from typing import Dict, List, Tuple, Optional, Any
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words.
+    
+    Args:
+        text (str): Text of a page
+        
+    Returns:
+        List[str]: Words in document order
+    """
+    return _WORD.findall(text.lower())
+
+
+def simhash(tokens: List[str], shingle_size: int = 3) -> int:
+    """
+    Get the 64-bit SimHash fingerprint of a token sequence.
+    
+    Every run of shingle_size consecutive words is hashed and votes on each of the
+    64 bits with its number of occurrences. Pages sharing most of their shingles
+    get fingerprints that differ in only a few bits.
+    
+    Args:
+        tokens (List[str]): Words of the page, as returned by tokenize()
+        shingle_size (int): Number of words per shingle
+        
+    Returns:
+        int: 64-bit fingerprint
+    """
+    if len(tokens) < shingle_size:
+        shingles = Counter([" ".join(tokens)])
+    else:
+        shingles = Counter(map(" ".join, zip(*(tokens[i:] for i in range(shingle_size)))))
+    
+    # Every shingle's 8-byte digest is repeated by its weight; counting the byte
+    # values at each position then takes the 64 bit votes once per distinct byte
+    digests = b"".join(
+        hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() * weight
+        for shingle, weight in shingles.items()
+    )
+    total = len(digests) // 8
+    
+    votes = [0] * 64
+    for position in range(8):
+        for byte, count in Counter(digests[position::8]).items():
+            for bit in range(8):
+                if byte >> bit & 1:
+                    votes[position * 8 + bit] += count
+    
+    # A bit is set if more than half of the weight voted for it
+    fingerprint = 0
+    for bit, vote in enumerate(votes):
+        if 2 * vote > total:
+            fingerprint |= 1 << bit
+    
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Get the number of bits in which two fingerprints differ.
+    
+    Args:
+        a (int): First fingerprint
+        b (int): Second fingerprint
+        
+    Returns:
+        int: Hamming distance
+    """
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """
+    Finds fingerprints within a Hamming distance of max_distance of a new one.
+    
+    The 64 bits are split into max_distance + 1 blocks, and one table per block maps
+    the block's value to the fingerprints having it. Two fingerprints that differ in
+    at most max_distance bits agree on at least one whole block, so a lookup only
+    compares the fingerprints in one bucket per table instead of every fingerprint.
+    """
+    
+    def __init__(self, max_distance: int = 3):
+        """
+        Initialize the index.
+        
+        Args:
+            max_distance (int): Largest Hamming distance counted as a near-duplicate
+        """
+        self.max_distance = max_distance
+        
+        # (shift, mask) of each block
+        blocks = max_distance + 1
+        bounds = [64 * i // blocks for i in range(blocks + 1)]
+        self._blocks: List[Tuple[int, int]] = [
+            (start, (1 << (end - start)) - 1) for start, end in zip(bounds, bounds[1:])
+        ]
+        
+        self._tables: List[Dict[int, List[Tuple[int, Any]]]] = [{} for _ in self._blocks]
+        self._count = 0
+    
+    def __len__(self) -> int:
+        """
+        Get the number of fingerprints in the index.
+        
+        Returns:
+            int: Number of fingerprints
+        """
+        return self._count
+    
+    def add(self, fingerprint: int, key: Any) -> None:
+        """
+        Add a fingerprint.
+        
+        Args:
+            fingerprint (int): 64-bit fingerprint
+            key (Any): Value returned by find() for near-duplicates, e.g. the page URL
+        """
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            table.setdefault(fingerprint >> shift & mask, []).append((fingerprint, key))
+        
+        self._count += 1
+    
+    def find(self, fingerprint: int) -> Optional[Any]:
+        """
+        Find the closest indexed fingerprint within max_distance.
+        
+        Args:
+            fingerprint (int): 64-bit fingerprint
+            
+        Returns:
+            Optional[Any]: Key of the closest fingerprint, or None if there is none
+        """
+        best_key = None
+        best_distance = self.max_distance + 1
+        
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            for candidate, key in table.get(fingerprint >> shift & mask, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                
+                if distance < best_distance:
+                    best_key = key
+                    best_distance = distance
+                    
+                    if distance == 0:
+                        return best_key
+        
+        return best_key
\ No newline at end of file
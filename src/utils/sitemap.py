@@ -1,10 +1,82 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Optional
 from datetime import datetime
 import os
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 import logging
 
+SITEMAP_NAMESPACE = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+
+def parse_sitemap(content: bytes) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Parse a sitemap or sitemap index document.
+    
+    Args:
+        content: Raw XML content of the sitemap
+        
+    Returns:
+        Tuple[List[Dict[str, Any]], List[str]]: (entries, child_sitemaps) where each entry
+            has "loc", "lastmod", "changefreq" and "priority" keys, and child_sitemaps
+            lists the sitemaps referenced by a sitemap index
+    """
+    root = ET.fromstring(content)
+    
+    entries = []
+    child_sitemaps = []
+    
+    for element in root:
+        tag = element.tag.replace(SITEMAP_NAMESPACE, "")
+        fields = {child.tag.replace(SITEMAP_NAMESPACE, ""): (child.text or "").strip() for child in element}
+        
+        if not fields.get("loc"):
+            continue
+        
+        if tag == "sitemap":
+            child_sitemaps.append(fields["loc"])
+        elif tag == "url":
+            try:
+                priority = float(fields["priority"]) if fields.get("priority") else None
+            except ValueError:
+                priority = None
+            
+            entries.append({
+                "loc": fields["loc"],
+                "lastmod": fields.get("lastmod") or None,
+                "changefreq": fields.get("changefreq") or None,
+                "priority": priority
+            })
+    
+    return entries, child_sitemaps
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a sitemap lastmod value into a timestamp.
+    
+    Args:
+        value: W3C datetime such as "2024-05-01" or "2024-05-01T10:00:00+00:00".
+            Values without a timezone, like the crawl times SitemapGenerator writes,
+            are taken as local time.
+            
+    Returns:
+        Optional[float]: Seconds since the epoch, or None if the value is missing or invalid
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+
+    # datetime.fromisoformat() only accepts a "Z" suffix from Python 3.11 on
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
 class SitemapGenerator:
     """Generate and manage XML sitemaps for crawled pages."""
     
@@ -0,0 +1,344 @@
+"""
+Transports - Pluggable HTTP clients for the crawler fetch path
+"""
+
+from collections import Counter
+from typing import Dict, Any, Optional, Set
+from urllib.parse import urlsplit
+import logging
+
+import requests
+
+from .http import FetchedResponse, LimitedBody, ResponseLimits
+
+# httpx and h2 are optional - without them the crawler fetches over HTTP/1.1
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HTTP2_AVAILABLE = HTTPX_AVAILABLE
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class RequestsTransport:
+    """Fetches pages over HTTP/1.1 with the crawler's requests.Session."""
+    
+    # Whether the async engine can fetch through this transport
+    supports_async = False
+    
+    def __init__(self, session: requests.Session):
+        """
+        Initialize the transport.
+        
+        Args:
+            session (requests.Session): Session with the crawler's headers and pools
+        """
+        self.session = session
+        self.protocols = Counter()
+    
+    def fetch(self, url: str, headers: Dict[str, str], timeout: float, allow_redirects: bool = True,
+              verify: bool = True, limits: Optional[ResponseLimits] = None):
+        """
+        Fetch a URL.
+        
+        Args:
+            url (str): URL to fetch
+            headers (Dict[str, str]): Headers to send in addition to the session headers
+            timeout (float): Request timeout in seconds
+            allow_redirects (bool): Whether to follow redirects
+            verify (bool): Whether to verify TLS certificates
+            limits (ResponseLimits, optional): Limits the body is downloaded within
+            
+        Returns:
+            requests.Response or FetchedResponse: The response; a FetchedResponse
+                when the body was downloaded within limits
+                
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        response = self.session.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            allow_redirects=allow_redirects,
+            verify=verify,
+            stream=limits is not None
+        )
+        version = getattr(response.raw, "version", 11)
+        self.protocols[f"HTTP/{version // 10}.{version % 10}"] += 1
+        
+        if limits is not None:
+            response = limits.read(response)
+        
+        return response
+    
+    def close(self) -> None:
+        """Release the transport's connections (the session stays usable)."""
+
+
+class Http2Transport:
+    """
+    Fetches pages with httpx over HTTP/2, multiplexing requests to a host over one connection.
+    
+    HTTP/2 is negotiated with TLS ALPN, so hosts that only speak HTTP/1.1, and
+    plain http:// URLs, are fetched over HTTP/1.1 by the same client. A host
+    whose HTTP/2 connection fails with a protocol error is fetched over
+    HTTP/1.1 from then on. Errors are raised as requests exceptions, so
+    callers handle both transports the same way.
+    """
+    
+    supports_async = True
+    
+    def __init__(self, session: requests.Session, max_connections: int = 100,
+                 max_keepalive_connections: int = 20, verify: bool = True,
+                 prior_knowledge: bool = False):
+        """
+        Initialize the transport.
+        
+        Args:
+            session (requests.Session): Session whose headers are sent with every
+                request and which fetches from hosts that fail over HTTP/2
+            max_connections (int): Maximum number of open connections
+            max_keepalive_connections (int): Maximum number of idle connections kept open
+            verify (bool): Whether to verify TLS certificates
+            prior_knowledge (bool): Speak HTTP/2 without negotiation, also over
+                plain http:// (h2c), for servers known to support it
+        """
+        self.logger = logging.getLogger("sheikhbot")
+        self.session = session
+        self.fallback = RequestsTransport(session)
+        self.verify = verify
+        self.prior_knowledge = prior_knowledge
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections)
+        
+        self.protocols = self.fallback.protocols
+        self._http1_hosts: Set[str] = set()
+        self._client: Optional["httpx.Client"] = None
+        self._async_client: Optional["httpx.AsyncClient"] = None
+        self._async_http1: Optional["httpx.AsyncClient"] = None
+    
+    def _new_client(self, client_class, http2: bool = True):
+        """
+        Create an httpx client with the transport's settings.
+        
+        Args:
+            client_class (type): httpx.Client or httpx.AsyncClient
+            http2 (bool): Whether the client speaks HTTP/2
+            
+        Returns:
+            httpx.Client or httpx.AsyncClient: The client
+        """
+        return client_class(http2=http2, http1=not (http2 and self.prior_knowledge), verify=self.verify,
+                            limits=self.limits)
+    
+    def _headers(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """
+        Merge the session headers, which crawlers change after creating the transport.
+        
+        Args:
+            headers (Dict[str, str]): Per-request headers
+            
+        Returns:
+            Dict[str, str]: Headers to send
+        """
+        merged = dict(self.session.headers)
+        merged.update(headers)
+        
+        return merged
+    
+    def fetch(self, url: str, headers: Dict[str, str], timeout: float, allow_redirects: bool = True,
+              verify: bool = True, limits: Optional[ResponseLimits] = None):
+        """
+        Fetch a URL.
+        
+        Args:
+            url (str): URL to fetch
+            headers (Dict[str, str]): Headers to send in addition to the session headers
+            timeout (float): Request timeout in seconds
+            allow_redirects (bool): Whether to follow redirects
+            verify (bool): Whether to verify TLS certificates. The transport's own
+                setting is used; the argument is accepted for compatibility.
+            limits (ResponseLimits, optional): Limits the body is downloaded within
+            
+        Returns:
+            FetchedResponse or requests.Response: The response
+            
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        host = urlsplit(url).netloc
+        if host in self._http1_hosts:
+            return self.fallback.fetch(url, headers, timeout, allow_redirects, verify, limits)
+        
+        if self._client is None:
+            self._client = self._new_client(httpx.Client)
+        
+        try:
+            with self._client.stream("GET", url, headers=self._headers(headers), timeout=timeout,
+                                     follow_redirects=allow_redirects) as response:
+                self.protocols[response.http_version] += 1
+                
+                if limits is None:
+                    return FetchedResponse(str(response.url), response.status_code, dict(response.headers),
+                                           response.read())
+                
+                body = LimitedBody(limits, response.headers)
+                if body.aborted is None:
+                    for chunk in response.iter_bytes():
+                        if not body.add(chunk):
+                            break
+                
+                return body.response(str(response.url), response.status_code, response.headers)
+        
+        except httpx.HTTPError as e:
+            if self._falls_back(host, e):
+                return self.fallback.fetch(url, headers, timeout, allow_redirects, verify, limits)
+            raise _as_requests_error(e) from e
+    
+    async def fetch_async(self, url: str, headers: Dict[str, str], timeout: float,
+                          allow_redirects: bool = True,
+                          limits: Optional[ResponseLimits] = None) -> FetchedResponse:
+        """
+        Fetch a URL with the asynchronous client opened by open_async().
+        
+        Concurrent calls for the same host share one HTTP/2 connection.
+        
+        Args:
+            url (str): URL to fetch
+            headers (Dict[str, str]): Headers to send in addition to the session headers
+            timeout (float): Request timeout in seconds
+            allow_redirects (bool): Whether to follow redirects
+            limits (ResponseLimits, optional): Limits the body is downloaded within
+            
+        Returns:
+            FetchedResponse: The response
+            
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        host = urlsplit(url).netloc
+        client = self._async_http1 if host in self._http1_hosts else self._async_client
+        
+        try:
+            async with client.stream("GET", url, headers=self._headers(headers), timeout=timeout,
+                                     follow_redirects=allow_redirects) as response:
+                self.protocols[response.http_version] += 1
+                
+                if limits is None:
+                    return FetchedResponse(str(response.url), response.status_code, dict(response.headers),
+                                           await response.aread())
+                
+                body = LimitedBody(limits, response.headers)
+                if body.aborted is None:
+                    async for chunk in response.aiter_bytes():
+                        if not body.add(chunk):
+                            break
+                
+                return body.response(str(response.url), response.status_code, response.headers)
+        
+        except httpx.HTTPError as e:
+            if self._falls_back(host, e):
+                return await self.fetch_async(url, headers, timeout, allow_redirects, limits)
+            raise _as_requests_error(e) from e
+    
+    def _falls_back(self, host: str, error: Exception) -> bool:
+        """
+        Switch a host to HTTP/1.1 if its HTTP/2 connection broke the protocol.
+        
+        Args:
+            host (str): Host of the failed request
+            error (Exception): Error raised by httpx
+            
+        Returns:
+            bool: True if the request should be retried over HTTP/1.1
+        """
+        if not isinstance(error, (httpx.RemoteProtocolError, httpx.LocalProtocolError)):
+            return False
+        
+        if host in self._http1_hosts:
+            return False
+        
+        self.logger.warning(f"HTTP/2 failed for {host} ({str(error)}), using HTTP/1.1 from now on")
+        self._http1_hosts.add(host)
+        
+        return True
+    
+    async def open_async(self) -> None:
+        """Create the asynchronous client in the running event loop."""
+        if self._async_client is None:
+            self._async_client = self._new_client(httpx.AsyncClient)
+            self._async_http1 = self._new_client(httpx.AsyncClient, http2=False)
+    
+    async def close_async(self) -> None:
+        """Close the asynchronous client before its event loop ends."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            await self._async_http1.aclose()
+            self._async_client = None
+            self._async_http1 = None
+    
+    def close(self) -> None:
+        """Close the synchronous client's connections."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+def _as_requests_error(error: Exception) -> requests.exceptions.RequestException:
+    """
+    Convert an httpx error into the matching requests exception.
+    
+    Args:
+        error (Exception): Error raised by httpx
+        
+    Returns:
+        requests.exceptions.RequestException: Equivalent requests exception
+    """
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.Timeout(str(error))
+    
+    if isinstance(error, httpx.TooManyRedirects):
+        return requests.exceptions.TooManyRedirects(str(error))
+    
+    if isinstance(error, httpx.TransportError):
+        return requests.exceptions.ConnectionError(str(error))
+    
+    return requests.exceptions.RequestException(str(error))
+
+
+def create_transport(config: Dict[str, Any], session: requests.Session):
+    """
+    Create the transport configured in crawl_settings.transport.
+    
+    Args:
+        config (Dict[str, Any]): Configuration dictionary
+        session (requests.Session): The crawler's session
+        
+    Returns:
+        RequestsTransport or Http2Transport: The transport, HTTP/1.1 if HTTP/2 is
+            not configured or httpx with h2 is not installed
+    """
+    transport_config = config["crawl_settings"].get("transport", {})
+    
+    if transport_config.get("protocol", "http1") != "http2":
+        return RequestsTransport(session)
+    
+    if not HTTP2_AVAILABLE:
+        logging.getLogger("sheikhbot").warning(
+            "HTTP/2 transport requires httpx with h2 (pip install 'httpx[http2]'), using HTTP/1.1"
+        )
+        return RequestsTransport(session)
+    
+    return Http2Transport(
+        session,
+        max_connections=transport_config.get("max_connections", 100),
+        max_keepalive_connections=transport_config.get("max_keepalive_connections", 20),
+        verify=config["crawl_settings"]["verify_ssl"],
+        prior_knowledge=transport_config.get("prior_knowledge", False)
+    )
\ No newline at end of file
@@ -3,22 +3,60 @@ URL utilities for handling and normalizing URLs.
 """
 
 import re
-from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from urllib.parse import urlparse, urlunparse, urljoin, parse_qs, urlencode
+from typing import List, Dict, Any, NamedTuple, Optional, Tuple
 
 
-def normalize_url(url: str) -> str:
+# Normalized URLs kept by parse_url(). Links repeat across the pages of a site, in
+# navigation and footers, and every queued URL is looked up again by host.
+URL_CACHE_SIZE = 32768
+
+# URLs that normalize_url() returns unchanged, apart from the trailing slash, the
+# default port and the query order, which parse_url() checks itself
+_CANONICAL_URL = re.compile(r"(https?)://((?!www\.)[a-z0-9-]+(?:\.[a-z0-9-]+)*(?::[0-9]+)?)(/[^?#;\x00-\x20]*)?(?:\?([^#\x00-\x20]*))?")
+
+
+class ParsedURL(NamedTuple):
     """
-    Normalize a URL to a canonical form.
+    A normalized URL with the parts the crawler looks up, taken from one parse.
+    
+    Attributes:
+        url (str): Normalized URL, as returned by normalize_url()
+        host (str): Host origin (scheme://netloc) of the normalized URL
+        domain (str): Domain of the normalized URL, as returned by get_domain()
+        path (str): Path of the normalized URL, without parameters
+    """
+    url: str
+    host: str
+    domain: str
+    path: str
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def parse_url(url: str) -> ParsedURL:
+    """
+    Normalize a URL and split out its host, domain and path.
+    
+    Results are memoized in a bounded LRU cache. URLs that are already in canonical
+    form, such as the URLs in the frontier, are split without urllib.
     
     Args:
-        url (str): URL to normalize
+        url (str): URL to parse
         
     Returns:
-        str: Normalized URL
+        ParsedURL: Normalized URL and its parts
     """
-    if not url:
-        return ""
+    match = _CANONICAL_URL.fullmatch(url)
+    if match:
+        scheme, netloc, path, query = match.groups()
+        path = path or ""
+        
+        if ((path == "/" or not path.endswith("/"))
+                and not (netloc.endswith(":80") and scheme == "http")
+                and not (netloc.endswith(":443") and scheme == "https")
+                and (query is None or (query and _normalize_query(query) == query))):
+            return ParsedURL(url, f"{scheme}://{netloc}", _netloc_domain(netloc), path)
     
     # Parse the URL
     parsed = urlparse(url)
@@ -37,14 +75,8 @@ def normalize_url(url: str) -> str:
     elif netloc.endswith(":443") and scheme == "https":
         netloc = netloc[:-4]
     
-    # Parse query parameters
-    query_params = parse_qs(parsed.query)
-    
     # Sort query parameters and remove duplicates
-    sorted_query = urlencode(
-        {k: v[0] if len(v) == 1 else v for k, v in sorted(query_params.items())},
-        doseq=True
-    )
+    sorted_query = _normalize_query(parsed.query)
     
     # Remove trailing slash from path if present
     path = parsed.path
@@ -61,7 +93,76 @@ def normalize_url(url: str) -> str:
         ""  # Remove fragment
     ))
     
-    return normalized_url
+    return ParsedURL(normalized_url, f"{scheme}://{netloc}", _netloc_domain(netloc), path)
+
+
+def _netloc_domain(netloc: str) -> str:
+    """
+    Get the domain of a lowercase network location like get_domain() does.
+    
+    Args:
+        netloc (str): Network location
+        
+    Returns:
+        str: Domain name
+    """
+    domain = netloc.split(":")[0]
+    if domain.startswith("www."):
+        domain = domain[4:]
+    
+    return domain
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL to a canonical form.
+    
+    Args:
+        url (str): URL to normalize
+        
+    Returns:
+        str: Normalized URL
+    """
+    if not url:
+        return ""
+    
+    return parse_url(url).url
+
+
+# Query strings whose names and values need no percent-encoding
+_PLAIN_QUERY = re.compile(r"[A-Za-z0-9_.~-]+=[A-Za-z0-9_.~-]*(?:&[A-Za-z0-9_.~-]+=[A-Za-z0-9_.~-]*)*")
+
+
+def _normalize_query(query: str) -> str:
+    """
+    Sort the parameters of a query string and remove duplicates.
+    
+    Args:
+        query (str): Query string without the leading '?'
+        
+    Returns:
+        str: Normalized query string
+    """
+    if not query:
+        return ""
+    
+    if _PLAIN_QUERY.fullmatch(query):
+        # Nothing to unquote or quote, so sort the pairs as parse_qs/urlencode would
+        query_params: Dict[str, List[str]] = {}
+        for pair in query.split("&"):
+            name, _, value = pair.partition("=")
+            if value:
+                query_params.setdefault(name, []).append(value)
+        
+        return "&".join(f"{name}={value}" for name, values in sorted(query_params.items())
+                        for value in values)
+    
+    query_params = parse_qs(query)
+    
+    return urlencode(
+        {k: v[0] if len(v) == 1 else v for k, v in sorted(query_params.items())},
+        doseq=True
+    )
 
 
 def is_valid_url(url: str) -> bool:
@@ -112,6 +213,176 @@ def get_domain(url: str) -> str:
         return ""
 
 
+# Links that LinkResolver splits itself. Anything else, such as whitespace, user
+# info, parameters or other schemes, goes through urllib.
+_UNSAFE_LINK_CHARS = re.compile(r"[\x00-\x20;@\\\[\]]")
+_ABSOLUTE_LINK = re.compile(r"(?i:(https?):)?//([A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*(?::[0-9]*)?)(/[^?#]*)?(?:\?([^#]*))?(?:#.*)?")
+_RELATIVE_LINK = re.compile(r"([^:?#]+)(?:\?([^#]*))?(?:#.*)?")
+
+
+class LinkResolver:
+    """
+    Resolves the links of one page to normalized URLs.
+    
+    The result for each link is the same as urljoin() against the page URL followed
+    by is_valid_url(), normalize_url() and get_domain(), but the page URL is parsed
+    once and common links are split by a single regex match. Links that need the
+    full RFC 3986 rules, such as dot segments, fall back to urllib.
+    """
+    
+    def __init__(self, base_url: str):
+        """
+        Initialize the resolver.
+        
+        Args:
+            base_url (str): URL of the page the links appear on
+        """
+        self.base_url = base_url
+        
+        parsed = urlparse(base_url)
+        self.base_scheme = parsed.scheme
+        self.base_netloc = parsed.netloc
+        self.base_path = parsed.path
+        self.base_query = parsed.query
+        
+        # Links are only joined here when urljoin() would not remove empty or dot
+        # segments of the page path or carry over its parameters
+        self.base_is_simple = (self.base_scheme in ("http", "https") and bool(self.base_netloc)
+                               and not parsed.params and "//" not in self.base_path
+                               and "/." not in self.base_path
+                               and not _UNSAFE_LINK_CHARS.search(self.base_netloc))
+        
+        # Directory that relative paths are resolved against
+        self.base_directory = self.base_path[:self.base_path.rfind("/") + 1] or "/"
+        
+        self._base_result = None
+        
+        # Normalized scheme://netloc and domain of each origin seen on the page
+        self._origins: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    
+    def resolve(self, href: str) -> Optional[Tuple[str, str]]:
+        """
+        Resolve a link found on the page.
+        
+        Args:
+            href (str): Link target as written in the page
+            
+        Returns:
+            Optional[Tuple[str, str]]: (normalized URL, domain), or None if the link
+                is not a valid HTTP(S) URL
+        """
+        if not self.base_is_simple or _UNSAFE_LINK_CHARS.search(href):
+            return self._resolve_with_urllib(href)
+        
+        if not href or href[0] == "#":
+            # Links to the page itself
+            if self._base_result is None:
+                self._base_result = self._resolve_with_urllib(href)
+            return self._base_result
+        
+        if href[0] == "?":
+            query = href[1:].partition("#")[0]
+            if not query:
+                return self._resolve_with_urllib(href)
+            return self._build(self.base_scheme, self.base_netloc, self.base_path, query)
+        
+        match = _ABSOLUTE_LINK.fullmatch(href)
+        if match:
+            scheme, netloc, path, query = match.groups()
+            # urljoin() keeps the path of links with a network location as written
+            scheme = scheme.lower() if scheme else self.base_scheme
+            return self._build(scheme, netloc, path or "", query)
+        
+        match = _RELATIVE_LINK.fullmatch(href)
+        if not match:
+            return self._resolve_with_urllib(href)
+        
+        path, query = match.groups()
+        if path[0] == "/":
+            if path.startswith("//") or "/." in path:
+                return self._resolve_with_urllib(href)
+        else:
+            if path[0] == "." or "/." in path or "//" in path:
+                return self._resolve_with_urllib(href)
+            path = self.base_directory + path
+        
+        return self._build(self.base_scheme, self.base_netloc, path, query)
+    
+    def _origin(self, scheme: str, netloc: str) -> Tuple[str, str]:
+        """
+        Normalize the scheme and network location of a link like normalize_url() does.
+        
+        Args:
+            scheme (str): Lowercase http or https
+            netloc (str): Network location
+            
+        Returns:
+            Tuple[str, str]: (normalized scheme://netloc, domain)
+        """
+        key = (scheme, netloc)
+        origin = self._origins.get(key)
+        if origin is None:
+            netloc = netloc.lower()
+            if netloc.startswith("www."):
+                netloc = netloc[4:]
+            
+            if netloc.endswith(":80") and scheme == "http":
+                netloc = netloc[:-3]
+            elif netloc.endswith(":443") and scheme == "https":
+                netloc = netloc[:-4]
+            
+            origin = self._origins[key] = (f"{scheme}://{netloc}", _netloc_domain(netloc))
+        
+        return origin
+    
+    def _build(self, scheme: str, netloc: str, path: str, query: Optional[str]) -> Tuple[str, str]:
+        """
+        Normalize the parts of a resolved link like normalize_url() does.
+        
+        Args:
+            scheme (str): Lowercase http or https
+            netloc (str): Network location
+            path (str): Empty or absolute path without parameters
+            query (Optional[str]): Query string, if any
+            
+        Returns:
+            Tuple[str, str]: (normalized URL, domain)
+        """
+        origin, domain = self._origin(scheme, netloc)
+        
+        if path != "/" and path.endswith("/"):
+            path = path[:-1]
+        
+        if query:
+            query = _normalize_query(query)
+            if query:
+                return f"{origin}{path}?{query}", domain
+        
+        return f"{origin}{path}", domain
+    
+    def _resolve_with_urllib(self, href: str) -> Optional[Tuple[str, str]]:
+        """
+        Resolve a link with urljoin() and normalize_url().
+        
+        Args:
+            href (str): Link target as written in the page
+            
+        Returns:
+            Optional[Tuple[str, str]]: (normalized URL, domain), or None if the link
+                is not a valid HTTP(S) URL
+        """
+        try:
+            absolute_url = urljoin(self.base_url, href)
+            if not is_valid_url(absolute_url):
+                return None
+            
+            parsed = parse_url(absolute_url)
+        except ValueError:
+            return None
+        
+        return parsed.url, parsed.domain
+
+
 def is_same_domain(url1: str, url2: str) -> bool:
     """
     Check if two URLs belong to the same domain.
@@ -0,0 +1,132 @@
+"""
+URL Filter - Precompiled excluded_urls patterns and allowed_domains lookup
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Iterable
+import logging
+
+from .url import parse_url
+
+# Back-references number groups per pattern and break when patterns are combined
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class UrlFilter:
+    """
+    Decides whether URLs may be crawled, built once from the configuration.
+    
+    The excluded_urls patterns are combined into a single compiled alternation, so
+    checking a URL is one regex match instead of one per pattern. Like re.match,
+    each pattern is anchored at the start of the URL. allowed_domains is kept in a
+    hashed set and looked up for the domain and each of its parent domains, so
+    subdomains of an allowed domain are allowed too.
+    """
+    
+    def __init__(self, excluded_patterns: Optional[Iterable[str]] = None,
+                 allowed_domains: Optional[Iterable[str]] = None):
+        """
+        Initialize the URL filter.
+        
+        Args:
+            excluded_patterns (Iterable[str], optional): Regexes of URLs not to crawl
+            allowed_domains (Iterable[str], optional): Domains that may be crawled,
+                including their subdomains. If empty, every domain is allowed.
+        """
+        self.logger = logging.getLogger("sheikhbot")
+        
+        patterns = list(excluded_patterns or [])
+        self._excluded = self._compile(patterns)
+        
+        # Domains are compared the way get_domain() returns them
+        self.allowed_domains = set()
+        for domain in allowed_domains or []:
+            domain = domain.strip().lower().rstrip(".")
+            if domain.startswith("www."):
+                domain = domain[4:]
+            if domain:
+                self.allowed_domains.add(domain)
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "UrlFilter":
+        """
+        Create a URL filter from the excluded_urls and allowed_domains settings.
+        
+        Args:
+            config (Dict[str, Any]): Configuration dictionary
+            
+        Returns:
+            UrlFilter: Configured URL filter
+        """
+        return cls(config.get("excluded_urls") or [], config.get("allowed_domains") or [])
+    
+    def _compile(self, patterns: List[str]) -> List[re.Pattern]:
+        """
+        Compile the exclusion patterns into as few regexes as possible.
+        
+        Args:
+            patterns (List[str]): Regexes of URLs not to crawl
+            
+        Returns:
+            List[re.Pattern]: One combined regex, or one regex per pattern if they
+                cannot be combined
+        """
+        if not patterns:
+            return []
+        
+        if not any(_BACKREFERENCE.search(pattern) for pattern in patterns):
+            try:
+                return [re.compile("|".join(f"(?:{pattern})" for pattern in patterns))]
+            except re.error as e:
+                self.logger.warning(f"Could not combine excluded_urls patterns: {str(e)}")
+        
+        return [re.compile(pattern) for pattern in patterns]
+    
+    def is_excluded(self, url: str) -> bool:
+        """
+        Check whether a URL matches one of the excluded_urls patterns.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            bool: True if the URL must not be crawled
+        """
+        for regex in self._excluded:
+            if regex.match(url):
+                return True
+        
+        return False
+    
+    def is_allowed_domain(self, domain: str) -> bool:
+        """
+        Check whether a domain or one of its parent domains is allowed.
+        
+        Args:
+            domain (str): Domain as returned by get_domain()
+            
+        Returns:
+            bool: True if the domain may be crawled
+        """
+        if not self.allowed_domains:
+            return True
+        
+        while True:
+            if domain in self.allowed_domains:
+                return True
+            
+            _, dot, domain = domain.partition(".")
+            if not dot:
+                return False
+    
+    def is_allowed(self, url: str) -> bool:
+        """
+        Check whether a URL is on an allowed domain and not excluded.
+        
+        Args:
+            url (str): Normalized URL
+            
+        Returns:
+            bool: True if the URL may be crawled
+        """
+        return self.is_allowed_domain(parse_url(url).domain) and not self.is_excluded(url)
\ No newline at end of file